@@ -0,0 +1,142 @@
+import json
+from typing import Any, Deque, Dict, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from loguru import logger
+
+from .tokens import estimate_tokens
+
+
+# Instructions and JSON framing around each article in the batch prompt
+ARTICLE_OVERHEAD_TOKENS = 40
+REQUIRED_FIELDS = ("title", "content", "analysis", "keywords")
+
+
+class BatchAnalyzer:
+    """
+    Analyzes several articles in one LLM call.
+
+    Articles, each with its retrieved context, are packed into one prompt
+    that asks for a JSON array keyed by the article ``id``. The response is
+    validated and split back per article; articles missing from it are
+    left to the caller to retry individually.
+
+    Batches are packed up to a prompt token budget and a batch size limit.
+    The limit adapts: it is halved when a response is unusable or drops
+    articles (typically a truncated completion) and grows by one after each
+    complete response, up to ``max_batch_size``.
+    """
+
+    def __init__(self, llm: BaseChatModel, max_batch_size: int = 8, token_budget: int = 6000):
+        """
+        Args:
+            llm: The language model instance
+            max_batch_size: Maximum number of articles per call
+            token_budget: Estimated prompt tokens per call; completions grow with it,
+                since every article is translated as well as analyzed
+        """
+        self.llm = llm
+        self.max_batch_size = max_batch_size
+        self.token_budget = token_budget
+        self.batch_size = max_batch_size
+
+        self.batch_prompt = ChatPromptTemplate.from_template("""
+            你是一个专业的新闻分析师。下面是一个 JSON 数组，包含多篇英文新闻及其相关的历史新闻上下文。
+            请将每篇新闻翻译为中文，并提供详细的影响分析。
+            分析时请考虑以下几个方面：
+            1. 新闻的重要性和影响范围
+            2. 对相关国家和地区的潜在影响
+            3. 可能带来的经济、政治或社会影响
+            4. 未来可能的发展趋势
+
+            请只输出一个 JSON 数组，每篇新闻对应一个对象，不要遗漏任何一篇，包含以下字段：
+            - id: 原样返回该新闻的 id
+            - title: 中文标题
+            - content: 中文内容
+            - analysis: 影响分析
+            - keywords: ["关键词1", "关键词2", "关键词3"]
+
+            Articles: {articles}
+        """)
+        self.chain = self.batch_prompt | self.llm | JsonOutputParser()
+
+    @staticmethod
+    def article_tokens(article: Dict) -> int:
+        """Estimated prompt tokens of one article with its context"""
+        return estimate_tokens(article.get("content") or "") + estimate_tokens(article.get("context") or "") \
+            + ARTICLE_OVERHEAD_TOKENS
+
+    def next_batch(self, queue: Deque[Dict]) -> List[Dict]:
+        """Pop the next batch off the queue: at least one article, then as many as fit"""
+        batch = [queue.popleft()]
+        tokens = self.article_tokens(batch[0])
+        while queue and len(batch) < self.batch_size:
+            tokens += self.article_tokens(queue[0])
+            if tokens > self.token_budget:
+                break
+            batch.append(queue.popleft())
+        return batch
+
+    def analyze(self, batch: List[Dict], config: Optional[Dict] = None) -> Dict[Any, Dict]:
+        """
+        Analyze a batch in one call.
+
+        Args:
+            batch: Articles with 'id', 'content', 'source' and retrieved 'context'
+            config: Runnable config for the call, e.g. callbacks
+
+        Returns:
+            Parsed analysis per article ID; articles without a valid item are omitted
+        """
+        articles = json.dumps([{
+            "id": article["id"],
+            "source": article.get("source"),
+            "content": article.get("content"),
+            "context": article.get("context"),
+        } for article in batch], ensure_ascii=False)
+
+        try:
+            output = self.chain.invoke({"articles": articles}, config=config)
+        except Exception as e:
+            logger.warning(f"Batch analysis of {len(batch)} articles failed: {e}")
+            output = None
+
+        results = self.validate(output, batch)
+        self.adapt(len(batch), len(results))
+        return results
+
+    @staticmethod
+    def validate(output, batch: List[Dict]) -> Dict[Any, Dict]:
+        """Match response items to the batch by ID, dropping malformed, unknown and duplicate items"""
+        if isinstance(output, dict) and "id" not in output:
+            # Tolerate the array being wrapped in an object, e.g. {"articles": [...]}
+            lists = [value for value in output.values() if isinstance(value, list)]
+            output = lists[0] if len(lists) == 1 else None
+        elif isinstance(output, dict):
+            output = [output]
+        if not isinstance(output, list):
+            return {}
+
+        expected = {str(article["id"]): article["id"] for article in batch}
+        results = {}
+        for item in output:
+            if not isinstance(item, dict) or str(item.get("id")) not in expected:
+                continue
+            article_id = expected[str(item["id"])]
+            if article_id in results:
+                continue
+            if any(not item.get(field) for field in REQUIRED_FIELDS) or not isinstance(item["keywords"], list):
+                continue
+            results[article_id] = item
+        return results
+
+    def adapt(self, requested: int, returned: int) -> None:
+        """Shrink the batch size limit after incomplete responses, grow it after complete ones"""
+        if returned == requested:
+            self.batch_size = min(self.max_batch_size, self.batch_size + 1)
+        elif returned < requested / 2:
+            self.batch_size = max(1, requested // 2)
+        else:
+            self.batch_size = max(1, requested - 1)
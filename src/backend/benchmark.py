@@ -0,0 +1,255 @@
+import hashlib
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+from langchain_core.documents import Document
+from loguru import logger
+
+from .vector_store import VectorStore, document_id
+
+
+WORDS = (
+    "government minister election economy market shares inflation bank rates "
+    "president talks summit climate energy oil gas prices court ruling police "
+    "investigation health hospital vaccine study school students technology "
+    "company profits workers strike union football match league champion "
+    "storm flooding weather border migrants war ceasefire troops aid"
+).split()
+
+
+def synthetic_texts(count: int, min_words: int = 20, max_words: int = 120, seed: int = 42) -> List[str]:
+    """Generate reproducible news-like texts of varying length"""
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words)))
+        for _ in range(count)
+    ]
+
+
+def benchmark_embeddings(
+    make_embedding_function: Callable[[int, int], Callable],
+    texts: List[str],
+    batch_sizes: List[int],
+    thread_counts: List[int]
+) -> List[Dict]:
+    """
+    Measure embedding throughput for every batch size and thread count.
+
+    Args:
+        make_embedding_function: Builds an embedding function from (batch_size, num_threads)
+        texts: Texts to embed in each run
+        batch_sizes: Batch sizes to try
+        thread_counts: Intra-op thread counts to try
+
+    Returns:
+        One result dict per configuration with its texts/second
+    """
+    results = []
+    for num_threads in thread_counts:
+        for batch_size in batch_sizes:
+            embed = make_embedding_function(batch_size, num_threads)
+            embed(texts[:batch_size])  # warm up: model load and first allocation
+
+            start = time.perf_counter()
+            embed(texts)
+            elapsed = time.perf_counter() - start
+
+            result = {
+                "batch_size": batch_size,
+                "num_threads": num_threads,
+                "texts": len(texts),
+                "seconds": round(elapsed, 4),
+                "texts_per_second": round(len(texts) / elapsed, 1) if elapsed else None,
+            }
+            logger.info(f"Embedding benchmark: {result}")
+            results.append(result)
+
+    return results
+
+
+SOURCES = ["bbc-news", "reuters", "associated-press", "al-jazeera-english", "the-washington-post"]
+
+
+def synthetic_corpus(count: int, chunks_per_article: int = 4, days: int = 365, seed: int = 42) -> List[Document]:
+    """Generate a reproducible corpus of news chunks with realistic metadata"""
+    rng = random.Random(seed)
+    texts = synthetic_texts(count, seed=seed)
+    now = datetime.now()
+    documents = []
+    for i, text in enumerate(texts):
+        article_id = i // chunks_per_article
+        published = now - timedelta(days=rng.random() * days)
+        documents.append(Document(page_content=text, metadata={
+            "article_id": article_id,
+            "chunk_index": i % chunks_per_article,
+            "source": SOURCES[article_id % len(SOURCES)],
+            "published_ts": int(published.timestamp()),
+        }))
+    return documents
+
+
+class HashingEmbeddingFunction:
+    """
+    Cheap deterministic embedding function for sizing the index.
+
+    Hashes words into a fixed number of dimensions, so millions of chunks
+    can be loaded without paying for the real model.
+    """
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def __call__(self, input: List[str]) -> List[np.ndarray]:
+        vectors = np.zeros((len(input), self.dim), dtype=np.float32)
+        for row, text in enumerate(input):
+            for word in text.split():
+                digest = hashlib.md5(word.encode("utf-8")).digest()
+                vectors[row, int.from_bytes(digest[:4], "little") % self.dim] += 1.0 if digest[4] & 1 else -1.0
+        vectors[:, 0] += 1e-3
+        return list(vectors)
+
+    def embed_query(self, input: List[str]) -> List[np.ndarray]:
+        return self(input)
+
+    def name(self) -> str:
+        return "hashing"
+
+    def get_config(self) -> Dict:
+        return {"dim": self.dim}
+
+    @staticmethod
+    def build_from_config(config: Dict) -> "HashingEmbeddingFunction":
+        return HashingEmbeddingFunction(**config)
+
+    def is_legacy(self) -> bool:
+        return False
+
+    def default_space(self) -> str:
+        return "cosine"
+
+    def supported_spaces(self) -> List[str]:
+        return ["cosine", "l2", "ip"]
+
+
+def directory_size(path: Path) -> int:
+    """Total size in bytes of all files below a directory"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return total
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    return {
+        "p50_ms": round(float(np.percentile(samples, 50)), 3),
+        "p99_ms": round(float(np.percentile(samples, 99)), 3),
+    }
+
+
+def exact_top_k(vectors: np.ndarray, query: np.ndarray, k: int) -> List[int]:
+    """Brute-force cosine top-k over normalized vectors, the recall ground truth"""
+    scores = vectors @ query
+    top = np.argpartition(-scores, min(k, len(scores) - 1))[:k]
+    return list(top[np.argsort(-scores[top])])
+
+
+def benchmark_vector_store(
+    make_store: Callable[[str], VectorStore],
+    sizes: List[int],
+    queries: int = 100,
+    k: int = 10,
+    batch_size: int = 1000,
+    seed: int = 42
+) -> Dict:
+    """
+    Load a vector store with growing synthetic corpora and measure it at each size.
+
+    The store is filled incrementally up to each size. Embeddings are
+    computed once up front so add throughput measures indexing only.
+    Recall@k compares the ANN results against exact brute-force search
+    over the same vectors.
+
+    Args:
+        make_store: Builds the VectorStore under test from a persist directory
+        sizes: Increasing corpus sizes (in chunks) to measure at
+        queries: Number of queries per size
+        k: Number of results per query
+        batch_size: Chunks per add call
+        seed: Seed for corpus and query generation
+
+    Returns:
+        Report dict with the configuration and one result per size
+    """
+    sizes = sorted(sizes)
+    corpus = synthetic_corpus(sizes[-1], seed=seed)
+    query_texts = synthetic_texts(queries, min_words=8, max_words=30, seed=seed + 1)
+    report = {"config": {"sizes": sizes, "queries": queries, "k": k, "batch_size": batch_size}, "results": []}
+
+    with tempfile.TemporaryDirectory(prefix="bench-retrieval-") as directory:
+        store = make_store(directory)
+        embed = store.embedding_function
+
+        started = time.perf_counter()
+        vectors = np.empty((len(corpus), 0), dtype=np.float32)
+        for start in range(0, len(corpus), 10_000):
+            batch = np.asarray(embed([doc.page_content for doc in corpus[start:start + 10_000]]), dtype=np.float32)
+            if vectors.shape[1] == 0:
+                vectors = np.empty((len(corpus), batch.shape[1]), dtype=np.float32)
+            vectors[start:start + len(batch)] = batch
+        query_vectors = np.asarray(embed(query_texts), dtype=np.float32)
+        embed_seconds = time.perf_counter() - started
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        query_vectors /= np.linalg.norm(query_vectors, axis=1, keepdims=True)
+        report["config"]["embed_chunks_per_second"] = round((len(corpus) + queries) / embed_seconds, 1)
+
+        loaded = 0
+        for size in sizes:
+            started = time.perf_counter()
+            for start in range(loaded, size, batch_size):
+                batch = corpus[start:min(start + batch_size, size)]
+                ids, texts, metadatas = store.prepare_documents(batch)
+                store.collection.upsert(
+                    ids=ids,
+                    documents=texts,
+                    metadatas=metadatas,
+                    embeddings=vectors[start:start + len(batch)]
+                )
+            add_seconds = time.perf_counter() - started
+            added = size - loaded
+            loaded = size
+
+            ann_latencies = []
+            search_latencies = []
+            recalls = []
+            for text, query_vector in zip(query_texts, query_vectors):
+                started = time.perf_counter()
+                results = store.collection.query(query_embeddings=[query_vector], n_results=k, include=[])
+                ann_latencies.append((time.perf_counter() - started) * 1000)
+
+                started = time.perf_counter()
+                store.similarity_search(text, k=k)
+                search_latencies.append((time.perf_counter() - started) * 1000)
+
+                found = set(results["ids"][0])
+                truth = {document_id(corpus[i]) for i in exact_top_k(vectors[:size], query_vector, k)}
+                recalls.append(len(found & truth) / len(truth))
+
+            result = {
+                "size": size,
+                "add_chunks_per_second": round(added / add_seconds, 1) if add_seconds else None,
+                "ann_query": _percentiles(ann_latencies),
+                "search_query": _percentiles(search_latencies),
+                f"recall_at_{k}": round(float(np.mean(recalls)), 4),
+                "disk_bytes": directory_size(Path(directory)),
+            }
+            logger.info(f"Retrieval benchmark: {result}")
+            report["results"].append(result)
+
+    return report
@@ -1,28 +1,70 @@
 import json
-import langchain
-from datetime import datetime
+from collections import Counter, deque
+from functools import partial
+from datetime import datetime, timedelta
 from langchain_community.document_loaders import TextLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_openai.chat_models.base import BaseChatOpenAI
 from langchain_core.runnables import RunnablePassthrough, RunnableParallel, RunnableLambda
 
 from langchain_core.documents import Document
 from langchain_core.prompts import ChatPromptTemplate
-from typing import Dict
+from typing import Dict, List, Optional
 from loguru import logger
+from langchain_core.exceptions import OutputParserException
 from langchain_core.output_parsers import JsonOutputParser
 
 from backend.news_api import NewsAPI
 from backend.data_store import DataStore
-from backend.vector_store import VectorStore
+from backend.vector_store import VectorStore, build_article_chunks, chunk_metadata
+from backend.retrieval import HybridRetriever
+from backend.dedup import StoryClusterer
+from backend.related import RelatedArticlesJob
+from backend.tracing import Tracer, span, trace_config
+from backend.usage import UsageLedger
+from backend.batching import BatchAnalyzer
+from backend.triage import LIGHT, TriageRouter
+from backend.resilience import CircuitBreaker, RetryPolicy, classify_error, failed_stage
+from backend.exceptions import RetriesExhausted
 
 
-langchain.debug = True
+# Outcomes of processing one article
+ANALYZED = "analyzed"
+DUPLICATE = "duplicate"
+DEGRADED = "degraded"
+PENDING = "pending"
+FAILED = "failed"
+# Fields of a fetched article kept in the dead-letter table for the retry
+DEAD_LETTER_FIELDS = ("id", "title", "description", "source", "published_at", "content", "url")
+
+
+def create_text_splitter() -> RecursiveCharacterTextSplitter:
+    """Text splitter shared by the pipeline and the reindex job"""
+    return RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
 
 
 # Initialize text splitter with appropriate chunking parameters
 class NewsRAG:
-    def __init__(self, llm: BaseChatOpenAI, db: DataStore, vec_db: VectorStore, news_api: NewsAPI):
+    def __init__(
+        self,
+        llm: BaseChatOpenAI,
+        db: DataStore,
+        vec_db: VectorStore,
+        news_api: NewsAPI,
+        context_window_days: Optional[int] = 30,
+        context_half_life_days: Optional[float] = None,
+        retriever: Optional[HybridRetriever] = None,
+        story_clusterer: Optional[StoryClusterer] = None,
+        dedup_seed_limit: int = 200,
+        related_articles: Optional[RelatedArticlesJob] = None,
+        tracer: Optional[Tracer] = None,
+        usage_ledger: Optional[UsageLedger] = None,
+        budget_mode: str = "stop",
+        batch_analyzer: Optional[BatchAnalyzer] = None,
+        triage: Optional[TriageRouter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None
+    ):
         """
         Initializes the NewsRAG pipeline.
 
@@ -31,12 +73,54 @@ class NewsRAG:
             db: The data store instance for saving news and analysis.
             vec_db: The vector store instance for similarity search.
             news_api: The news API instance for fetching articles.
+            context_window_days: Only retrieve context published within this many
+                days before the article; None searches the whole collection.
+            context_half_life_days: Optional half-life for time-decay re-ranking
+                of the retrieved context.
+            retriever: Optional hybrid retriever used for context retrieval and
+                chunk indexing instead of the plain vector store.
+            story_clusterer: Optional near-duplicate detector; only one article per
+                story cluster is sent to the LLM.
+            dedup_seed_limit: Number of recent articles registered with the story
+                clusterer before each run.
+            related_articles: Optional job precomputing related articles for the
+                articles indexed in each run.
+            tracer: Starts one trace per article; defaults to a tracer sampling
+                10% of the articles for debug output.
+            usage_ledger: Optional callback recording the token usage of every
+                LLM call; its token budget, if any, is enforced per run.
+            budget_mode: What to do once the token budget is used up: "stop"
+                ends the run, "degrade" keeps saving (and deduplicating) articles
+                but skips their LLM analysis.
+            batch_analyzer: Optional analyzer sending several articles per LLM
+                call; articles it does not return are analyzed one by one.
+            triage: Optional router scoring each article before the analysis;
+                articles below its threshold only get their title translated.
+            retry_policy: Retries of a failed article analysis by error type;
+                defaults to RetryPolicy(). Articles that still fail are
+                dead-lettered and the run goes on.
+            circuit_breaker: Optional breaker around the analysis LLM, failing
+                articles fast while the LLM is down.
         """
         self.llm = llm
         self.db = db
         self.vec_db = vec_db
         self.news_api = news_api
-        self.text_splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
+        self.context_window_days = context_window_days
+        self.context_half_life_days = context_half_life_days
+        self.retriever = retriever if retriever is not None else vec_db
+        self.story_clusterer = story_clusterer
+        self.dedup_seed_limit = dedup_seed_limit
+        self.related_articles = related_articles
+        self.tracer = tracer if tracer is not None else Tracer()
+        self.usage_ledger = usage_ledger
+        self.budget_mode = budget_mode
+        self.batch_analyzer = batch_analyzer
+        self.triage = triage
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.circuit_breaker = circuit_breaker
+        self.guarded_llm = circuit_breaker.guard(llm) if circuit_breaker is not None else llm
+        self.text_splitter = create_text_splitter()
         
         # Define the prompt template for analysis
         self.analysis_prompt = ChatPromptTemplate.from_template("""
@@ -69,6 +153,7 @@ class NewsRAG:
     def retrieve_context(self, news: Dict) -> Dict:
         """
         Retrieves relevant historical news context from the vector store.
+        Only chunks of other articles published within the context window are considered.
 
         Args:
             news: A dictionary representing the news article, must contain 'content'.
@@ -81,8 +166,20 @@ class NewsRAG:
             Exception: If the similarity search fails.
         """
         try:
-            results = self.vec_db.similarity_search(news["content"], k=3)
-            context = json.dumps(results)
+            published_after = None
+            if self.context_window_days is not None:
+                # Hour granularity keeps the filter stable for the query cache
+                window_start = datetime.now() - timedelta(days=self.context_window_days)
+                published_after = window_start.replace(minute=0, second=0, microsecond=0)
+
+            results = self.retriever.similarity_search(
+                news["content"],
+                k=3,
+                published_after=published_after,
+                exclude_article_id=news.get("id"),
+                decay_half_life_days=self.context_half_life_days
+            )
+            context = json.dumps(self.hydrate_context(results), ensure_ascii=False)
             logger.info(f"Retrieved {len(results)} relevant documents")
             news['context'] = context
 
@@ -92,6 +189,35 @@ class NewsRAG:
 
         return news
 
+    def hydrate_context(self, results: List[Dict]) -> List[Dict]:
+        """
+        Resolves retrieved chunks to prompt context with one batched lookup
+        of their articles in the database.
+
+        Args:
+            results: Chunks returned by the retriever, with compact metadata.
+
+        Returns:
+            A list of dictionaries with the title, source, publication date and
+            matched text of each chunk; chunks whose article is gone are dropped.
+        """
+        articles = self.db.get_news_batch(
+            result["metadata"]["article_id"] for result in results if "article_id" in result["metadata"]
+        )
+
+        context = []
+        for result in results:
+            article = articles.get(result["metadata"].get("article_id"))
+            if article is None:
+                continue
+            context.append({
+                "title": article["title"],
+                "source": article["source"],
+                "published_at": article["published_at"],
+                "content": result["content"],
+            })
+        return context
+
     def save_news_db(self, news: Dict):
         """
         Saves the raw news article to the database and adds the generated ID to the news dictionary.
@@ -107,10 +233,27 @@ class NewsRAG:
 
         return news
 
+    def restore_article_fields(self, article: Dict, news: Dict) -> Dict:
+        """
+        Copies the fields the LLM does not echo back from the original article
+        onto the parsed analysis.
+
+        Args:
+            article: The original article as saved by save_news_db.
+            news: The parsed LLM output.
+
+        Returns:
+            The parsed output with the article's 'id', 'source' and 'published_at'.
+        """
+        news["id"] = article["id"]
+        news["source"] = article["source"]
+        news["published_at"] = article["published_at"]
+        return news
+
     def save_analysis_db(self, news: Dict):
         """
         Saves the analysis results (analysis text and keywords) to the database,
-        associating it with the news ID.
+        associating it with the news ID, and copies them to the story's duplicates.
 
         Args:
             news: A dictionary containing the news 'id', 'analysis', and 'keywords'.
@@ -119,6 +262,7 @@ class NewsRAG:
             The original news dictionary.
         """
         self.db.save_analysis(news["id"], news["analysis"], news["keywords"])
+        self.propagate_story_analysis(news)
         return news
 
     def mock_llm(self, news: Dict):
@@ -139,48 +283,383 @@ class NewsRAG:
     def save_news_analysis_vec(self, news: Dict):
         """
         Stores the combined news content and analysis into the vector store after splitting.
-        Removes 'context', 'content', and 'analysis' from the news dictionary before storing
-        the rest as metadata.
+        Chunks only carry a compact reference to the article (see ``chunk_metadata``);
+        the rest of its fields stay in the database.
 
         Args:
             news: A dictionary containing the news article data, including 'id', 'analysis',
-                  'keywords', 'content', and potentially 'context'.
+                  'content', 'source' and 'published_at'.
         """
-        news.pop("context", None) # Use pop with default None to avoid KeyError if context wasn't added
-        content = news.pop("content", "") + json.dumps(news.pop("analysis", ""))
-        metadata = news
-        metadata["keywords"] = json.dumps(metadata["keywords"])
-
-        # from IPython.core.debugger import set_trace
-        # set_trace()
+        content = news.get("content", "") + json.dumps(news.get("analysis", ""))
+        metadata = chunk_metadata(news["id"], news["published_at"], news.get("source"))
 
         try:
             # Split content directly without temp files
-            documents = [Document(page_content=content, metadata=metadata)]
-            chunks = self.text_splitter.split_documents(documents)
-            self.vec_db.add_documents(chunks)
-            logger.info("Stored content in vectorstore")
+            chunks = build_article_chunks(self.text_splitter, content, metadata)
+            embedded = self.retriever.upsert_documents(chunks)
+            logger.info(f"Stored content in vectorstore ({embedded}/{len(chunks)} chunks embedded)")
         except Exception as e:
             logger.error(f"Failed to store to vectorstore: {e}")
 
+    def story_text(self, news: Dict) -> str:
+        """Text used to detect syndicated copies of the same story"""
+        return f"{news.get('title') or ''} {news.get('content') or ''}"
+
+    def seed_story_clusterer(self):
+        """
+        Registers recently analyzed articles as story representatives, so copies
+        arriving in later runs link to their existing analysis.
+        """
+        for news in self.db.get_recent_news(limit=self.dedup_seed_limit):
+            if news["analysis_result"] is not None:
+                self.story_clusterer.add(news["id"], self.story_text(news))
+
+    def add_story(self, news: Dict):
+        """
+        Registers an article as the representative of its story once its analysis
+        is saved or queued, so failed, degraded and light articles are never one.
+        A queued representative's analysis reaches its duplicates when it is saved.
+        """
+        if self.story_clusterer is not None:
+            self.story_clusterer.add(news["id"], self.story_text(news))
+
+    def link_duplicate(self, news: Dict, representative_id: int, similarity: float):
+        """
+        Links a near-duplicate article to its story representative and reuses
+        the representative's analysis instead of calling the LLM.
+
+        Args:
+            news: The saved duplicate article, must contain 'id'.
+            representative_id: ID of the article analyzed for the story.
+            similarity: Estimated similarity to the representative.
+        """
+        self.db.link_story(news["id"], representative_id, similarity)
+
+        representative = self.db.get_news(representative_id)
+        if representative and representative["analysis_result"] is not None:
+            self.db.save_analysis(news["id"], representative["analysis_result"], representative["keywords"])
+
+        logger.info(f"Article {news['id']} duplicates story {representative_id} (similarity {similarity:.2f})")
+
+    def propagate_story_analysis(self, news: Dict):
+        """
+        Copies a representative's analysis to the duplicates already linked to it,
+        which happens when they arrived before the analysis was saved.
+
+        Args:
+            news: The analyzed representative with 'id', 'analysis' and 'keywords'.
+        """
+        duplicate_ids = self.db.get_story_duplicates(news["id"])
+        for duplicate_id in duplicate_ids:
+            self.db.save_analysis(duplicate_id, news["analysis"], news["keywords"])
+        if duplicate_ids:
+            logger.info(f"Copied the analysis of story {news['id']} to {len(duplicate_ids)} duplicates")
+
+    @staticmethod
+    def stage(name: str, runnable) -> RunnableLambda:
+        """Wrap a pipeline step in a tracing span of the current article's trace"""
+        def run(value, config):
+            with span(name):
+                return runnable.invoke(value, config)
+        return RunnableLambda(run, name=name)
+
+    def run_config(self, article: Dict) -> Dict:
+        """Runnable config for one article: trace tags, article ID and the usage ledger"""
+        config = trace_config()
+        config.setdefault("metadata", {})["article_id"] = article["id"]
+        if self.usage_ledger is not None:
+            config["callbacks"] = config.get("callbacks", []) + [self.usage_ledger]
+        return config
+
+    def route_article(self, article: Dict) -> str:
+        """
+        Scores a saved article with the triage router and records the decision.
+        Light articles get their title translated and are not analyzed or indexed.
+
+        Returns:
+            The route, "full" or "light".
+        """
+        config = self.run_config(article)
+        with span("triage"):
+            decision = self.triage.route(article, config=config)
+        if decision["route"] == LIGHT:
+            with span("translate_title"):
+                decision["translated_title"] = self.triage.translate_title(article, config=config)
+        self.db.save_triage(article["id"], decision)
+        logger.debug(f"Article {article['id']} triaged {decision['route']} ({decision['score']:.2f}: {decision['reason']})")
+        return decision["route"]
+
+    def parse_analysis(self, output) -> Dict:
+        """Checks the parsed LLM output has the fields the analysis is saved with"""
+        if not isinstance(output, dict) or any(not output.get(field) for field in ("analysis", "keywords")):
+            raise OutputParserException(f"Analysis output misses its fields: {str(output)[:200]}")
+        return output
+
+    def retrying(self, runnable) -> RunnableLambda:
+        """Wrap a runnable so a failed call is retried per the retry policy"""
+        def run(value, config):
+            return self.retry_policy.call(lambda: runnable.invoke(value, config))
+        return RunnableLambda(run, name="retry")
+
+    def analysis_chain(self, article: Dict):
+        """
+        Per-article chain from the analysis prompt to the vector store, given the article with its context.
+        Only the LLM call is retried; saving and indexing fail at once.
+        """
+        llm_chain = self.analysis_prompt | self.guarded_llm | self.output_parser | RunnableLambda(self.parse_analysis)
+        return (
+            self.stage("llm", self.retrying(llm_chain))
+            | self.stage(
+                "save_analysis",
+                RunnableLambda(partial(self.restore_article_fields, article))
+                | RunnableLambda(self.save_analysis_db)
+            )
+            | self.stage("index_chunks", RunnableLambda(self.save_news_analysis_vec))
+        )
+
+    def analyze_batches(self, pending: List[Dict]) -> List[int]:
+        """
+        Analyzes articles whose context is already retrieved in multi-article LLM calls.
+
+        Each batch gets its own trace. Articles missing from a batch response
+        are analyzed individually with the per-article chain.
+
+        Args:
+            pending: Saved articles with their 'context'.
+
+        Returns:
+            IDs of the analyzed articles.
+        """
+        queue = deque(pending)
+        analyzed_ids = []
+        while queue:
+            if self.usage_ledger is not None and self.usage_ledger.budget_exceeded():
+                logger.warning(
+                    f"Token budget exhausted ({self.usage_ledger.stats()}), "
+                    f"{len(queue)} articles saved without analysis"
+                )
+                break
+
+            batch = self.batch_analyzer.next_batch(queue)
+            article_ids = [article["id"] for article in batch]
+            with self.tracer.trace(job="analysis_batch", article_ids=article_ids) as trace:
+                results = {}
+                if len(batch) > 1:
+                    config = trace_config()
+                    config.setdefault("metadata", {})["article_ids"] = article_ids
+                    if self.usage_ledger is not None:
+                        config["callbacks"] = config.get("callbacks", []) + [self.usage_ledger]
+                    with span("llm"):
+                        results = self.batch_analyzer.analyze(batch, config=config)
+
+                for article in batch:
+                    try:
+                        if article["id"] in results:
+                            news = self.restore_article_fields(article, results[article["id"]])
+                            with span("save_analysis"):
+                                self.save_analysis_db(news)
+                            with span("index_chunks"):
+                                self.save_news_analysis_vec(news)
+                        else:
+                            with span("retry_single"):
+                                self.analysis_chain(article).invoke(article, config=self.run_config(article))
+                    except Exception as e:
+                        self.dead_letter(article, e, trace)
+                        continue
+                    analyzed_ids.append(article["id"])
+
+                trace.attributes["batched"] = len(results)
+                trace.attributes["retried"] = len(batch) - len(results)
+        return analyzed_ids
+
+    def process_article(self, article: Dict, trace, over_budget: bool = False) -> str:
+        """
+        Runs one fetched article through the pipeline inside its trace.
+
+        Args:
+            article: The article as fetched; gets its 'id' once saved.
+            trace: The article's trace, for its attributes.
+            over_budget: Whether the token budget is used up (degrade mode).
+
+        Returns:
+            What happened to the article: "analyzed", "duplicate", "degraded",
+            "light", or "pending" when it waits for the batched analysis.
+
+        Raises:
+            RetriesExhausted: If the analysis still fails after its retries.
+        """
+        with span("save_news"):
+            self.save_news_db(article)
+        trace.attributes["article_id"] = article["id"]
+
+        if self.story_clusterer is not None:
+            with span("dedup"):
+                representative_id, similarity = self.story_clusterer.match(self.story_text(article))
+                if representative_id is not None:
+                    self.link_duplicate(article, representative_id, similarity)
+            if representative_id is not None:
+                trace.attributes["duplicate_of"] = representative_id
+                return DUPLICATE
+
+        if over_budget:
+            # Saved without analysis, so a later run or reindex can pick it up
+            trace.attributes["degraded"] = True
+            return DEGRADED
+
+        if self.triage is not None and self.route_article(article) == LIGHT:
+            trace.attributes["triage"] = LIGHT
+            return LIGHT
+
+        if self.batch_analyzer is not None:
+            with span("retrieve_context"):
+                self.retrieve_context(article)
+            self.add_story(article)
+            return PENDING
+
+        self.analyze_article(article)
+        self.add_story(article)
+        return ANALYZED
+
+    def analyze_article(self, article: Dict) -> None:
+        """Retrieves context for a saved article and analyzes it, retrying the LLM call per the retry policy"""
+        composed_news_chain = (
+            self.stage("retrieve_context", RunnableLambda(self.retrieve_context))
+            | self.analysis_chain(article)
+        )
+        composed_news_chain.invoke(article, config=self.run_config(article))
+
+    def dead_letter(self, article: Dict, error: Exception, trace=None, prior_attempts: int = 0) -> None:
+        """Records an article that failed processing in the dead-letter table"""
+        error_type = classify_error(error)
+        attempts = (error.attempts if isinstance(error, RetriesExhausted) else 1) + prior_attempts
+        cause = error.__cause__ if isinstance(error, RetriesExhausted) else error
+        stage = failed_stage(trace)
+        logger.error(f"Article {article.get('id')} failed in {stage} ({error_type}, {attempts} attempts): {cause}")
+        try:
+            self.db.record_failure({
+                "article_id": article.get("id"),
+                "url": article.get("url"),
+                "stage": stage,
+                "error_type": error_type,
+                "error": f"{type(cause).__name__}: {cause}",
+                "attempts": attempts,
+                "payload": {field: article.get(field) for field in DEAD_LETTER_FIELDS},
+            })
+        except Exception as e:
+            logger.error(f"Failed to dead-letter article {article.get('id')}: {e}")
+
+    def retry_failed(self, limit: Optional[int] = None) -> Dict[str, int]:
+        """
+        Retries the analysis of dead-lettered articles.
+
+        Articles that failed before they were saved are saved first. Recovered
+        articles leave the dead-letter table, the others stay with their
+        attempts counted; deduplication and triage are not repeated, but a
+        recovered story representative passes its analysis to its duplicates.
+
+        Args:
+            limit: Maximum number of entries to retry, oldest first.
+
+        Returns:
+            Counts of retried, recovered and failed articles.
+        """
+        stats = {"retried": 0, "recovered": 0, "failed": 0}
+        recovered_ids = []
+        for failure in self.db.get_failed_articles(limit=limit):
+            stats["retried"] += 1
+            article = self.db.get_news(failure["article_id"]) if failure["article_id"] is not None else None
+            if article is None:
+                article = dict(failure["payload"] or {})
+                article.pop("id", None)
+
+            trace = None
+            try:
+                with self.tracer.trace(url=failure["url"], retry_of=failure["id"]) as trace:
+                    if article.get("id") is None:
+                        with span("save_news"):
+                            self.save_news_db(article)
+                    self.analyze_article(article)
+            except Exception as e:
+                prior_attempts = 0
+                if article.get("id") is None or article["id"] != failure["article_id"]:
+                    # Still unsaved or saved by this retry: replace the entry rather than add one
+                    self.db.delete_failure(failure["id"])
+                    prior_attempts = failure["attempts"]
+                self.dead_letter(article, e, trace, prior_attempts=prior_attempts)
+                stats["failed"] += 1
+                continue
+
+            self.db.delete_failure(failure["id"])
+            recovered_ids.append(article["id"])
+            stats["recovered"] += 1
+
+        if self.related_articles is not None and recovered_ids:
+            try:
+                self.related_articles.run(recovered_ids)
+            except Exception as e:
+                logger.error(f"Failed to compute related articles: {e}")
+
+        logger.info(f"Retried failed articles: {stats}")
+        return stats
+
     def start(self):
         """
         The main entry point to start the news analysis pipeline.
         Fetches top headlines, processes each article through the RAG chain
         (save raw news, retrieve context, analyze, save analysis, save to vector store).
+        With a story clusterer, near-duplicates of an already analyzed story are
+        linked to it and skip the LLM. Related articles are precomputed for the
+        analyzed articles once the whole batch is indexed. With a usage ledger,
+        the run stops or degrades once its token budget is used up. With a batch
+        analyzer, articles are saved and given their context first, then
+        analyzed several per LLM call. With a triage router, only articles it
+        scores as important get the full analysis. An article that fails is
+        dead-lettered without stopping the run.
         """
         articles = self.news_api.get_top_headlines()
 
-        for article in articles:
-            composed_news_chain = (
-                RunnableLambda(self.save_news_db)
-                | RunnableLambda(self.retrieve_context)
-                | self.analysis_prompt
-                | self.llm
-                | self.output_parser
-                | RunnableLambda(self.save_analysis_db)
-                | RunnableLambda(self.save_news_analysis_vec)
-            )
+        if self.story_clusterer is not None:
+            self.seed_story_clusterer()
+
+        analyzed_ids = []
+        pending = []
+        outcomes = Counter()
+        for position, article in enumerate(articles):
+            over_budget = self.usage_ledger is not None and self.usage_ledger.budget_exceeded()
+            if over_budget and self.budget_mode == "stop":
+                logger.warning(
+                    f"Token budget exhausted ({self.usage_ledger.stats()}), "
+                    f"stopping with {len(articles) - position} articles left"
+                )
+                break
+
+            trace = None
+            try:
+                with self.tracer.trace(url=article.get("url")) as trace:
+                    outcome = self.process_article(article, trace, over_budget)
+            except Exception as e:
+                # One bad article must not end the run
+                self.dead_letter(article, e, trace)
+                outcome = FAILED
+            outcomes[outcome] += 1
+            if outcome == ANALYZED:
+                analyzed_ids.append(article["id"])
+            elif outcome == PENDING:
+                pending.append(article)
+
+        if pending:
+            analyzed_ids += self.analyze_batches(pending)
+
+        if outcomes[DEGRADED]:
+            logger.warning(f"Token budget exhausted, {outcomes[DEGRADED]} articles saved without analysis")
+        if outcomes[LIGHT]:
+            logger.info(f"Triage routed {outcomes[LIGHT]} articles to title translation only")
+        if outcomes[FAILED]:
+            logger.warning(f"{outcomes[FAILED]} articles failed and were dead-lettered; see `cli retry-failed`")
 
-            composed_news_chain.invoke(article)
-                
\ No newline at end of file
+        if self.related_articles is not None and analyzed_ids:
+            try:
+                with self.tracer.trace(job="related_articles", articles=len(analyzed_ids)):
+                    self.related_articles.run(analyzed_ids)
+            except Exception as e:
+                logger.error(f"Failed to compute related articles: {e}")
@@ -0,0 +1,193 @@
+import json
+from typing import Dict, Iterator, List, Set, Tuple
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from loguru import logger
+
+from .data_store import DataStore
+from .retrieval import tokenize
+from .tokens import CJK_PATTERN, estimate_tokens
+
+
+# Words that say nothing about whether the cached context covers a question
+FOLLOW_UP_WORDS = {
+    "about", "also", "does", "explain", "from", "happen", "happened", "have", "more", "please",
+    "should", "tell", "that", "their", "them", "there", "these", "they", "this", "those",
+    "what", "when", "where", "which", "will", "with", "would", "could",
+}
+
+
+def content_terms(text: str) -> Set[str]:
+    """Terms that identify what a text is about; CJK runs are split into character bigrams"""
+    terms = set()
+    for token in tokenize(text):
+        if CJK_PATTERN.search(token):
+            terms.update(token[i:i + 2] for i in range(max(1, len(token) - 1)))
+        elif len(token) >= 4 and token not in FOLLOW_UP_WORDS:
+            terms.add(token)
+    return terms
+
+
+class ChatSession:
+    """
+    State of one conversation.
+
+    Holds the history sent to the LLM (trimmed to a token budget), the full
+    transcript for display, and the context retrieved so far, keyed by
+    chunk ID, which follow-up questions reuse.
+    """
+
+    def __init__(self):
+        self.history: List[BaseMessage] = []
+        self.transcript: List[Tuple[str, str]] = []
+        self.context: Dict[str, Dict] = {}
+        self.context_terms: Set[str] = set()
+        self.retrievals = 0
+
+
+class NewsChat:
+    """
+    Chat about the stored news, streaming answers token by token.
+
+    Context is retrieved once per conversation and reused for follow-up
+    questions; a question is only sent to the retriever when too few of its
+    terms appear in the cached context. History and context are each kept
+    within a token budget, dropping the oldest entries first.
+    """
+
+    def __init__(
+        self,
+        llm: BaseChatModel,
+        db: DataStore,
+        retriever,
+        k: int = 5,
+        history_tokens: int = 2000,
+        context_tokens: int = 3000,
+        min_term_coverage: float = 0.5
+    ):
+        """
+        Args:
+            llm: Chat model; answers are streamed from it
+            db: The data store the retrieved chunks are hydrated from
+            retriever: VectorStore or HybridRetriever used for context retrieval
+            k: Number of chunks retrieved per retrieval
+            history_tokens: Token budget for the conversation history
+            context_tokens: Token budget for the cached context
+            min_term_coverage: Share of a question's terms that must appear in the
+                cached context for it to be answered without a new retrieval
+        """
+        self.llm = llm
+        self.db = db
+        self.retriever = retriever
+        self.k = k
+        self.history_tokens = history_tokens
+        self.context_tokens = context_tokens
+        self.min_term_coverage = min_term_coverage
+
+        self.chat_prompt = ChatPromptTemplate.from_messages([
+            ("system", """你是一个专业的新闻分析助手。你可以：
+            1. 回答用户关于新闻的问题
+            2. 分析新闻之间的关联
+            3. 解释新闻背景
+            4. 提供专业的见解
+
+            请基于以下新闻上下文回答用户的问题：
+
+            {context}
+            """),
+            MessagesPlaceholder("history"),
+            ("user", "{question}")
+        ])
+        self.chain = self.chat_prompt | self.llm
+
+    def needs_retrieval(self, session: ChatSession, question: str) -> bool:
+        """Whether the cached context is unlikely to cover the question"""
+        if not session.context:
+            return True
+        terms = content_terms(question)
+        if not terms:
+            return False
+        return len(terms & session.context_terms) / len(terms) < self.min_term_coverage
+
+    def retrieve(self, session: ChatSession, question: str) -> bool:
+        """
+        Add context for the question to the session unless the cached context covers it.
+
+        Returns:
+            True if the retriever was queried
+        """
+        if not self.needs_retrieval(session, question):
+            return False
+
+        results = self.retriever.similarity_search(question, k=self.k)
+        articles = self.db.get_news_batch(
+            result["metadata"]["article_id"] for result in results if "article_id" in result["metadata"]
+        )
+        for result in results:
+            article = articles.get(result["metadata"].get("article_id"))
+            if article is None:
+                continue
+            # Re-inserting moves a chunk to the newest end
+            session.context.pop(result["id"], None)
+            session.context[result["id"]] = {
+                "title": article["title"],
+                "source": article["source"],
+                "published_at": article["published_at"],
+                "content": result["content"],
+            }
+
+        self._trim_context(session)
+        session.retrievals += 1
+        logger.info(f"Chat retrieved {len(results)} chunks, {len(session.context)} cached")
+        return True
+
+    def _trim_context(self, session: ChatSession) -> None:
+        tokens = {chunk_id: estimate_tokens(json.dumps(chunk, ensure_ascii=False)) for chunk_id, chunk in session.context.items()}
+        total = sum(tokens.values())
+        for chunk_id in list(session.context):
+            if total <= self.context_tokens:
+                break
+            total -= tokens[chunk_id]
+            del session.context[chunk_id]
+
+        session.context_terms = set()
+        for chunk in session.context.values():
+            session.context_terms |= content_terms(f"{chunk['title']} {chunk['content']}")
+
+    def _trim_history(self, session: ChatSession) -> None:
+        total = sum(estimate_tokens(message.content) for message in session.history)
+        while session.history and total > self.history_tokens:
+            # Drop the oldest question together with its answer
+            for message in session.history[:2]:
+                total -= estimate_tokens(message.content)
+            del session.history[:2]
+
+    def stream(self, session: ChatSession, question: str) -> Iterator[str]:
+        """
+        Answer a question, yielding the answer text as the LLM produces it.
+
+        The exchange is added to the session once the answer is complete.
+        """
+        self.retrieve(session, question)
+        inputs = {
+            "context": json.dumps(list(session.context.values()), ensure_ascii=False),
+            "history": list(session.history),
+            "question": question,
+        }
+
+        answer = []
+        for chunk in self.chain.stream(inputs):
+            if chunk.content:
+                answer.append(chunk.content)
+                yield chunk.content
+
+        answer = "".join(answer)
+        session.history.extend([HumanMessage(content=question), AIMessage(content=answer)])
+        session.transcript.extend([("user", question), ("assistant", answer)])
+        self._trim_history(session)
+
+    def ask(self, session: ChatSession, question: str) -> str:
+        """Answer a question without streaming"""
+        return "".join(self.stream(session, question))
@@ -1,9 +1,14 @@
-from typing import List, Optional, Dict
-from datetime import datetime
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Dict, Tuple
+from datetime import date, datetime, timedelta
 from loguru import logger
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, JSON
+from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, JSON, Float, Boolean, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.exc import SQLAlchemyError
 from .exceptions import AppException
 
@@ -30,21 +35,161 @@ class NewsSource(Base):
     id = Column(Integer, primary_key=True, autoincrement=True, nullable=True)
     source = Column(String(255), nullable=False, unique=True)
 
+
+class StoryLink(Base):
+    __tablename__ = 'story_links'
+
+    article_id = Column(Integer, primary_key=True)
+    representative_id = Column(Integer, nullable=False, index=True)
+    similarity = Column(Float, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+
+
+class RelatedArticle(Base):
+    __tablename__ = 'related_articles'
+
+    # The composite primary key doubles as the index for the per-article lookup
+    article_id = Column(Integer, primary_key=True)
+    rank = Column(Integer, primary_key=True)
+    related_id = Column(Integer, nullable=False)
+    score = Column(Float, nullable=False)
+
+
+class LLMUsage(Base):
+    __tablename__ = 'llm_usage'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    article_id = Column(Integer, index=True)
+    model = Column(String(255))
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    cached_tokens = Column(Integer, nullable=False, default=0)
+    cache_hit = Column(Boolean, nullable=False, default=False)
+    latency_ms = Column(Float)
+    created_at = Column(DateTime, nullable=False, default=datetime.now, index=True)
+
+
+class TriageDecision(Base):
+    __tablename__ = 'triage_decisions'
+
+    article_id = Column(Integer, primary_key=True)
+    score = Column(Float, nullable=False)
+    route = Column(String(16), nullable=False, index=True)
+    classifier = Column(String(64), nullable=False)
+    reason = Column(Text)
+    translated_title = Column(Text)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+
+
+class DigestSummary(Base):
+    __tablename__ = 'digest_summaries'
+
+    # Hash of the summarized input, so unchanged inputs are never summarized twice
+    key = Column(String(64), primary_key=True)
+    digest_date = Column(String(10), nullable=False, index=True)
+    kind = Column(String(16), nullable=False)
+    source = Column(String(255))
+    article_ids = Column(JSON)
+    summary = Column(Text, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+
+
+class FailedArticle(Base):
+    __tablename__ = 'failed_articles'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    # None when the article failed before it was saved; the payload is kept for the retry
+    article_id = Column(Integer, index=True)
+    url = Column(Text)
+    stage = Column(String(64))
+    error_type = Column(String(32), nullable=False)
+    error = Column(Text)
+    attempts = Column(Integer, nullable=False, default=1)
+    payload = Column(JSON)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+    updated_at = Column(DateTime, nullable=False, default=datetime.now, onupdate=datetime.now)
+
     
 
+def filter_date_range(query, column, from_date: Optional[str] = None, to_date: Optional[str] = None):
+    """
+    Restrict a query to a range of ISO dates or datetimes, both ends inclusive.
+
+    A date-only ``to_date`` covers that whole day.
+    """
+    if from_date:
+        query = query.filter(column >= datetime.fromisoformat(from_date))
+    if to_date:
+        try:
+            end = date.fromisoformat(to_date)
+        except ValueError:
+            query = query.filter(column <= datetime.fromisoformat(to_date))
+        else:
+            query = query.filter(column < datetime.combine(end + timedelta(days=1), datetime.min.time()))
+    return query
+
+
 class DataStore:
+    MEMORY = ":memory:"
+    GENERATION_SUFFIX = ".generation"
+
     def __init__(self, db_path: str = "news.db"):
         """
         Initialize the DataStore with a SQLite database connection.
 
         Args:
-            db_path: Path to the SQLite database file (default: "news.db")
+            db_path: Path to the SQLite database file (default: "news.db"), or
+                ":memory:" for a throwaway in-memory database private to this instance
         """
         self.db_path = f"sqlite:///{db_path}"
-        self.engine = create_engine(self.db_path)
+        if db_path == self.MEMORY:
+            # A named shared-cache database lets every pooled connection see the
+            # same data; it lives as long as the keep-alive connection
+            self.engine = create_engine(
+                f"sqlite:///file:datastore_{uuid.uuid4().hex}?mode=memory&cache=shared&uri=true",
+                poolclass=QueuePool,
+                connect_args={"check_same_thread": False}
+            )
+            self._keepalive = self.engine.connect()
+            self.generation_path = None
+        else:
+            self.engine = create_engine(self.db_path)
+            self._keepalive = None
+            self.generation_path = Path(f"{db_path}{self.GENERATION_SUFFIX}")
+        self._memory_generation = 0
         self.Session = sessionmaker(bind=self.engine)
         self._init_db()
 
+    def generation(self) -> int:
+        """
+        Return the current data generation without touching the database.
+
+        The marker file next to the database changes after every write, so
+        readers in any process can key caches on it.
+        """
+        if self.generation_path is None:
+            return self._memory_generation
+        try:
+            return int(self.generation_path.read_text())
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def bump_generation(self) -> None:
+        """Mark the data as changed for cache readers"""
+        if self.generation_path is None:
+            self._memory_generation += 1
+            return
+        staged = self.generation_path.with_name(f"{self.generation_path.name}.{os.getpid()}.tmp")
+        staged.write_text(str(time.time_ns()))
+        os.replace(staged, self.generation_path)
+
+    def close(self) -> None:
+        """Release all connections; an in-memory database is discarded"""
+        if self._keepalive is not None:
+            self._keepalive.close()
+            self._keepalive = None
+        self.engine.dispose()
+
     def _init_db(self):
         """
         Initialize the database by creating all tables defined in the SQLAlchemy models.
@@ -84,6 +229,7 @@ class DataStore:
             session.add(article)
             session.flush()
             session.commit()
+            self.bump_generation()
 
             return article.id
 
@@ -118,6 +264,7 @@ class DataStore:
             article.analysis_result = analysis
             article.keywords = keywords
             session.commit()
+            self.bump_generation()
 
         except SQLAlchemyError as e:
             logger.error(f"Database error during update: {str(e)}")
@@ -134,7 +281,8 @@ class DataStore:
             news_id: The ID of the article to retrieve
 
         Returns:
-            Dict if found, None otherwise
+            Dict if found, None otherwise; 'triage_route' and 'translated_title'
+            are None for articles that were not triaged
 
         Raises:
             AppException: If there's a database error
@@ -142,9 +290,13 @@ class DataStore:
         session = self.Session()
 
         try:
-            article = session.query(NewsArticle).filter_by(id=news_id).first()
-            if not article:
+            row = session.query(NewsArticle, TriageDecision.route, TriageDecision.translated_title)\
+                .outerjoin(TriageDecision, TriageDecision.article_id == NewsArticle.id)\
+                .filter(NewsArticle.id == news_id)\
+                .first()
+            if not row:
                 return None
+            article, triage_route, translated_title = row
                 
             data = {
                 'id': article.id,
@@ -155,6 +307,8 @@ class DataStore:
                 'summary': article.summary,
                 'analysis_result': article.analysis_result,
                 'keywords': article.keywords,
+                'triage_route': triage_route,
+                'translated_title': translated_title,
             }
             return data
         except SQLAlchemyError as e:
@@ -163,6 +317,49 @@ class DataStore:
         finally:
             session.close()
 
+    def get_news_batch(self, news_ids: Iterable[int]) -> Dict[int, Dict]:
+        """
+        Retrieve several news articles by ID in a single query.
+
+        Args:
+            news_ids: IDs of the articles to retrieve; duplicates are ignored
+
+        Returns:
+            Dict mapping each found ID to its article; missing IDs are omitted
+
+        Raises:
+            AppException: If there's a database error
+        """
+        news_ids = set(news_ids)
+        if not news_ids:
+            return {}
+
+        session = self.Session()
+        try:
+            articles = session.query(NewsArticle)\
+                .filter(NewsArticle.id.in_(news_ids))\
+                .all()
+
+            return {
+                article.id: {
+                    'id': article.id,
+                    'title': article.title,
+                    'source': article.source,
+                    'published_at': article.published_at.isoformat(),
+                    'content': article.content,
+                    'summary': article.summary,
+                    'url': article.url,
+                    'analysis_result': article.analysis_result,
+                    'keywords': article.keywords,
+                }
+                for article in articles
+            }
+        except SQLAlchemyError as e:
+            logger.error(f"Database error: {str(e)}")
+            raise AppException(f"Failed to get news batch: {str(e)}")
+        finally:
+            session.close()
+
     def get_recent_news(self, limit: int = 10) -> List[Dict]:
         """
         Retrieve the most recent news articles, ordered by publication date.
@@ -219,27 +416,26 @@ class DataStore:
             sources: List of source names to filter by
             keywords: Text to search in title/content
             from_date: Minimum publish date (ISO format string)
-            to_date: Maximum publish date (ISO format string)
+            to_date: Maximum publish date (ISO format string); a date covers the whole day
             page: Page number (1-based)
             page_size: Number of items per page
             
         Returns:
-            List of article dictionaries
+            List of article dictionaries, with the triage route and translated
+            title of triaged articles
             
         Raises:
             AppException: If database error occurs
         """
         session = self.Session()
         try:
-            query = session.query(NewsArticle)
+            query = session.query(NewsArticle, TriageDecision.route, TriageDecision.translated_title)\
+                .outerjoin(TriageDecision, TriageDecision.article_id == NewsArticle.id)
             
             # Apply filters
             if sources:
                 query = query.filter(NewsArticle.source.in_(sources))
-            if from_date:
-                query = query.filter(NewsArticle.published_at >= datetime.fromisoformat(from_date))
-            if to_date:
-                query = query.filter(NewsArticle.published_at <= datetime.fromisoformat(to_date))
+            query = filter_date_range(query, NewsArticle.published_at, from_date, to_date)
             if keywords:
                 keywords = f"%{keywords.lower()}%"
                 query = query.filter(
@@ -256,7 +452,7 @@ class DataStore:
             
             # Convert to dict format
             result = []
-            for article in articles:
+            for article, triage_route, translated_title in articles:
                 result.append({
                     'id': article.id,
                     'title': article.title,
@@ -266,6 +462,8 @@ class DataStore:
                     'summary': article.summary,
                     'analysis_result': article.analysis_result,
                     'keywords': article.keywords,
+                    'triage_route': triage_route,
+                    'translated_title': translated_title,
                 })
             return result
             
@@ -275,6 +473,635 @@ class DataStore:
         finally:
             session.close()
 
+    def iter_analyzed_news(self, batch_size: int = 500) -> Iterator[Dict]:
+        """
+        Stream all analyzed news articles in ID order without loading them all at once.
+
+        Args:
+            batch_size: Number of rows fetched from the database per round-trip
+
+        Yields:
+            Article dictionaries that have an analysis result
+
+        Raises:
+            AppException: If there's a database error
+        """
+        session = self.Session()
+        try:
+            articles = session.query(NewsArticle)\
+                .order_by(NewsArticle.id)\
+                .yield_per(batch_size)
+
+            for article in articles:
+                # JSON columns may hold a JSON null rather than SQL NULL
+                if article.analysis_result is None:
+                    continue
+                yield {
+                    'id': article.id,
+                    'title': article.title,
+                    'source': article.source,
+                    'published_at': article.published_at.isoformat(),
+                    'content': article.content,
+                    'summary': article.summary,
+                    'url': article.url,
+                    'analysis_result': article.analysis_result,
+                    'keywords': article.keywords,
+                }
+        except SQLAlchemyError as e:
+            logger.error(f"Database error: {str(e)}")
+            raise AppException(f"Failed to stream analyzed news: {str(e)}")
+        finally:
+            session.close()
+
+    def get_analyzed_news_ids(self) -> List[int]:
+        """
+        Get the IDs of all analyzed news articles, without loading their content.
+
+        Returns:
+            Article IDs in ascending order
+
+        Raises:
+            AppException: If there's a database error
+        """
+        session = self.Session()
+        try:
+            rows = session.query(NewsArticle.id, NewsArticle.analysis_result)\
+                .order_by(NewsArticle.id)\
+                .all()
+            # JSON columns may hold a JSON null rather than SQL NULL
+            return [row.id for row in rows if row.analysis_result is not None]
+        except SQLAlchemyError as e:
+            logger.error(f"Database error: {str(e)}")
+            raise AppException(f"Failed to get analyzed news IDs: {str(e)}")
+        finally:
+            session.close()
+
+    def iter_news_chunks(
+        self,
+        from_date: str = None,
+        to_date: str = None,
+        chunk_size: int = 1000
+    ) -> Iterator[List[Dict]]:
+        """
+        Stream news articles in ID order as lists of at most ``chunk_size`` rows.
+
+        Selects plain columns with a streaming cursor, so neither the result
+        set nor ORM objects accumulate in memory however many rows match.
+
+        Args:
+            from_date: Minimum publish date (ISO format string)
+            to_date: Maximum publish date (ISO format string); a date covers the whole day
+            chunk_size: Rows per chunk and per database round-trip
+
+        Yields:
+            Lists of article dictionaries, including analysis and keywords
+
+        Raises:
+            AppException: If there's a database error
+        """
+        columns = [
+            NewsArticle.id, NewsArticle.title, NewsArticle.source, NewsArticle.published_at,
+            NewsArticle.url, NewsArticle.content, NewsArticle.summary,
+            NewsArticle.analysis_result, NewsArticle.keywords,
+        ]
+        session = self.Session()
+        try:
+            query = session.query(*columns)
+            query = filter_date_range(query, NewsArticle.published_at, from_date, to_date)
+            rows = query.order_by(NewsArticle.id)\
+                .execution_options(stream_results=True)\
+                .yield_per(chunk_size)
+
+            chunk = []
+            for row in rows:
+                chunk.append({
+                    'id': row.id,
+                    'title': row.title,
+                    'source': row.source,
+                    'published_at': row.published_at.isoformat(),
+                    'url': row.url,
+                    'content': row.content,
+                    'summary': row.summary,
+                    'analysis_result': row.analysis_result,
+                    'keywords': row.keywords,
+                })
+                if len(chunk) == chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+        except SQLAlchemyError as e:
+            logger.error(f"Database error: {str(e)}")
+            raise AppException(f"Failed to stream news: {str(e)}")
+        finally:
+            session.close()
+
+    def link_story(self, article_id: int, representative_id: int, similarity: float) -> None:
+        """
+        Link a near-duplicate article to the representative article of its story.
+
+        Args:
+            article_id: ID of the duplicate article
+            representative_id: ID of the article analyzed for the story
+            similarity: Estimated similarity between the two
+
+        Raises:
+            AppException: If database operation fails
+        """
+        session = self.Session()
+        try:
+            session.merge(StoryLink(
+                article_id=article_id,
+                representative_id=representative_id,
+                similarity=similarity,
+            ))
+            session.commit()
+            self.bump_generation()
+        except SQLAlchemyError as e:
+            logger.error(f"Database error: {str(e)}")
+            session.rollback()
+            raise AppException(f"Failed to link story: {str(e)}")
+        finally:
+            session.close()
+
+    def get_story_duplicates(self, representative_id: int) -> List[int]:
+        """
+        Get the IDs of all articles linked to a story representative.
+
+        Args:
+            representative_id: ID of the representative article
+
+        Returns:
+            List of duplicate article IDs
+
+        Raises:
+            AppException: If there's a database error
+        """
+        session = self.Session()
+        try:
+            links = session.query(StoryLink.article_id)\
+                .filter_by(representative_id=representative_id)\
+                .order_by(StoryLink.article_id)\
+                .all()
+            return [link.article_id for link in links]
+        except SQLAlchemyError as e:
+            logger.error(f"Database error: {str(e)}")
+            raise AppException(f"Failed to get story duplicates: {str(e)}")
+        finally:
+            session.close()
+
+    def save_related_articles(self, article_id: int, related: List[Tuple[int, float]]) -> None:
+        """
+        Replace the precomputed related articles of an article.
+
+        Args:
+            article_id: ID of the article
+            related: (related article ID, similarity) pairs, best first
+
+        Raises:
+            AppException: If database operation fails
+        """
+        session = self.Session()
+        try:
+            self._replace_related(session, article_id, related)
+            session.commit()
+            self.bump_generation()
+        except SQLAlchemyError as e:
+            logger.error(f"Database error: {str(e)}")
+            session.rollback()
+            raise AppException(f"Failed to save related articles: {str(e)}")
+        finally:
+            session.close()
+
+    def add_related_article(self, article_id: int, related_id: int, score: float, limit: int) -> bool:
+        """
+        Offer a new neighbor to an article's related list, keeping the best ``limit``.
+
+        Args:
+            article_id: ID of the article whose list is updated
+            related_id: ID of the candidate related article
+            score: Similarity of the candidate
+            limit: Maximum length of the list
+
+        Returns:
+            True if the list changed
+
+        Raises:
+            AppException: If database operation fails
+        """
+        session = self.Session()
+        try:
+            current = session.query(RelatedArticle.related_id, RelatedArticle.score)\
+                .filter_by(article_id=article_id)\
+                .order_by(RelatedArticle.rank)\
+                .all()
+            related = {row.related_id: row.score for row in current}
+            related[related_id] = max(score, related.get(related_id, score))
+            ranked = sorted(related.items(), key=lambda item: (-item[1], item[0]))[:limit]
+            if ranked == [(row.related_id, row.score) for row in current]:
+                return False
+
+            self._replace_related(session, article_id, ranked)
+            session.commit()
+            self.bump_generation()
+            return True
+        except SQLAlchemyError as e:
+            logger.error(f"Database error: {str(e)}")
+            session.rollback()
+            raise AppException(f"Failed to add related article: {str(e)}")
+        finally:
+            session.close()
+
+    @staticmethod
+    def _replace_related(session, article_id: int, related: List[Tuple[int, float]]) -> None:
+        session.query(RelatedArticle).filter_by(article_id=article_id).delete()
+        session.add_all(
+            RelatedArticle(article_id=article_id, rank=rank, related_id=related_id, score=score)
+            for rank, (related_id, score) in enumerate(related)
+        )
+
+    def get_related_articles(self, article_id: int, limit: int = 5) -> List[Dict]:
+        """
+        Get the precomputed related articles of an article, best first.
+
+        Args:
+            article_id: ID of the article
+            limit: Maximum number of related articles
+
+        Returns:
+            List of dicts with id, title, source, published_at and score;
+            related articles deleted since are skipped
+
+        Raises:
+            AppException: If there's a database error
+        """
+        session = self.Session()
+        try:
+            rows = session.query(NewsArticle, RelatedArticle.score)\
+                .join(RelatedArticle, RelatedArticle.related_id == NewsArticle.id)\
+                .filter(RelatedArticle.article_id == article_id)\
+                .order_by(RelatedArticle.rank)\
+                .limit(limit)\
+                .all()
+            return [{
+                'id': article.id,
+                'title': article.title,
+                'source': article.source,
+                'published_at': article.published_at.isoformat(),
+                'score': score,
+            } for article, score in rows]
+        except SQLAlchemyError as e:
+            logger.error(f"Database error: {str(e)}")
+            raise AppException(f"Failed to get related articles: {str(e)}")
+        finally:
+            session.close()
+
+    def record_llm_usage(self, usage: Dict) -> None:
+        """
+        Append one LLM call to the token usage ledger.
+
+        Args:
+            usage: Dictionary with keys:
+                - article_id (int, optional)
+                - model (str, optional)
+                - prompt_tokens (int)
+                - completion_tokens (int)
+                - cached_tokens (int, optional): prompt tokens served from the provider cache
+                - latency_ms (float, optional)
+
+        Raises:
+            AppException: If database operation fails
+        """
+        session = self.Session()
+        try:
+            session.add(LLMUsage(
+                article_id=usage.get('article_id'),
+                model=usage.get('model'),
+                prompt_tokens=usage['prompt_tokens'],
+                completion_tokens=usage['completion_tokens'],
+                cached_tokens=usage.get('cached_tokens') or 0,
+                cache_hit=bool(usage.get('cached_tokens')),
+                latency_ms=usage.get('latency_ms'),
+            ))
+            session.commit()
+        except SQLAlchemyError as e:
+            logger.error(f"Database error: {str(e)}")
+            session.rollback()
+            raise AppException(f"Failed to record LLM usage: {str(e)}")
+        finally:
+            session.close()
+
+    def get_usage_rollup(self, group_by: str = "day", from_date: str = None, to_date: str = None) -> List[Dict]:
+        """
+        Aggregate the token usage ledger.
+
+        Args:
+            group_by: "day" for calendar days, "source" for the source of the
+                article each call was made for ("-" for calls without one)
+            from_date: Minimum call time (ISO format string)
+            to_date: Maximum call time (ISO format string); a date covers the whole day
+
+        Returns:
+            List of dicts with key, calls, prompt_tokens, completion_tokens,
+            cached_tokens, cache_hits and avg_latency_ms, ordered by key
+
+        Raises:
+            AppException: If there's a database error or group_by is unknown
+        """
+        if group_by == "day":
+            key = func.date(LLMUsage.created_at)
+        elif group_by == "source":
+            key = func.coalesce(NewsArticle.source, "-")
+        else:
+            raise AppException(f"Unknown usage grouping: {group_by}")
+
+        session = self.Session()
+        try:
+            query = session.query(
+                key.label('key'),
+                func.count(LLMUsage.id).label('calls'),
+                func.sum(LLMUsage.prompt_tokens).label('prompt_tokens'),
+                func.sum(LLMUsage.completion_tokens).label('completion_tokens'),
+                func.sum(LLMUsage.cached_tokens).label('cached_tokens'),
+                func.sum(func.cast(LLMUsage.cache_hit, Integer)).label('cache_hits'),
+                func.avg(LLMUsage.latency_ms).label('avg_latency_ms'),
+            )
+            if group_by == "source":
+                query = query.outerjoin(NewsArticle, NewsArticle.id == LLMUsage.article_id)
+            query = filter_date_range(query, LLMUsage.created_at, from_date, to_date)
+
+            return [{
+                'key': row.key,
+                'calls': row.calls,
+                'prompt_tokens': row.prompt_tokens or 0,
+                'completion_tokens': row.completion_tokens or 0,
+                'cached_tokens': row.cached_tokens or 0,
+                'cache_hits': row.cache_hits or 0,
+                'avg_latency_ms': round(row.avg_latency_ms, 1) if row.avg_latency_ms is not None else None,
+            } for row in query.group_by(key).order_by(key).all()]
+        except SQLAlchemyError as e:
+            logger.error(f"Database error: {str(e)}")
+            raise AppException(f"Failed to get usage rollup: {str(e)}")
+        finally:
+            session.close()
+
+    def save_triage(self, article_id: int, decision: Dict) -> None:
+        """
+        Record how triage routed an article.
+
+        Args:
+            article_id: ID of the article
+            decision: Dictionary with keys:
+                - score (float): importance in [0, 1]
+                - route (str): "full" or "light"
+                - classifier (str): name of the scoring classifier
+                - reason (str, optional)
+                - translated_title (str, optional): title translation of light articles
+
+        Raises:
+            AppException: If database operation fails
+        """
+        session = self.Session()
+        try:
+            session.merge(TriageDecision(
+                article_id=article_id,
+                score=decision['score'],
+                route=decision['route'],
+                classifier=decision['classifier'],
+                reason=decision.get('reason'),
+                translated_title=decision.get('translated_title'),
+            ))
+            session.commit()
+            self.bump_generation()
+        except SQLAlchemyError as e:
+            logger.error(f"Database error: {str(e)}")
+            session.rollback()
+            raise AppException(f"Failed to save triage decision: {str(e)}")
+        finally:
+            session.close()
+
+    def get_triage(self, article_id: int) -> Optional[Dict]:
+        """
+        Get the triage decision of an article.
+
+        Args:
+            article_id: ID of the article
+
+        Returns:
+            Dict with score, route, classifier, reason and translated_title,
+            or None if the article was not triaged
+
+        Raises:
+            AppException: If there's a database error
+        """
+        session = self.Session()
+        try:
+            decision = session.get(TriageDecision, article_id)
+            if decision is None:
+                return None
+            return {
+                'score': decision.score,
+                'route': decision.route,
+                'classifier': decision.classifier,
+                'reason': decision.reason,
+                'translated_title': decision.translated_title,
+            }
+        except SQLAlchemyError as e:
+            logger.error(f"Database error: {str(e)}")
+            raise AppException(f"Failed to get triage decision: {str(e)}")
+        finally:
+            session.close()
+
+    def get_digest_summary(self, key: str) -> Optional[str]:
+        """
+        Get a cached digest summary.
+
+        Args:
+            key: Hash of the summarized input
+
+        Returns:
+            The summary text, or None if it is not cached
+
+        Raises:
+            AppException: If there's a database error
+        """
+        session = self.Session()
+        try:
+            summary = session.get(DigestSummary, key)
+            return summary.summary if summary is not None else None
+        except SQLAlchemyError as e:
+            logger.error(f"Database error: {str(e)}")
+            raise AppException(f"Failed to get digest summary: {str(e)}")
+        finally:
+            session.close()
+
+    def save_digest_summary(self, summary: Dict) -> None:
+        """
+        Cache a digest summary.
+
+        Args:
+            summary: Dictionary with keys:
+                - key (str): hash of the summarized input
+                - digest_date (str): day of the digest, YYYY-MM-DD
+                - kind (str): "map" for a partial summary, "reduce" for a combined one
+                - source (str, optional): source of the summarized articles
+                - article_ids (list, optional)
+                - summary (str)
+
+        Raises:
+            AppException: If database operation fails
+        """
+        session = self.Session()
+        try:
+            session.merge(DigestSummary(
+                key=summary['key'],
+                digest_date=summary['digest_date'],
+                kind=summary['kind'],
+                source=summary.get('source'),
+                article_ids=summary.get('article_ids'),
+                summary=summary['summary'],
+            ))
+            session.commit()
+        except SQLAlchemyError as e:
+            logger.error(f"Database error: {str(e)}")
+            session.rollback()
+            raise AppException(f"Failed to save digest summary: {str(e)}")
+        finally:
+            session.close()
+
+    def prune_digest_summaries(self, digest_date: str, keep_keys: Iterable[str]) -> int:
+        """
+        Delete the cached summaries of a day that the latest digest no longer uses.
+
+        Args:
+            digest_date: Day of the digest, YYYY-MM-DD
+            keep_keys: Keys of the summaries to keep
+
+        Returns:
+            Number of deleted summaries
+
+        Raises:
+            AppException: If database operation fails
+        """
+        session = self.Session()
+        try:
+            deleted = session.query(DigestSummary)\
+                .filter(DigestSummary.digest_date == digest_date)\
+                .filter(DigestSummary.key.notin_(list(keep_keys)))\
+                .delete(synchronize_session=False)
+            session.commit()
+            return deleted
+        except SQLAlchemyError as e:
+            logger.error(f"Database error: {str(e)}")
+            session.rollback()
+            raise AppException(f"Failed to prune digest summaries: {str(e)}")
+        finally:
+            session.close()
+
+    def record_failure(self, failure: Dict) -> int:
+        """
+        Add an article that failed processing to the dead-letter table.
+
+        A saved article has at most one entry: failing again updates it and
+        adds the new attempts to its count.
+
+        Args:
+            failure: Dictionary with keys:
+                - article_id (int, optional): None if the article was never saved
+                - url (str, optional)
+                - stage (str, optional): pipeline stage that failed
+                - error_type (str): "transient", "parse", "permanent" or "circuit_open"
+                - error (str, optional)
+                - attempts (int, optional)
+                - payload (dict, optional): the article as fetched, for the retry
+
+        Returns:
+            int: ID of the dead-letter entry
+
+        Raises:
+            AppException: If database operation fails
+        """
+        session = self.Session()
+        try:
+            entry = None
+            if failure.get('article_id') is not None:
+                entry = session.query(FailedArticle).filter_by(article_id=failure['article_id']).first()
+            if entry is None:
+                entry = FailedArticle(article_id=failure.get('article_id'), attempts=0)
+                session.add(entry)
+            entry.url = failure.get('url')
+            entry.stage = failure.get('stage')
+            entry.error_type = failure['error_type']
+            entry.error = failure.get('error')
+            entry.attempts += failure.get('attempts') or 1
+            entry.payload = failure.get('payload')
+            session.commit()
+            return entry.id
+        except SQLAlchemyError as e:
+            logger.error(f"Database error: {str(e)}")
+            session.rollback()
+            raise AppException(f"Failed to record failed article: {str(e)}")
+        finally:
+            session.close()
+
+    def get_failed_articles(self, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Get the dead-letter entries, oldest first.
+
+        Args:
+            limit: Maximum number of entries; None for all
+
+        Returns:
+            List of dicts with id, article_id, url, stage, error_type, error,
+            attempts, payload, created_at and updated_at
+
+        Raises:
+            AppException: If there's a database error
+        """
+        session = self.Session()
+        try:
+            query = session.query(FailedArticle).order_by(FailedArticle.id)
+            if limit is not None:
+                query = query.limit(limit)
+            return [{
+                'id': entry.id,
+                'article_id': entry.article_id,
+                'url': entry.url,
+                'stage': entry.stage,
+                'error_type': entry.error_type,
+                'error': entry.error,
+                'attempts': entry.attempts,
+                'payload': entry.payload,
+                'created_at': entry.created_at.isoformat(),
+                'updated_at': entry.updated_at.isoformat(),
+            } for entry in query.all()]
+        except SQLAlchemyError as e:
+            logger.error(f"Database error: {str(e)}")
+            raise AppException(f"Failed to get failed articles: {str(e)}")
+        finally:
+            session.close()
+
+    def delete_failure(self, failure_id: int) -> None:
+        """
+        Remove an entry from the dead-letter table, e.g. after a successful retry.
+
+        Args:
+            failure_id: ID of the dead-letter entry
+
+        Raises:
+            AppException: If database operation fails
+        """
+        session = self.Session()
+        try:
+            session.query(FailedArticle).filter_by(id=failure_id).delete()
+            session.commit()
+        except SQLAlchemyError as e:
+            logger.error(f"Database error: {str(e)}")
+            session.rollback()
+            raise AppException(f"Failed to delete failed article: {str(e)}")
+        finally:
+            session.close()
+
     def get_sources(self) -> List[Dict]:
         """Get list of all news sources from dedicated table"""
         session = self.Session()
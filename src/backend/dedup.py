@@ -0,0 +1,105 @@
+import hashlib
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+MERSENNE_PRIME = (1 << 61) - 1
+TRUNCATION_MARKER = re.compile(r"\[\+\d+ chars\]")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, drop NewsAPI truncation markers and punctuation, collapse whitespace"""
+    text = TRUNCATION_MARKER.sub(" ", text.lower())
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+
+def shingles(text: str, size: int = 3) -> set:
+    """Word n-grams of normalized text; short texts fall back to their words"""
+    words = normalize_text(text).split()
+    if len(words) < size:
+        return set(words)
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+class StoryClusterer:
+    """
+    Groups syndicated copies of a story with MinHash signatures and LSH banding.
+
+    The first article added for a story is its representative; later
+    articles whose estimated Jaccard similarity to it reaches the threshold
+    are reported as duplicates of it.
+    """
+
+    def __init__(self, threshold: float = 0.6, num_perm: int = 128, seed: int = 1):
+        """
+        Args:
+            threshold: Minimum estimated Jaccard similarity of shingles to count as duplicate
+            num_perm: Number of MinHash permutations
+            seed: Seed for the permutation parameters
+        """
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = self._choose_bands(threshold, num_perm)
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+        self.signatures: Dict[object, np.ndarray] = {}
+        self.buckets: Dict[Tuple[int, bytes], List] = defaultdict(list)
+
+    @staticmethod
+    def _choose_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+        """Pick bands x rows whose LSH S-curve midpoint is closest to the threshold"""
+        best = None
+        for rows in range(1, num_perm + 1):
+            bands = num_perm // rows
+            midpoint = (1 / bands) ** (1 / rows)
+            if best is None or abs(midpoint - threshold) < best[0]:
+                best = (abs(midpoint - threshold), bands, rows)
+        return best[1], best[2]
+
+    def signature(self, text: str) -> np.ndarray:
+        """Compute the MinHash signature of a text"""
+        hashes = np.array(
+            [int.from_bytes(hashlib.sha1(s.encode("utf-8")).digest()[:4], "little") for s in shingles(text)] or [0],
+            dtype=np.uint64
+        )
+        # a, b and the hashes are all below 2**32, so a * h + b cannot overflow
+        permuted = (np.outer(hashes, self._a) + self._b) % MERSENNE_PRIME
+        return permuted.min(axis=0)
+
+    def _band_keys(self, signature: np.ndarray):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def match(self, text: str) -> Tuple[Optional[object], float]:
+        """
+        Find the representative of the story a text belongs to.
+
+        Returns:
+            (representative_id, estimated similarity), or (None, 0.0) for a new story
+        """
+        signature = self.signature(text)
+        candidates = {article_id for key in self._band_keys(signature) for article_id in self.buckets.get(key, ())}
+
+        best_id, best_similarity = None, 0.0
+        for article_id in candidates:
+            similarity = float(np.mean(self.signatures[article_id] == signature))
+            if similarity >= self.threshold and similarity > best_similarity:
+                best_id, best_similarity = article_id, similarity
+        return best_id, best_similarity
+
+    def add(self, article_id, text: str) -> None:
+        """Register an article as the representative of a new story"""
+        signature = self.signature(text)
+        self.signatures[article_id] = signature
+        for key in self._band_keys(signature):
+            self.buckets[key].append(article_id)
+
+    def __len__(self) -> int:
+        return len(self.signatures)
@@ -0,0 +1,213 @@
+"""
+Daily digest of the analyzed news, built with map-reduce summarization.
+
+The day's analyses are grouped by source and split, in article ID order,
+into chunks of ``chunk_size`` articles. Each chunk is summarized once
+(map); the partial summaries are combined into the briefing (reduce),
+hierarchically when there are more than ``reduce_fanout`` of them.
+
+Every summary is cached in the DataStore under a hash of its input. Since
+article IDs only grow, articles arriving later land in the last chunk of
+their source, so a re-run only summarizes that chunk and re-reduces.
+"""
+import hashlib
+import json
+from datetime import date, datetime
+from itertools import groupby
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from loguru import logger
+
+from .data_store import DataStore
+
+
+MAP = "map"
+REDUCE = "reduce"
+
+
+def summary_key(kind: str, day: str, payload) -> str:
+    """Cache key of a summary: hash of its kind, day and exact input"""
+    content = json.dumps([kind, day, payload], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+class DigestBuilder:
+    """Builds and writes the daily digest of the analyzed articles"""
+
+    def __init__(
+        self,
+        llm: BaseChatModel,
+        db: DataStore,
+        chunk_size: int = 8,
+        reduce_fanout: int = 8,
+        callbacks: Optional[List] = None
+    ):
+        """
+        Args:
+            llm: The language model instance
+            db: The data store holding the analyses and the summary cache
+            chunk_size: Articles per partial summary
+            reduce_fanout: Maximum summaries combined per reduce call
+            callbacks: LangChain callbacks for the LLM calls, e.g. the usage ledger
+        """
+        self.llm = llm
+        self.db = db
+        self.chunk_size = chunk_size
+        self.reduce_fanout = reduce_fanout
+        self.callbacks = callbacks or []
+        self.stats = {MAP: 0, REDUCE: 0, "cached": 0}
+        self._keys: List[str] = []
+
+        self.map_prompt = ChatPromptTemplate.from_template("""
+            你是一个专业的新闻编辑。下面是来自 {source} 的若干篇新闻及其影响分析（JSON 数组）。
+            请用中文写一段简明的要点摘要，合并相同的事件，保留最重要的事实、影响和趋势判断。
+
+            News: {articles}
+        """)
+        self.reduce_prompt = ChatPromptTemplate.from_template("""
+            你是一个专业的新闻编辑。下面是 {day} 按来源整理的新闻摘要。
+            请用中文撰写当天的新闻简报：先列出最重要的三到五个事件及其影响，
+            再按主题（政治、经济、社会等）归纳其余要点。使用 Markdown 格式，不要编造摘要之外的内容。
+
+            Summaries: {summaries}
+        """)
+        self.map_chain = self.map_prompt | self.llm | StrOutputParser()
+        self.reduce_chain = self.reduce_prompt | self.llm | StrOutputParser()
+
+    def load_articles(self, day: date) -> List[Dict]:
+        """Analyzed articles published on the day, by source and ID"""
+        articles = [
+            article
+            for chunk in self.db.iter_news_chunks(from_date=day.isoformat(), to_date=day.isoformat())
+            for article in chunk
+            if article["analysis_result"] is not None
+        ]
+        articles.sort(key=lambda article: (article["source"], article["id"]))
+        return articles
+
+    def _summarize(self, kind: str, day: str, payload, invoke, source: str = None, article_ids: List = None) -> str:
+        """Summary from the cache, or from ``invoke`` and then cached"""
+        key = summary_key(kind, day, payload)
+        self._keys.append(key)
+        summary = self.db.get_digest_summary(key)
+        if summary is not None:
+            self.stats["cached"] += 1
+            return summary
+
+        summary = invoke().strip()
+        self.stats[kind] += 1
+        self.db.save_digest_summary({
+            "key": key,
+            "digest_date": day,
+            "kind": kind,
+            "source": source,
+            "article_ids": article_ids,
+            "summary": summary,
+        })
+        return summary
+
+    def map_chunk(self, day: str, source: str, articles: List[Dict]) -> str:
+        """Partial summary of a chunk of one source's articles"""
+        payload = [{
+            "id": article["id"],
+            "title": article["title"],
+            "analysis": article["analysis_result"],
+            "keywords": article["keywords"],
+        } for article in articles]
+        article_ids = [article["id"] for article in articles]
+        config = {"callbacks": self.callbacks, "metadata": {"article_ids": article_ids}}
+
+        return self._summarize(
+            MAP, day, [source, payload],
+            lambda: self.map_chain.invoke(
+                {"source": source, "articles": json.dumps(payload, ensure_ascii=False)}, config=config
+            ),
+            source=source,
+            article_ids=article_ids
+        )
+
+    def reduce(self, day: str, summaries: List[str]) -> str:
+        """Combine summaries into one, in rounds of at most ``reduce_fanout``"""
+        while len(summaries) > self.reduce_fanout:
+            groups = [summaries[i:i + self.reduce_fanout] for i in range(0, len(summaries), self.reduce_fanout)]
+            summaries = [self.reduce(day, group) if len(group) > 1 else group[0] for group in groups]
+        return self._summarize(
+            REDUCE, day, summaries,
+            lambda: self.reduce_chain.invoke(
+                {"day": day, "summaries": json.dumps(summaries, ensure_ascii=False)},
+                config={"callbacks": self.callbacks}
+            )
+        )
+
+    def build(self, day: date) -> Dict:
+        """
+        Build the digest of a day, reusing cached summaries.
+
+        Returns:
+            Dict with date, generated_at, article count, per-source partial
+            summaries and articles, the briefing (None without articles) and
+            call stats
+        """
+        day_key = day.isoformat()
+        self.stats = {MAP: 0, REDUCE: 0, "cached": 0}
+        self._keys = []
+
+        articles = self.load_articles(day)
+        sources = []
+        for source, group in groupby(articles, key=lambda article: article["source"]):
+            group = list(group)
+            sources.append({
+                "source": source,
+                "articles": [{"id": article["id"], "title": article["title"]} for article in group],
+                "summaries": [
+                    self.map_chunk(day_key, source, group[i:i + self.chunk_size])
+                    for i in range(0, len(group), self.chunk_size)
+                ],
+            })
+
+        partials = [f"[{entry['source']}] {summary}" for entry in sources for summary in entry["summaries"]]
+        briefing = self.reduce(day_key, partials) if partials else None
+
+        pruned = self.db.prune_digest_summaries(day_key, self._keys)
+        logger.info(f"Digest {day_key}: {len(articles)} articles, {self.stats}, {pruned} stale summaries pruned")
+
+        return {
+            "date": day_key,
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "articles": len(articles),
+            "briefing": briefing,
+            "sources": sources,
+            "stats": dict(self.stats),
+        }
+
+    @staticmethod
+    def to_markdown(digest: Dict) -> str:
+        """Render a digest as Markdown"""
+        lines = [f"# Daily Digest {digest['date']}", ""]
+        if digest["briefing"] is None:
+            lines += ["No analyzed articles.", ""]
+            return "\n".join(lines)
+
+        lines += [digest["briefing"], "", "## By Source", ""]
+        for entry in digest["sources"]:
+            lines += [f"### {entry['source']}", ""]
+            lines += [f"{summary}\n" for summary in entry["summaries"]]
+            lines += [f"- {article['title']} (#{article['id']})" for article in entry["articles"]]
+            lines.append("")
+        lines.append(f"_{digest['articles']} articles, generated {digest['generated_at']}_")
+        return "\n".join(lines) + "\n"
+
+    def write(self, digest: Dict, output_dir: Path) -> Dict[str, Path]:
+        """Write the digest as Markdown and JSON, replacing earlier versions of the day"""
+        output_dir.mkdir(parents=True, exist_ok=True)
+        paths = {
+            "markdown": output_dir / f"digest-{digest['date']}.md",
+            "json": output_dir / f"digest-{digest['date']}.json",
+        }
+        paths["markdown"].write_text(self.to_markdown(digest), encoding="utf-8")
+        paths["json"].write_text(json.dumps(digest, indent=2, ensure_ascii=False), encoding="utf-8")
+        return paths
@@ -0,0 +1,415 @@
+import hashlib
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Literal
+
+import numpy as np
+from loguru import logger
+
+
+Precision = Literal["float32", "float16", "int8"]
+
+
+def cache_key(scope: str, text: str) -> str:
+    """Key a text by its content hash, scoped to the embedding model and its output settings"""
+    return hashlib.sha1(f"{scope}\0{text}".encode("utf-8")).hexdigest()
+
+
+def cache_scope(embedding_function) -> str:
+    """
+    Everything that changes the vectors an embedding function returns.
+
+    Functions may define ``cache_scope()``; otherwise their name is used.
+    """
+    scope = getattr(embedding_function, "cache_scope", None)
+    return scope() if scope is not None else embedding_function.name()
+
+
+class EmbeddingCache:
+    """
+    Bounded, persistent embedding cache keyed by content hash.
+
+    Vectors are stored in a memory-mapped ``vectors.npy`` array with one
+    slot per entry; ``index.sqlite`` maps keys to slots and tracks usage.
+    Once ``max_entries`` slots are taken, the least recently used ones
+    are recycled.
+    """
+
+    MEMORY = ":memory:"
+
+    def __init__(self, cache_dir: str = "embedding_cache", max_entries: int = 200_000, dtype: str = "float32"):
+        """
+        Args:
+            cache_dir: Directory holding the vector file and its index;
+                ":memory:" uses a temporary directory removed on ``close``
+            max_entries: Maximum number of cached embeddings
+            dtype: Storage dtype of the vectors ("float32" or "float16")
+        """
+        self.temp_directory = None
+        if str(cache_dir) == self.MEMORY:
+            self.temp_directory = tempfile.TemporaryDirectory(prefix="embedding_cache-")
+            cache_dir = self.temp_directory.name
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.dtype = np.dtype(dtype)
+        self.vectors_path = self.cache_dir / "vectors.npy"
+        self.vectors: Optional[np.memmap] = None
+        self.hits = 0
+        self.misses = 0
+        self._clock = 0
+        self._lock = threading.Lock()
+
+        self.conn = sqlite3.connect(self.cache_dir / "index.sqlite", check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, slot INTEGER NOT NULL UNIQUE, last_used INTEGER NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS ix_entries_last_used ON entries (last_used)")
+        self.conn.commit()
+        self._clock = self.conn.execute("SELECT COALESCE(MAX(last_used), 0) FROM entries").fetchone()[0]
+
+        if self.vectors_path.exists():
+            self.vectors = np.load(self.vectors_path, mmap_mode="r+")
+            if self.vectors.shape[0] != max_entries or self.vectors.dtype != self.dtype:
+                logger.warning(f"Embedding cache layout changed, resetting {self.cache_dir}")
+                self.clear()
+
+    def _open_vectors(self, dim: int) -> np.memmap:
+        if self.vectors is None:
+            self.vectors = np.lib.format.open_memmap(
+                self.vectors_path, mode="w+", dtype=self.dtype, shape=(self.max_entries, dim)
+            )
+        return self.vectors
+
+    def _lookup(self, keys: List[str]) -> Dict[str, int]:
+        slots = {}
+        unique = list(dict.fromkeys(keys))
+        for start in range(0, len(unique), 500):
+            batch = unique[start:start + 500]
+            slots.update(self.conn.execute(
+                f"SELECT key, slot FROM entries WHERE key IN ({','.join('?' * len(batch))})",
+                batch
+            ).fetchall())
+        return slots
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Return cached vectors for the given keys, marking them as used"""
+        if not keys or self.vectors is None:
+            self.misses += len(keys)
+            return {}
+
+        found = {}
+        with self._lock:
+            for key, slot in self._lookup(keys).items():
+                found[key] = np.array(self.vectors[slot], dtype=np.float32)
+
+            if found:
+                self._clock += 1
+                self.conn.executemany(
+                    "UPDATE entries SET last_used = ? WHERE key = ?",
+                    [(self._clock, key) for key in found]
+                )
+                self.conn.commit()
+
+        hit_count = sum(1 for key in keys if key in found)
+        self.hits += hit_count
+        self.misses += len(keys) - hit_count
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        """Store vectors, evicting the least recently used entries when full"""
+        if not items:
+            return
+
+        with self._lock:
+            dim = len(next(iter(items.values())))
+            vectors = self._open_vectors(dim)
+            if vectors.shape[1] != dim:
+                logger.warning(f"Embedding dimension changed ({vectors.shape[1]} -> {dim}), resetting cache")
+                self._reset_locked()
+                vectors = self._open_vectors(dim)
+
+            existing = self._lookup(list(items))
+            new_keys = [key for key in items if key not in existing]
+
+            # Vectors are keyed by content, so known keys only need touching
+            self._clock += 1
+            self.conn.executemany(
+                "UPDATE entries SET last_used = ? WHERE key = ?",
+                [(self._clock, key) for key in existing]
+            )
+
+            # Slots are only freed by eviction, so unused slots are always the tail
+            used = self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            slots = list(range(used, min(self.max_entries, used + len(new_keys))))
+            shortfall = len(new_keys) - len(slots)
+            if shortfall > 0:
+                evicted = self.conn.execute(
+                    "SELECT key, slot FROM entries WHERE last_used < ? ORDER BY last_used LIMIT ?",
+                    (self._clock, shortfall)
+                ).fetchall()
+                self.conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key, _ in evicted])
+                slots.extend(slot for _, slot in evicted)
+
+            rows = []
+            for key, slot in zip(new_keys, slots):
+                vectors[slot] = items[key]
+                rows.append((key, slot, self._clock))
+
+            self.conn.executemany("INSERT INTO entries (key, slot, last_used) VALUES (?, ?, ?)", rows)
+            self.conn.commit()
+            vectors.flush()
+
+    def _reset_locked(self) -> None:
+        self.conn.execute("DELETE FROM entries")
+        self.conn.commit()
+        self.vectors = None
+        if self.vectors_path.exists():
+            self.vectors_path.unlink()
+
+    def clear(self) -> None:
+        """Drop every cached vector"""
+        with self._lock:
+            self._reset_locked()
+
+    def close(self) -> None:
+        """Close the index; a temporary cache is deleted"""
+        with self._lock:
+            self.vectors = None
+            self.conn.close()
+            if self.temp_directory is not None:
+                self.temp_directory.cleanup()
+                self.temp_directory = None
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CachedEmbeddingFunction:
+    """
+    Chroma embedding function that serves repeated texts from an EmbeddingCache.
+
+    Wraps any Chroma-compatible embedding function and only forwards cache
+    misses to it. Name and config are delegated to the wrapped function, so
+    collections created without the cache can still be opened with it.
+    Cache keys use the function's ``cache_scope`` instead, so vectors of
+    another precision or pooling are never served from the cache.
+    """
+
+    def __init__(self, embedding_function, cache: EmbeddingCache):
+        """
+        Args:
+            embedding_function: The embedding function computing cache misses
+            cache: The cache to read from and write to
+        """
+        self.embedding_function = embedding_function
+        self.cache = cache
+
+    def __call__(self, input: List[str]) -> List[np.ndarray]:
+        scope = cache_scope(self.embedding_function)
+        keys = [cache_key(scope, text) for text in input]
+        cached = self.cache.get_many(keys)
+
+        missing = {}
+        for key, text in zip(keys, input):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        if missing:
+            computed = self.embedding_function(list(missing.values()))
+            fresh = {key: np.asarray(vector, dtype=np.float32) for key, vector in zip(missing, computed)}
+            self.cache.put_many(fresh)
+            cached.update(fresh)
+
+        logger.debug(f"Embedded {len(input)} texts ({len(input) - len(missing)} from cache)")
+        return [cached[key] for key in keys]
+
+    def embed_query(self, input: List[str]) -> List[np.ndarray]:
+        return self(input)
+
+    def close(self) -> None:
+        self.cache.close()
+
+    def name(self) -> str:
+        return self.embedding_function.name()
+
+    def get_config(self) -> Dict:
+        return self.embedding_function.get_config()
+
+    def build_from_config(self, config: Dict):
+        return self.embedding_function.build_from_config(config)
+
+    def is_legacy(self) -> bool:
+        return False
+
+    def default_space(self) -> str:
+        return self.embedding_function.default_space()
+
+    def supported_spaces(self) -> List[str]:
+        return self.embedding_function.supported_spaces()
+
+
+class LocalEmbeddingFunction:
+    """
+    CPU embedding engine running a MiniLM-style ONNX model with explicit tuning knobs.
+
+    Texts are sorted by length and padded per batch rather than to the
+    model's maximum length, and the ONNX session gets an explicit
+    intra-op thread count. Output can be quantized to float16 or int8;
+    int8 vectors are scaled by 127, which leaves cosine distances intact.
+    """
+
+    DEFAULT_MODEL_PATH = Path.home() / ".cache" / "chroma" / "onnx_models" / "all-MiniLM-L6-v2" / "onnx"
+
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        batch_size: int = 64,
+        num_threads: int = 0,
+        precision: Precision = "float32",
+        max_length: int = 256
+    ):
+        """
+        Args:
+            model_path: Directory containing ``model.onnx`` and ``tokenizer.json``;
+                Chroma's default all-MiniLM-L6-v2 download when omitted
+            batch_size: Number of texts per forward pass
+            num_threads: ONNX Runtime intra-op threads, 0 lets the runtime decide
+            precision: Output precision ("float32", "float16" or "int8")
+            max_length: Maximum number of tokens per text, longer texts are truncated
+        """
+        if precision not in ("float32", "float16", "int8"):
+            raise ValueError(f"Unsupported precision: {precision}")
+
+        self.model_path = Path(model_path) if model_path else None
+        self.batch_size = batch_size
+        self.num_threads = num_threads
+        self.precision = precision
+        self.max_length = max_length
+        self._session = None
+        self._tokenizer = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._session is not None:
+                return
+
+            import onnxruntime
+            from tokenizers import Tokenizer
+
+            model_path = self.model_path
+            if model_path is None:
+                # Reuse the model Chroma downloads for its default embedding function,
+                # letting its first call fetch the files when they are missing
+                model_path = self.DEFAULT_MODEL_PATH
+                if not (model_path / "model.onnx").exists():
+                    from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+                    ONNXMiniLM_L6_V2()(["warm up"])
+
+            options = onnxruntime.SessionOptions()
+            options.log_severity_level = 3
+            options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+            options.inter_op_num_threads = 1
+            if self.num_threads:
+                options.intra_op_num_threads = self.num_threads
+
+            tokenizer = Tokenizer.from_file(str(model_path / "tokenizer.json"))
+            tokenizer.enable_truncation(max_length=self.max_length)
+            tokenizer.enable_padding(pad_id=0, pad_token="[PAD]")
+
+            self._tokenizer = tokenizer
+            self._session = onnxruntime.InferenceSession(
+                str(model_path / "model.onnx"),
+                sess_options=options,
+                providers=["CPUExecutionProvider"]
+            )
+            logger.info(
+                f"Loaded embedding model from {model_path} "
+                f"(batch_size={self.batch_size}, threads={self.num_threads or 'auto'}, precision={self.precision})"
+            )
+
+    def _forward(self, texts: List[str]) -> np.ndarray:
+        encoded = self._tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encoded], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encoded], dtype=np.int64)
+
+        last_hidden_state = self._session.run(None, {
+            "input_ids": input_ids,
+            "attention_mask": attention_mask,
+            "token_type_ids": np.zeros_like(input_ids),
+        })[0]
+
+        # Attention-weighted mean pooling followed by L2 normalization
+        mask = attention_mask[:, :, np.newaxis].astype(np.float32)
+        embeddings = (last_hidden_state * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1e-12
+        return (embeddings / norms).astype(np.float32)
+
+    def quantize(self, embeddings: np.ndarray) -> np.ndarray:
+        """Convert normalized float32 embeddings to the configured precision"""
+        if self.precision == "float16":
+            return embeddings.astype(np.float16)
+        if self.precision == "int8":
+            return np.round(embeddings * 127).astype(np.int8)
+        return embeddings
+
+    def __call__(self, input: List[str]) -> List[np.ndarray]:
+        if not input:
+            return []
+        self._load()
+
+        # Sorting by length keeps padding within a batch to a minimum
+        order = sorted(range(len(input)), key=lambda i: len(input[i]))
+        embeddings = np.empty((len(input), 0), dtype=np.float32)
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            vectors = self._forward([input[i] for i in batch])
+            if embeddings.shape[1] == 0:
+                embeddings = np.empty((len(input), vectors.shape[1]), dtype=np.float32)
+            embeddings[batch] = vectors
+
+        return list(self.quantize(embeddings))
+
+    def embed_query(self, input: List[str]) -> List[np.ndarray]:
+        return self(input)
+
+    def name(self) -> str:
+        # Same model and pooling as Chroma's default function, so existing
+        # collections stay compatible when no custom model is configured
+        return "default" if self.model_path is None else f"local:{self.model_path.name}"
+
+    def cache_scope(self) -> str:
+        """Model plus the settings that change its vectors, for embedding cache keys"""
+        return f"{self.name()}|pooling=mean|normalize=l2|precision={self.precision}|max_length={self.max_length}"
+
+    def get_config(self) -> Dict:
+        return {
+            "model_path": str(self.model_path) if self.model_path else None,
+            "batch_size": self.batch_size,
+            "num_threads": self.num_threads,
+            "precision": self.precision,
+            "max_length": self.max_length,
+        }
+
+    @staticmethod
+    def build_from_config(config: Dict) -> "LocalEmbeddingFunction":
+        return LocalEmbeddingFunction(**config)
+
+    def is_legacy(self) -> bool:
+        return False
+
+    def default_space(self) -> str:
+        return "cosine"
+
+    def supported_spaces(self) -> List[str]:
+        return ["cosine", "l2", "ip"]
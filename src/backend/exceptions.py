@@ -12,4 +12,16 @@ class AnalysisError(AppException):
 
 class RetrievalError(AppException):
     """Exception raised for retrieval-related errors"""
-    pass 
\ No newline at end of file
+    pass
+
+class CircuitOpenError(AppException):
+    """Exception raised when a call is refused because its circuit breaker is open"""
+    pass
+
+class RetriesExhausted(AnalysisError):
+    """Exception raised when a call still fails after its retries; the last error is the cause"""
+
+    def __init__(self, error: Exception, error_type: str, attempts: int):
+        super().__init__(f"{error_type} error after {attempts} attempts: {error}")
+        self.error_type = error_type
+        self.attempts = attempts
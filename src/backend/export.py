@@ -0,0 +1,138 @@
+"""
+Bulk export of news articles for analytics.
+
+Rows are streamed from the DataStore in fixed-size chunks and written as
+they arrive: JSON Lines one object per line, Parquet one row group per
+chunk. Memory use is bounded by the chunk size, not the table size.
+
+Parquet needs the optional ``pyarrow`` package.
+"""
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from loguru import logger
+
+from .data_store import DataStore
+from .exceptions import AppException
+
+
+FORMATS = ("jsonl", "parquet")
+
+
+def keyword_list(keywords) -> Optional[List[str]]:
+    """Keywords as a list of strings; the JSON column is not guaranteed to hold one"""
+    if keywords is None:
+        return None
+    if not isinstance(keywords, list):
+        keywords = [keywords]
+    return [str(keyword) for keyword in keywords]
+
+
+def analysis_text(analysis) -> Optional[str]:
+    """Analysis as text, serializing structured results"""
+    if analysis is None or isinstance(analysis, str):
+        return analysis
+    return json.dumps(analysis, ensure_ascii=False)
+
+
+def write_jsonl(chunks: Iterable[List[Dict]], path: Path) -> int:
+    """Write rows as JSON Lines, returning the row count"""
+    rows = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for chunk in chunks:
+            for row in chunk:
+                f.write(json.dumps(row, ensure_ascii=False))
+                f.write("\n")
+            rows += len(chunk)
+    return rows
+
+
+def parquet_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("id", pa.int64()),
+        ("title", pa.string()),
+        ("source", pa.string()),
+        ("published_at", pa.timestamp("us")),
+        ("url", pa.string()),
+        ("content", pa.string()),
+        ("summary", pa.string()),
+        ("analysis_result", pa.string()),
+        ("keywords", pa.list_(pa.string())),
+    ])
+
+
+def write_parquet(chunks: Iterable[List[Dict]], path: Path) -> int:
+    """Write rows as Parquet, one row group per chunk, returning the row count"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise AppException("Parquet export requires pyarrow: pip install pyarrow")
+
+    schema = parquet_schema()
+    rows = 0
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        for chunk in chunks:
+            columns = {name: [row[name] for row in chunk] for name in schema.names}
+            columns["published_at"] = [datetime.fromisoformat(value) for value in columns["published_at"]]
+            batch = pa.RecordBatch.from_pydict(columns, schema=schema)
+            writer.write_batch(batch)
+            rows += len(chunk)
+    return rows
+
+
+def export_news(
+    path: Path,
+    format: str = "jsonl",
+    from_date: str = None,
+    to_date: str = None,
+    chunk_size: int = 1000,
+    data_store: Optional[DataStore] = None
+) -> int:
+    """
+    Export news articles published in a date range to a file.
+
+    The file is written next to ``path`` and moved into place once complete,
+    so readers never see a partial export.
+
+    Args:
+        path: Output file
+        format: "jsonl" or "parquet"
+        from_date: Minimum publish date (ISO format string)
+        to_date: Maximum publish date (ISO format string)
+        chunk_size: Rows read and written at a time
+        data_store: Source database; defaults to news.db
+
+    Returns:
+        Number of exported articles
+
+    Raises:
+        AppException: If the format is unknown, pyarrow is missing or the database fails
+    """
+    if format not in FORMATS:
+        raise AppException(f"Unknown export format: {format}")
+    writer = write_parquet if format == "parquet" else write_jsonl
+
+    data_store = data_store or DataStore()
+    chunks = (
+        [dict(row, keywords=keyword_list(row["keywords"]), analysis_result=analysis_text(row["analysis_result"]))
+         for row in chunk]
+        for chunk in data_store.iter_news_chunks(from_date=from_date, to_date=to_date, chunk_size=chunk_size)
+    )
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staged = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        rows = writer(chunks, staged)
+        os.replace(staged, path)
+    finally:
+        staged.unlink(missing_ok=True)
+
+    logger.info(f"Exported {rows} articles to {path}")
+    return rows
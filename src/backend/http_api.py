@@ -0,0 +1,133 @@
+"""
+Optional JSON HTTP endpoints over ``backend.queries``, using only the standard library.
+
+    GET /api/sources
+    GET /api/articles?sources=bbc-news,cnn&keywords=...&from=...&to=...&page=1&page_size=10
+    GET /api/articles/<id>
+    GET /api/articles/<id>/related
+
+Responses carry an ETag built from the DataStore generation and the
+request URL, so a matching ``If-None-Match`` is answered with 304 before
+SQLite is touched. Bodies of at least ``GZIP_MIN_BYTES`` are gzip-compressed
+for clients that accept it.
+"""
+import gzip
+import hashlib
+import json
+import re
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from loguru import logger
+
+from .data_store import DataStore
+from .queries import get_sources, get_articles, get_article, get_related_articles
+
+
+GZIP_MIN_BYTES = 1024
+MAX_PAGE_SIZE = 100
+ARTICLE_PATH = re.compile(r"/api/articles/(\d+)")
+RELATED_PATH = re.compile(r"/api/articles/(\d+)/related")
+
+
+def representation_etag(etag: str, compressed: bool) -> str:
+    """Strong ETag of the identity or gzip representation of a response"""
+    return f'"{etag}-gz"' if compressed else f'"{etag}"'
+
+
+class QueryAPIHandler(BaseHTTPRequestHandler):
+    server_version = "NewsQueryAPI/1.0"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        data_store = self.server.data_store
+
+        etag = f'{data_store.generation()}-{hashlib.sha1(self.path.encode("utf-8")).hexdigest()[:16]}'
+        # Gzip and identity bodies are different representations with their own tags
+        current = {representation_etag(etag, False)}
+        if self.accepts_gzip():
+            current.add(representation_etag(etag, True))
+        matched = current.intersection(tag.strip() for tag in self.headers.get("If-None-Match", "").split(","))
+        if matched:
+            self.send_response(304)
+            self.send_header("ETag", matched.pop())
+            self.end_headers()
+            return
+
+        try:
+            status, payload = self.route(url.path, parse_qs(url.query), data_store)
+        except ValueError as e:
+            status, payload = 400, {"error": str(e)}
+        except Exception as e:
+            logger.error(f"Query API error on {self.path}: {e}")
+            status, payload = 500, {"error": "Internal server error"}
+
+        self.send_json(status, payload, etag if status == 200 else None)
+
+    def route(self, path: str, params: Dict, data_store: DataStore) -> Tuple[int, object]:
+        if path == "/api/sources":
+            return 200, get_sources(data_store=data_store)
+
+        if path == "/api/articles":
+            def param(name: str) -> Optional[str]:
+                return params[name][0] if name in params else None
+
+            page_size = int(param("page_size") or 10)
+            if not 1 <= page_size <= MAX_PAGE_SIZE:
+                raise ValueError(f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+            sources = [source for source in (param("sources") or "").split(",") if source]
+            return 200, get_articles(
+                sources=sources or None,
+                keywords=param("keywords"),
+                from_date=param("from"),
+                to_date=param("to"),
+                page=max(1, int(param("page") or 1)),
+                page_size=page_size,
+                data_store=data_store
+            )
+
+        match = RELATED_PATH.fullmatch(path)
+        if match:
+            return 200, get_related_articles(int(match.group(1)), data_store=data_store)
+
+        match = ARTICLE_PATH.fullmatch(path)
+        if match:
+            article = get_article(int(match.group(1)), data_store=data_store)
+            if article is None:
+                return 404, {"error": "Article not found"}
+            return 200, article
+
+        return 404, {"error": "Not found"}
+
+    def accepts_gzip(self) -> bool:
+        return "gzip" in self.headers.get("Accept-Encoding", "")
+
+    def send_json(self, status: int, payload, etag: Optional[str]) -> None:
+        """Send a JSON body, gzip-compressed if large and accepted; ``etag`` is the unquoted base tag"""
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        compress = len(body) >= GZIP_MIN_BYTES and self.accepts_gzip()
+        if compress:
+            body = gzip.compress(body, compresslevel=6)
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Vary", "Accept-Encoding")
+        if compress:
+            self.send_header("Content-Encoding", "gzip")
+        if etag:
+            self.send_header("ETag", representation_etag(etag, compress))
+            self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def create_server(host: str = "127.0.0.1", port: int = 8000, data_store: Optional[DataStore] = None) -> ThreadingHTTPServer:
+    """Build the query API server; port 0 picks a free port"""
+    server = ThreadingHTTPServer((host, port), QueryAPIHandler)
+    server.data_store = data_store or DataStore()
+    return server
@@ -10,3 +10,24 @@ LLM = ChatDeepSeek(
     max_retries=2,
     api_key=settings.DEEPSEEK_API_KEY
 )
+
+# Same model for the analysis pipeline, which retries through its RetryPolicy;
+# client retries on top would multiply the attempts per article
+ANALYSIS_LLM = ChatDeepSeek(
+    model="deepseek-chat",
+    temperature=0.7,
+    max_tokens=None,
+    timeout=None,
+    max_retries=0,
+    api_key=settings.DEEPSEEK_API_KEY
+)
+
+# Small, deterministic model for triage and title translation
+TRIAGE_LLM = ChatDeepSeek(
+    model=settings.TRIAGE_MODEL,
+    temperature=0,
+    max_tokens=256,
+    timeout=None,
+    max_retries=2,
+    api_key=settings.DEEPSEEK_API_KEY
+)
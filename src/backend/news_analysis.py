@@ -11,30 +11,6 @@ from backend.core.document import NewsDocument
 
 
 
-class ChatBox:
-    """
-    前端可以通过聊天窗口随时做实事分析
-    """
-    def __init__(self, llm):
-        self.llm = llm
-
-        self.chat_prompt = ChatPromptTemplate.from_messages([
-            ("system", """你是一个专业的新闻分析助手。你可以：
-            1. 回答用户关于新闻的问题
-            2. 分析新闻之间的关联
-            3. 解释新闻背景
-            4. 提供专业的见解
-            
-            请基于以下新闻上下文回答用户的问题：
-            
-            {context}
-            """),
-            ("user", "{question}")
-        ])
-    
-    
-
-
 class NewsAnalysis:
     def __init__(self):
         self.llm = ChatDeepSeek(api_key=settings.DEEPSEEK_API_KEY)
@@ -0,0 +1,467 @@
+"""
+Built-in brute-force vector engine.
+
+``NumpyClient`` and ``NumpyCollection`` implement the subset of the Chroma
+client and collection API that ``VectorStore`` uses, so either backend can
+sit behind it. Each collection is a directory holding:
+
+- ``vectors.npy``: normalized float16 (or float32) vectors in a
+  memory-mapped NumPy array; a row's position is its slot, and the OS page
+  cache shares the pages between every process that opens the collection
+- ``meta.sqlite``: the sidecar table mapping slots to IDs, documents and
+  JSON metadata, with ``where`` filters translated to SQL
+
+Queries score all matching rows with blocked matrix products, so results
+are exact. Only cosine distance is supported. float16 halves memory and
+disk, but NumPy's cast to float32 dominates query time; float32 storage
+trades the space back for roughly 5x faster scans.
+"""
+import json
+import os
+import re
+import shutil
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+BLOCK_ROWS = 65_536
+MIN_CAPACITY = 1024
+FIELD_PATTERN = re.compile(r"\w+")
+COMPARISONS = {"$eq": "=", "$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}
+
+
+def _field(key: str) -> Tuple[str, List]:
+    # Literal paths for plain names so the expression indexes can be used
+    if FIELD_PATTERN.fullmatch(key):
+        return f"json_extract(metadata, '$.{key}')", []
+    return "json_extract(metadata, ?)", [f'$."{key}"']
+
+
+def where_to_sql(where: Optional[Dict]) -> Tuple[str, List]:
+    """
+    Translate a Chroma-style ``where`` filter to an SQL condition on the metadata column.
+
+    Semantics follow ``vector_store.matches_where``: missing fields never
+    match comparisons or $in, and always match $ne and $nin.
+
+    Returns:
+        SQL condition and its parameters
+    """
+    if not where:
+        return "1", []
+
+    clauses = []
+    params = []
+    for key, condition in where.items():
+        if key in ("$and", "$or"):
+            parts = [where_to_sql(clause) for clause in condition]
+            joiner = " AND " if key == "$and" else " OR "
+            clauses.append("(" + (joiner.join(sql for sql, _ in parts) or ("1" if key == "$and" else "0")) + ")")
+            params.extend(param for _, part_params in parts for param in part_params)
+            continue
+
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        field, field_params = _field(key)
+        for operator, operand in condition.items():
+            if operator in COMPARISONS:
+                clauses.append(f"{field} {COMPARISONS[operator]} ?")
+                params.extend(field_params + [operand])
+            elif operator == "$ne":
+                clauses.append(f"{field} IS NOT ?")
+                params.extend(field_params + [operand])
+            elif operator in ("$in", "$nin"):
+                operand = list(operand)
+                if not operand:
+                    clauses.append("0" if operator == "$in" else "1")
+                    continue
+                placeholders = ", ".join("?" * len(operand))
+                if operator == "$in":
+                    clauses.append(f"{field} IN ({placeholders})")
+                    params.extend(field_params + operand)
+                else:
+                    clauses.append(f"({field} IS NULL OR {field} NOT IN ({placeholders}))")
+                    params.extend(field_params + field_params + operand)
+            else:
+                raise ValueError(f"Unsupported where operator: {operator}")
+
+    return " AND ".join(clauses), params
+
+
+def _normalize(embeddings) -> np.ndarray:
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[np.newaxis, :]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class NumpyCollection:
+    """A collection of vectors in a memory-mapped array with SQLite metadata"""
+
+    def __init__(
+        self,
+        path: Path,
+        name: str,
+        metadata: Optional[Dict] = None,
+        embedding_function=None,
+        dtype: str = "float16"
+    ):
+        """
+        Args:
+            path: Directory of the collection, created if missing
+            name: Collection name
+            metadata: Collection metadata, kept for API compatibility
+            embedding_function: Used for documents and queries given without embeddings
+            dtype: Storage type of new vector files; existing files keep theirs
+        """
+        self.path = Path(path)
+        self.name = name
+        self.dtype = np.dtype(dtype)
+        self.metadata = metadata or {}
+        self.embedding_function = embedding_function
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._vectors = None
+        self._inode = None
+        self.conn = sqlite3.connect(self.path / "meta.sqlite", check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS chunks ("
+            "row INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE, document TEXT, metadata TEXT NOT NULL DEFAULT '{}')"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS chunks_article_id ON chunks(json_extract(metadata, '$.article_id'))")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS chunks_published_ts ON chunks(json_extract(metadata, '$.published_ts'))")
+        self.conn.commit()
+
+    @property
+    def vectors_path(self) -> Path:
+        return self.path / "vectors.npy"
+
+    def _mapped(self, rows_needed: int = 0) -> Optional[np.memmap]:
+        """Return the vector array, remapping it if another writer grew or replaced it"""
+        if not self.vectors_path.exists():
+            return None
+        inode = os.stat(self.vectors_path).st_ino
+        if self._vectors is None or inode != self._inode or rows_needed > len(self._vectors):
+            self._vectors = np.lib.format.open_memmap(self.vectors_path, mode="r+")
+            self._inode = inode
+        return self._vectors
+
+    def _reserve(self, rows_needed: int, dim: int) -> np.memmap:
+        """Return a vector array with at least ``rows_needed`` rows, doubling its capacity as needed"""
+        vectors = self._mapped(rows_needed)
+        if vectors is not None and rows_needed <= len(vectors):
+            if vectors.shape[1] != dim:
+                raise ValueError(f"Embedding dimension {dim} does not match collection dimension {vectors.shape[1]}")
+            return vectors
+
+        capacity = max(MIN_CAPACITY, len(vectors) if vectors is not None else 0)
+        while capacity < rows_needed:
+            capacity *= 2
+
+        staged = self.vectors_path.with_suffix(".tmp")
+        dtype = vectors.dtype if vectors is not None else self.dtype
+        grown = np.lib.format.open_memmap(staged, mode="w+", dtype=dtype, shape=(capacity, dim))
+        if vectors is not None:
+            grown[:len(vectors)] = vectors
+        grown.flush()
+        del grown
+        os.replace(staged, self.vectors_path)
+        return self._mapped(rows_needed)
+
+    def _embed(self, documents: Sequence[str], embeddings, is_query: bool = False) -> np.ndarray:
+        if embeddings is None:
+            if self.embedding_function is None:
+                raise ValueError(f"Collection {self.name} has no embedding function")
+            if is_query:
+                embeddings = self.embedding_function.embed_query(input=list(documents))
+            else:
+                embeddings = self.embedding_function(input=list(documents))
+        return _normalize(embeddings)
+
+    def _rows(self, ids: Sequence[str]) -> Dict[str, int]:
+        rows = {}
+        ids = list(ids)
+        for start in range(0, len(ids), 500):
+            batch = ids[start:start + 500]
+            query = f"SELECT id, row FROM chunks WHERE id IN ({', '.join('?' * len(batch))})"
+            rows.update(self.conn.execute(query, batch).fetchall())
+        return rows
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def _write(self, ids, documents, metadatas, embeddings, skip_existing: bool) -> None:
+        if not ids:
+            raise ValueError("Expected at least one ID")
+        ids = list(ids)
+        documents = list(documents) if documents is not None else [None] * len(ids)
+        metadatas = list(metadatas) if metadatas is not None else [None] * len(ids)
+
+        with self._lock:
+            existing = self._rows(ids)
+            if skip_existing:
+                keep = [i for i, doc_id in enumerate(ids) if doc_id not in existing]
+                if not keep:
+                    return
+                ids = [ids[i] for i in keep]
+                documents = [documents[i] for i in keep]
+                metadatas = [metadatas[i] for i in keep]
+                embeddings = [embeddings[i] for i in keep] if embeddings is not None else None
+
+            vectors = self._embed(documents, embeddings)
+            next_row = self.conn.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM chunks").fetchone()[0]
+            rows = []
+            for doc_id in ids:
+                if doc_id in existing:
+                    rows.append(existing[doc_id])
+                else:
+                    existing[doc_id] = next_row
+                    rows.append(next_row)
+                    next_row += 1
+
+            mapped = self._reserve(next_row, vectors.shape[1])
+            mapped[rows] = vectors
+            mapped.flush()
+
+            self.conn.executemany(
+                "INSERT INTO chunks (row, id, document, metadata) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET document = excluded.document, metadata = excluded.metadata",
+                [(row, doc_id, document, json.dumps(metadata or {}))
+                 for row, doc_id, document, metadata in zip(rows, ids, documents, metadatas)]
+            )
+            self.conn.commit()
+
+    def add(self, ids, documents=None, metadatas=None, embeddings=None) -> None:
+        """Insert documents; IDs that already exist are left untouched"""
+        self._write(ids, documents, metadatas, embeddings, skip_existing=True)
+
+    def upsert(self, ids, documents=None, metadatas=None, embeddings=None) -> None:
+        """Insert documents or replace existing ones"""
+        self._write(ids, documents, metadatas, embeddings, skip_existing=False)
+
+    def update(self, ids, documents=None, metadatas=None, embeddings=None) -> None:
+        """
+        Update existing documents. Metadata is merged into the stored metadata,
+        with None values removing keys; unknown IDs are ignored.
+        """
+        with self._lock:
+            stored = {
+                doc_id: (row, document, json.loads(metadata))
+                for doc_id, row, document, metadata in self._select(list(ids), None)
+            }
+            updates = []
+            reembed = []
+            for i, doc_id in enumerate(ids):
+                if doc_id not in stored:
+                    continue
+                row, document, metadata = stored[doc_id]
+                if metadatas is not None:
+                    metadata = {**metadata, **metadatas[i]}
+                    metadata = {key: value for key, value in metadata.items() if value is not None}
+                if documents is not None:
+                    document = documents[i]
+                    reembed.append(i)
+                elif embeddings is not None:
+                    reembed.append(i)
+                updates.append((document, json.dumps(metadata), doc_id))
+
+            if reembed:
+                vectors = self._embed(
+                    [documents[i] for i in reembed] if documents is not None else [],
+                    [embeddings[i] for i in reembed] if embeddings is not None else None
+                )
+                mapped = self._mapped()
+                mapped[[stored[ids[i]][0] for i in reembed]] = vectors
+                mapped.flush()
+
+            self.conn.executemany("UPDATE chunks SET document = ?, metadata = ? WHERE id = ?", updates)
+            self.conn.commit()
+
+    def _select(self, ids: Optional[List[str]], where: Optional[Dict], limit: Optional[int] = None, offset: Optional[int] = None):
+        condition, params = where_to_sql(where)
+        query = f"SELECT id, row, document, metadata FROM chunks WHERE {condition}"
+        if ids is not None:
+            if not ids:
+                return []
+            query += f" AND id IN ({', '.join('?' * len(ids))})"
+            params = params + list(ids)
+        query += " ORDER BY row"
+        if limit is not None or offset:
+            query += " LIMIT ? OFFSET ?"
+            params = params + [limit if limit is not None else -1, offset or 0]
+        return self.conn.execute(query, params).fetchall()
+
+    def get(self, ids=None, where=None, limit=None, offset=None, include=("metadatas", "documents")) -> Dict:
+        """Fetch documents by ID and/or metadata filter, in insertion order"""
+        with self._lock:
+            records = self._select(list(ids) if ids is not None else None, where, limit, offset)
+            embeddings = None
+            if "embeddings" in include:
+                vectors = self._mapped()
+                rows = [record[1] for record in records]
+                embeddings = np.asarray(vectors[rows], dtype=np.float32) if rows else np.empty((0, 0), dtype=np.float32)
+        return {
+            "ids": [record[0] for record in records],
+            "embeddings": embeddings,
+            "documents": [record[2] for record in records] if "documents" in include else None,
+            "metadatas": [json.loads(record[3]) for record in records] if "metadatas" in include else None,
+            "included": list(include),
+        }
+
+    def delete(self, ids=None, where=None) -> None:
+        """Delete documents by ID and/or metadata filter; their slots are not reused"""
+        with self._lock:
+            condition, params = where_to_sql(where)
+            query = f"DELETE FROM chunks WHERE {condition}"
+            if ids is not None:
+                ids = list(ids)
+                if not ids:
+                    return
+                query += f" AND id IN ({', '.join('?' * len(ids))})"
+                params = params + ids
+            self.conn.execute(query, params)
+            self.conn.commit()
+
+    def query(
+        self,
+        query_texts=None,
+        query_embeddings=None,
+        n_results: int = 10,
+        where=None,
+        include=("metadatas", "documents", "distances")
+    ) -> Dict:
+        """Exact cosine top-k for one or more queries, scored in blocks of rows"""
+        queries = self._embed(query_texts or [], query_embeddings, is_query=True)
+
+        with self._lock:
+            condition, params = where_to_sql(where)
+            total, max_row = self.conn.execute("SELECT COUNT(*), COALESCE(MAX(row) + 1, 0) FROM chunks").fetchone()
+            vectors = self._mapped(max_row)
+            if where or total < max_row:
+                rows = np.fromiter(
+                    (row for row, in self.conn.execute(f"SELECT row FROM chunks WHERE {condition}", params)),
+                    dtype=np.int64
+                )
+            else:
+                rows = None
+
+            candidate_count = total if rows is None else len(rows)
+            k = min(n_results, candidate_count)
+            hits = [([], []) for _ in range(len(queries))]
+            if k > 0:
+                hits = self._top_k(vectors, rows, max_row, queries, k)
+
+            records = {}
+            hit_rows = sorted({row for found_rows, _ in hits for row in found_rows})
+            for start in range(0, len(hit_rows), 500):
+                batch = hit_rows[start:start + 500]
+                query = f"SELECT row, id, document, metadata FROM chunks WHERE row IN ({', '.join('?' * len(batch))})"
+                records.update((row, rest) for row, *rest in self.conn.execute(query, batch))
+
+        return {
+            "ids": [[records[row][0] for row in found_rows] for found_rows, _ in hits],
+            "documents": [[records[row][1] for row in found_rows] for found_rows, _ in hits]
+            if "documents" in include else None,
+            "metadatas": [[json.loads(records[row][2]) for row in found_rows] for found_rows, _ in hits]
+            if "metadatas" in include else None,
+            "distances": [distances for _, distances in hits] if "distances" in include else None,
+            "included": list(include),
+        }
+
+    @staticmethod
+    def _top_k(vectors: np.ndarray, rows: Optional[np.ndarray], max_row: int, queries: np.ndarray, k: int):
+        """Keep the k best rows per query across blocks, then sort them"""
+        candidate_rows = []
+        candidate_scores = []
+        total = max_row if rows is None else len(rows)
+        for start in range(0, total, BLOCK_ROWS):
+            if rows is None:
+                block_rows = np.arange(start, min(start + BLOCK_ROWS, total))
+                block = vectors[start:start + len(block_rows)]
+            else:
+                block_rows = rows[start:start + BLOCK_ROWS]
+                block = vectors[block_rows]
+            scores = np.asarray(block, dtype=np.float32) @ queries.T
+
+            if len(block_rows) > k:
+                top = np.argpartition(-scores, k - 1, axis=0)[:k]
+            else:
+                top = np.broadcast_to(np.arange(len(block_rows))[:, np.newaxis], scores.shape)
+            candidate_rows.append(block_rows[top])
+            candidate_scores.append(np.take_along_axis(scores, top, axis=0))
+
+        all_rows = np.concatenate(candidate_rows)
+        all_scores = np.concatenate(candidate_scores)
+        order = np.argsort(-all_scores, axis=0, kind="stable")[:k]
+
+        hits = []
+        for q in range(queries.shape[0]):
+            best = order[:, q]
+            hits.append((
+                [int(row) for row in all_rows[best, q]],
+                [float(1 - score) for score in all_scores[best, q]]
+            ))
+        return hits
+
+    def close(self) -> None:
+        with self._lock:
+            self._vectors = None
+            self.conn.close()
+
+
+class NumpyClient:
+    """Client managing ``NumpyCollection`` directories under one path"""
+
+    def __init__(self, path: str, dtype: str = "float16"):
+        """
+        Args:
+            path: Directory holding one subdirectory per collection
+            dtype: Storage type for the vectors of new collections, float16 or float32
+        """
+        self.path = Path(path)
+        self.dtype = dtype
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._collections: Dict[str, NumpyCollection] = {}
+        self._lock = threading.Lock()
+
+    def get_or_create_collection(self, name: str, metadata: Optional[Dict] = None, embedding_function=None) -> NumpyCollection:
+        with self._lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                collection = NumpyCollection(self.path / name, name, metadata, embedding_function, self.dtype)
+                self._collections[name] = collection
+            elif embedding_function is not None:
+                collection.embedding_function = embedding_function
+            return collection
+
+    def list_collections(self) -> List[NumpyCollection]:
+        return [
+            self.get_or_create_collection(directory.name)
+            for directory in sorted(self.path.iterdir())
+            if (directory / "meta.sqlite").exists()
+        ]
+
+    def delete_collection(self, name: str) -> None:
+        with self._lock:
+            directory = self.path / name
+            if not (directory / "meta.sqlite").exists():
+                raise ValueError(f"Collection {name} does not exist")
+            collection = self._collections.pop(name, None)
+            if collection is not None:
+                collection.close()
+            shutil.rmtree(directory)
+
+    def close(self) -> None:
+        """Close every open collection"""
+        with self._lock:
+            for collection in self._collections.values():
+                collection.close()
+            self._collections.clear()
@@ -0,0 +1,272 @@
+"""
+Opt-in CPU and memory profiling of pipeline runs, using only the standard library.
+
+``profile_run("cpu", ...)`` samples the stack of the profiled thread from a
+background thread and writes collapsed stacks (one ``frame;frame;... count``
+line per distinct stack, as read by flamegraph.pl and speedscope) plus a
+JSON summary of the hottest functions. ``profile_run("mem", ...)`` traces
+allocations with tracemalloc and writes, per pipeline stage, the peak
+memory and the source lines whose allocations grew the most.
+
+Both attribute their data to the tracing spans that are open while it is
+collected (see ``backend.tracing``). Nothing is hooked unless a profile is
+requested.
+"""
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+from .tracing import add_span_listener, remove_span_listener
+
+
+NO_STAGE = "-"
+IGNORED_FILES = {tracemalloc.__file__, __file__, "<frozen importlib._bootstrap>"}
+
+
+def frame_label(code) -> str:
+    """Flame graph frame name: qualified function name (Python 3.11+) and file"""
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Samples the call stack of one thread at a fixed interval.
+
+    Sampling runs in a daemon thread reading ``sys._current_frames()``, so
+    the profiled code is not instrumented; the cost is one stack walk per
+    interval. Samples are prefixed with the open tracing stage.
+    """
+
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None):
+        """
+        Args:
+            interval: Seconds between samples
+            thread_id: Thread to sample; defaults to the thread calling ``start``
+        """
+        self.interval = interval
+        self.thread_id = thread_id
+        self.stacks: Counter = Counter()
+        self.stage = NO_STAGE
+        self.samples = 0
+        self.started = None
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def span_started(self, name: str, depth: int) -> None:
+        if depth == 0:
+            self.stage = name
+
+    def span_finished(self, name: str, depth: int) -> None:
+        if depth == 0:
+            self.stage = NO_STAGE
+
+    def start(self) -> None:
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        self.started = time.perf_counter()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self.started
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(frame_label(frame.f_code))
+                frame = frame.f_back
+            stack.append(f"stage:{self.stage}")
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """Collapsed stack lines, most frequent first"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def summary(self, top: int = 30) -> Dict:
+        """Self and total samples per function and samples per stage"""
+        self_samples: Counter = Counter()
+        total_samples: Counter = Counter()
+        stages: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")
+            stages[frames[0][len("stage:"):]] += count
+            self_samples[frames[-1]] += count
+            for frame in set(frames[1:]):
+                total_samples[frame] += count
+
+        def table(counter: Counter) -> List[Dict]:
+            return [{
+                "frame": frame,
+                "samples": count,
+                "percent": round(100 * count / self.samples, 2) if self.samples else 0.0,
+            } for frame, count in counter.most_common(top)]
+
+        return {
+            "interval_ms": self.interval * 1000,
+            "duration_s": round(self.duration, 3),
+            "samples": self.samples,
+            "stages": dict(stages.most_common()),
+            "top_self": table(self_samples),
+            "top_total": table(total_samples),
+        }
+
+
+class MemoryProfiler:
+    """
+    Tracks allocations per tracing stage with tracemalloc.
+
+    At the start and end of every top-level span the traced memory peak is
+    reset and read, and the traced size per source line is diffed against
+    the one taken when the span started. Each snapshot walks every traced
+    allocation, which is acceptable for a diagnostic run but not for
+    normal ones.
+    """
+
+    def __init__(self, frames: int = 1, top: int = 15):
+        """
+        Args:
+            frames: Traceback depth recorded per allocation
+            top: Number of allocation sites kept per stage
+        """
+        self.frames = frames
+        self.top = top
+        self.stages = defaultdict(lambda: {"calls": 0, "peak_bytes": 0, "net_bytes": 0, "sites": Counter()})
+        self.overall: List[Dict] = []
+        self.peak_bytes = 0
+        self._open = None
+        self._first = None
+
+    @staticmethod
+    def _sizes() -> Dict[str, Tuple[int, int]]:
+        """Traced (size, count) per allocating source line, excluding the profiler itself"""
+        # Grouping once and diffing dicts is much cheaper than filter_traces plus compare_to
+        sizes = {}
+        for stat in tracemalloc.take_snapshot().statistics("lineno"):
+            filename = stat.traceback[0].filename
+            if filename not in IGNORED_FILES:
+                sizes[str(stat.traceback)] = (stat.size, stat.count)
+        return sizes
+
+    @staticmethod
+    def _diff(after: Dict[str, Tuple[int, int]], before: Dict[str, Tuple[int, int]]) -> List[Tuple[str, int, int]]:
+        """(site, size diff, count diff) of sites that changed, largest growth first"""
+        diffs = []
+        for site in after.keys() | before.keys():
+            size_after, count_after = after.get(site, (0, 0))
+            size_before, count_before = before.get(site, (0, 0))
+            if size_after != size_before:
+                diffs.append((site, size_after - size_before, count_after - count_before))
+        diffs.sort(key=lambda diff: diff[1], reverse=True)
+        return diffs
+
+    def span_started(self, name: str, depth: int) -> None:
+        if depth == 0:
+            before = self._sizes()
+            tracemalloc.reset_peak()
+            self._open = (name, before, tracemalloc.get_traced_memory()[0])
+
+    def span_finished(self, name: str, depth: int) -> None:
+        if depth != 0 or self._open is None:
+            return
+        _, before, current_before = self._open
+        self._open = None
+        current, peak = tracemalloc.get_traced_memory()
+
+        stage = self.stages[name]
+        stage["calls"] += 1
+        stage["peak_bytes"] = max(stage["peak_bytes"], peak - current_before)
+        stage["net_bytes"] += current - current_before
+        for site, size_diff, _ in self._diff(self._sizes(), before):
+            if size_diff <= 0:
+                break
+            stage["sites"][site] += size_diff
+
+    def start(self) -> None:
+        tracemalloc.start(self.frames)
+        self._first = self._sizes()
+
+    def stop(self) -> None:
+        self.overall = [
+            {"site": site, "size_diff": size_diff, "count_diff": count_diff}
+            for site, size_diff, count_diff in self._diff(self._sizes(), self._first)[:self.top]
+        ]
+        self.peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    def summary(self) -> Dict:
+        """Peak, net growth and top growing allocation sites per stage"""
+        return {
+            "peak_bytes": self.peak_bytes,
+            "overall": self.overall,
+            "stages": {
+                name: {
+                    "calls": stage["calls"],
+                    "peak_bytes": stage["peak_bytes"],
+                    "net_bytes": stage["net_bytes"],
+                    "top_allocations": [
+                        {"site": site, "size_diff": size} for site, size in stage["sites"].most_common(self.top)
+                    ],
+                } for name, stage in sorted(self.stages.items())
+            },
+        }
+
+
+@contextmanager
+def profile_run(mode: str, output_dir: Path, name: str = "analyze", interval: float = 0.005) -> Iterator[Dict[str, Path]]:
+    """
+    Profile the block and write the results to ``output_dir``.
+
+    Args:
+        mode: "cpu" for stack sampling, "mem" for tracemalloc
+        output_dir: Directory the reports are written to
+        name: Prefix of the report files
+        interval: Seconds between CPU samples
+
+    Yields:
+        Dict filled with the written file paths once the block exits
+    """
+    if mode == "cpu":
+        profiler = SamplingProfiler(interval=interval)
+    elif mode == "mem":
+        profiler = MemoryProfiler()
+    else:
+        raise ValueError(f"Unknown profile mode: {mode}")
+
+    paths: Dict[str, Path] = {}
+    add_span_listener(profiler)
+    profiler.start()
+    try:
+        yield paths
+    finally:
+        profiler.stop()
+        remove_span_listener(profiler)
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        prefix = output_dir / f"{name}-{datetime.now():%Y%m%d-%H%M%S}.{mode}"
+        if mode == "cpu":
+            paths["collapsed"] = prefix.with_name(prefix.name + ".collapsed")
+            paths["collapsed"].write_text(profiler.collapsed())
+        paths["json"] = prefix.with_name(prefix.name + ".json")
+        paths["json"].write_text(json.dumps(profiler.summary(), indent=2))
+        logger.info(f"Profile written to {', '.join(str(path) for path in paths.values())}")
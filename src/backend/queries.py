@@ -0,0 +1,56 @@
+"""
+Read-only queries for the web tier.
+
+Only depends on the DataStore (SQLAlchemy + SQLite), so listing articles
+does not load the LLM, vector store or news API stacks, nor require their
+API keys in the environment.
+"""
+from typing import Dict, List, Optional
+
+from .data_store import DataStore
+
+
+DEFAULT_SOURCES = [
+    {"id": "bbc-news", "name": "BBC News"},
+    {"id": "cnn", "name": "CNN"},
+    {"id": "reuters", "name": "Reuters"}
+]
+
+
+def get_sources(data_store: Optional[DataStore] = None) -> List[Dict]:
+    """Get list of available news sources"""
+    # TODO: Implement proper source loading from DataStore
+    return [dict(source) for source in DEFAULT_SOURCES]
+
+
+def get_articles(
+    sources: List[str] = None,
+    keywords: str = None,
+    from_date: str = None,
+    to_date: str = None,
+    page: int = 1,
+    page_size: int = 10,
+    data_store: Optional[DataStore] = None
+) -> List[Dict]:
+    """Get filtered articles from DataStore with pagination"""
+    data_store = data_store or DataStore()
+    return data_store.get_filtered_news(
+        sources=sources,
+        keywords=keywords,
+        from_date=from_date,
+        to_date=to_date,
+        page=page,
+        page_size=page_size
+    )
+
+
+def get_article(article_id: int, data_store: Optional[DataStore] = None) -> Optional[Dict]:
+    """Get a single article by ID from DataStore"""
+    data_store = data_store or DataStore()
+    return data_store.get_news(article_id)
+
+
+def get_related_articles(article_id: int, limit: int = 5, data_store: Optional[DataStore] = None) -> List[Dict]:
+    """Get the precomputed related articles of an article"""
+    data_store = data_store or DataStore()
+    return data_store.get_related_articles(article_id, limit=limit)
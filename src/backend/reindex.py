@@ -0,0 +1,150 @@
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Set
+
+from loguru import logger
+
+from .data_store import DataStore
+from .vector_store import VectorStore, build_article_chunks, chunk_metadata
+
+
+class Reindexer:
+    """
+    Rebuilds the vector collection from the authoritative SQLite data.
+
+    Analyzed articles are streamed out of the DataStore, split and embedded
+    in parallel batches, and written into a fresh staging collection that
+    is only swapped in once it is complete. A failed run leaves the active
+    collection untouched. The replaced collection is kept until the next
+    run, so processes that opened it before the swap keep working.
+
+    Articles the pipeline analyzes while the rebuild streams are written to
+    the old collection; once the new one is active, those missing from it
+    are indexed into it as well. An ``analyze`` run still going after that
+    keeps writing to the old collection, so reindex while it is idle.
+    """
+
+    def __init__(
+        self,
+        db: DataStore,
+        vec_db: VectorStore,
+        text_splitter,
+        batch_size: int = 32,
+        workers: int = 4
+    ):
+        """
+        Args:
+            db: The data store to read analyzed articles from
+            vec_db: The vector store whose collection is rebuilt
+            text_splitter: Splitter producing the chunks, same as the pipeline's
+            batch_size: Number of articles embedded per task
+            workers: Number of parallel embedding workers
+        """
+        self.db = db
+        self.vec_db = vec_db
+        self.text_splitter = text_splitter
+        self.batch_size = batch_size
+        self.workers = workers
+
+    def _article_batches(self) -> Iterator[List[Dict]]:
+        batch = []
+        for article in self.db.iter_analyzed_news(batch_size=self.batch_size * self.workers):
+            batch.append(article)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _embed_batch(self, articles: List[Dict]):
+        chunks = []
+        for article in articles:
+            content = article["content"] + json.dumps(article["analysis_result"])
+            metadata = chunk_metadata(article["id"], article["published_at"], article["source"])
+            chunks.extend(build_article_chunks(self.text_splitter, content, metadata))
+
+        return [article["id"] for article in articles], self.vec_db.embed_documents(chunks) if chunks else None
+
+    def _write(self, collection, embedded) -> int:
+        if embedded is None:
+            return 0
+        ids, texts, metadatas, embeddings = embedded
+        self.vec_db.write_embedded(collection, ids, texts, metadatas, embeddings)
+        return len(ids)
+
+    def catch_up(self, indexed_ids: Set[int]) -> int:
+        """
+        Index the analyzed articles missing from the active collection, i.e.
+        those analyzed after the rebuild read past them.
+
+        Args:
+            indexed_ids: IDs of the articles the rebuild indexed
+
+        Returns:
+            Number of articles indexed
+        """
+        missed = [article_id for article_id in self.db.get_analyzed_news_ids() if article_id not in indexed_ids]
+        for start in range(0, len(missed), self.batch_size):
+            articles = self.db.get_news_batch(missed[start:start + self.batch_size])
+            _, embedded = self._embed_batch([articles[article_id] for article_id in sorted(articles)])
+            self._write(self.vec_db.collection, embedded)
+        if missed:
+            logger.info(f"Indexed {len(missed)} articles analyzed during the reindex")
+        return len(missed)
+
+    def run(self, drop_previous: bool = False, on_progress: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """
+        Rebuild the collection and swap it in.
+
+        Args:
+            drop_previous: Delete the previously active collection right after
+                the swap instead of keeping it until the next run
+            on_progress: Called with the running stats after every written batch
+
+        Returns:
+            Stats with article/chunk counts, articles caught up after the swap,
+            elapsed seconds and chunks per second
+        """
+        self.vec_db.drop_inactive_collections()
+        staging = self.vec_db.create_staging_collection()
+        logger.info(f"Reindexing into {staging.name} with {self.workers} workers")
+
+        stats = {
+            "collection": staging.name, "articles": 0, "chunks": 0, "caught_up": 0,
+            "seconds": 0.0, "chunks_per_second": 0.0,
+        }
+        started = time.perf_counter()
+        indexed_ids = set()
+
+        def write(result):
+            article_ids, embedded = result
+            stats["chunks"] += self._write(staging, embedded)
+            stats["articles"] += len(article_ids)
+            indexed_ids.update(article_ids)
+            stats["seconds"] = round(time.perf_counter() - started, 2)
+            stats["chunks_per_second"] = round(stats["chunks"] / stats["seconds"], 1) if stats["seconds"] else 0.0
+            if on_progress:
+                on_progress(stats)
+
+        try:
+            # Embedding runs in the pool, writes stay on this thread in order;
+            # the bounded queue keeps memory flat on large tables
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                pending = deque()
+                for batch in self._article_batches():
+                    pending.append(pool.submit(self._embed_batch, batch))
+                    if len(pending) >= self.workers * 2:
+                        write(pending.popleft().result())
+                while pending:
+                    write(pending.popleft().result())
+        except Exception as e:
+            logger.error(f"Reindex failed, keeping the active collection: {str(e)}")
+            self.vec_db.drop_collection(staging)
+            raise
+
+        self.vec_db.activate_collection(staging, drop_previous=drop_previous)
+        stats["caught_up"] = self.catch_up(indexed_ids)
+        logger.info(f"Reindexed {stats['articles']} articles into {stats['chunks']} chunks in {stats['seconds']}s")
+        return stats
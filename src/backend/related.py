@@ -0,0 +1,86 @@
+from typing import Dict, Iterable, List, Tuple
+
+from loguru import logger
+
+from .data_store import DataStore
+from .vector_store import VectorStore
+
+
+class RelatedArticlesJob:
+    """
+    Precomputes the related articles shown on the article detail page.
+
+    Runs after ingest for the newly indexed articles: every stored chunk of
+    an article is used as a query, hits from other articles are aggregated
+    per article by their best chunk similarity, and the top ``k`` are
+    written to the DataStore. Each new neighbor is also offered to the
+    neighbor's own list, so older articles pick up new coverage without
+    being recomputed. Reading related articles is then a single indexed
+    lookup instead of a vector query per page view.
+    """
+
+    def __init__(
+        self,
+        db: DataStore,
+        vec_db: VectorStore,
+        k: int = 5,
+        chunks_per_query: int = 20,
+        min_score: float = 0.0
+    ):
+        """
+        Args:
+            db: The data store holding the related-articles table
+            vec_db: The vector store holding the article chunks
+            k: Number of related articles kept per article
+            chunks_per_query: Number of nearest chunks fetched per chunk of the article
+            min_score: Minimum cosine similarity for an article to count as related
+        """
+        self.db = db
+        self.vec_db = vec_db
+        self.k = k
+        self.chunks_per_query = chunks_per_query
+        self.min_score = min_score
+
+    def neighbors(self, article_id: int) -> List[Tuple[int, float]]:
+        """Top-k (article ID, similarity) pairs aggregated from chunk-level similarity"""
+        embeddings = self.vec_db.article_embeddings(article_id)
+        results = self.vec_db.search_by_embeddings(
+            embeddings,
+            k=self.chunks_per_query,
+            where={"article_id": {"$ne": article_id}}
+        )
+
+        scores: Dict[int, float] = {}
+        for hits in results:
+            for hit in hits:
+                # Chunks indexed before article_id was introduced match the $ne filter
+                related_id = hit["metadata"].get("article_id")
+                if related_id is None:
+                    continue
+                similarity = 1 - hit["distance"]
+                if similarity >= self.min_score and similarity > scores.get(related_id, float("-inf")):
+                    scores[related_id] = similarity
+
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:self.k]
+
+    def run(self, article_ids: Iterable[int]) -> Dict[str, int]:
+        """
+        Compute and store related articles for the given articles.
+
+        Args:
+            article_ids: IDs of the newly indexed articles
+
+        Returns:
+            Stats with the number of articles processed and of older lists updated
+        """
+        stats = {"articles": 0, "updated": 0}
+        for article_id in article_ids:
+            neighbors = self.neighbors(article_id)
+            self.db.save_related_articles(article_id, neighbors)
+            for related_id, score in neighbors:
+                if self.db.add_related_article(related_id, article_id, score, self.k):
+                    stats["updated"] += 1
+            stats["articles"] += 1
+
+        logger.info(f"Related articles: {stats}")
+        return stats
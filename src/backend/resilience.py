@@ -0,0 +1,203 @@
+"""
+Failure handling for the analysis pipeline.
+
+Errors are classified by type: transient ones (timeouts, connection
+errors, rate limits, server errors) are retried with exponential backoff,
+malformed LLM output is retried a few times since sampling may fix it, and
+anything else fails at once. A circuit breaker around the LLM stops
+calling it after repeated transient failures, so an outage fails the
+remaining articles fast instead of retrying each one. Articles that still
+fail go to the dead-letter table (see ``NewsRAG.dead_letter``).
+"""
+import json
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional, TypeVar
+
+from langchain_core.exceptions import OutputParserException
+from langchain_core.runnables import RunnableLambda
+from loguru import logger
+
+from .exceptions import CircuitOpenError, RetriesExhausted
+
+
+TRANSIENT = "transient"
+PARSE = "parse"
+PERMANENT = "permanent"
+CIRCUIT_OPEN = "circuit_open"
+
+# Exception class names of the OpenAI-compatible and httpx clients, matched by
+# name so their packages need not be imported here
+TRANSIENT_ERROR_NAMES = {
+    "APITimeoutError", "APIConnectionError", "RateLimitError", "InternalServerError",
+    "TimeoutException", "ConnectError", "ReadError", "RemoteProtocolError",
+}
+TRANSIENT_STATUS_CODES = {408, 409, 429}
+
+T = TypeVar("T")
+
+
+def classify_error(error: BaseException) -> str:
+    """Error type deciding how a failure is retried"""
+    if isinstance(error, RetriesExhausted):
+        return error.error_type
+    if isinstance(error, CircuitOpenError):
+        return CIRCUIT_OPEN
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return TRANSIENT
+    if any(cls.__name__ in TRANSIENT_ERROR_NAMES for cls in type(error).__mro__):
+        return TRANSIENT
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    if isinstance(status, int) and (status in TRANSIENT_STATUS_CODES or status >= 500):
+        return TRANSIENT
+    if isinstance(error, (OutputParserException, json.JSONDecodeError)):
+        return PARSE
+    return PERMANENT
+
+
+def failed_stage(trace) -> Optional[str]:
+    """Top-level span of a trace that failed last, if any"""
+    for recorded in reversed(trace.spans if trace is not None else []):
+        if recorded["status"] == "error" and "." not in recorded["name"]:
+            return recorded["name"]
+    return None
+
+
+class RetryPolicy:
+    """Retries a call with exponential backoff and jitter, as often as its error type allows"""
+
+    DEFAULT_ATTEMPTS = {TRANSIENT: 4, PARSE: 2, PERMANENT: 1, CIRCUIT_OPEN: 1}
+
+    def __init__(
+        self,
+        max_attempts: Optional[Dict[str, int]] = None,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        jitter: float = 0.1,
+        sleep: Callable[[float], None] = time.sleep,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            max_attempts: Attempts per error type, overriding DEFAULT_ATTEMPTS
+            base_delay: Seconds before the first retry; doubled for every further one
+            max_delay: Upper bound of a single delay
+            jitter: Relative random spread of each delay
+            sleep: Function waiting between attempts
+            seed: Seed for the jitter, for reproducible runs
+        """
+        self.max_attempts = {**self.DEFAULT_ATTEMPTS, **(max_attempts or {})}
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.sleep = sleep
+        self._random = random.Random(seed)
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait after the given failed attempt (1-based)"""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay * (1 + self.jitter * (2 * self._random.random() - 1))
+
+    def call(self, fn: Callable[[], T]) -> T:
+        """
+        Call ``fn`` until it succeeds or its error type runs out of attempts.
+
+        Raises:
+            RetriesExhausted: With the last error as its cause
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return fn()
+            except Exception as e:
+                error_type = classify_error(e)
+                if attempt >= self.max_attempts.get(error_type, 1):
+                    raise RetriesExhausted(e, error_type, attempt) from e
+                delay = self.delay(attempt) if error_type == TRANSIENT else 0.0
+                logger.warning(f"Attempt {attempt} failed ({error_type}): {e}; retrying in {delay:.1f}s")
+                if delay:
+                    self.sleep(delay)
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a failing dependency for a while.
+
+    After ``failure_threshold`` consecutive transient failures the circuit
+    opens and calls fail with CircuitOpenError. Once ``reset_timeout`` has
+    passed, one trial call is let through (half-open): its success closes
+    the circuit, its failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str = "llm",
+        failure_threshold: int = 5,
+        reset_timeout: float = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            name: Name of the guarded dependency, for logs and errors
+            failure_threshold: Consecutive transient failures opening the circuit
+            reset_timeout: Seconds the circuit stays open before a trial call
+            clock: Monotonic time source
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """Let a call through or refuse it"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if self.clock() - self.opened_at < self.reset_timeout:
+                    raise CircuitOpenError(f"Circuit {self.name} is open after {self.failures} failures")
+                self.state = self.HALF_OPEN
+                logger.info(f"Circuit {self.name} half-open, trying one call")
+            elif self.state == self.HALF_OPEN:
+                raise CircuitOpenError(f"Circuit {self.name} is waiting for its trial call")
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"Circuit {self.name} closed")
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self, error: BaseException) -> None:
+        """Count a failed call; only transient errors say anything about the dependency"""
+        with self._lock:
+            if classify_error(error) != TRANSIENT:
+                if self.state == self.HALF_OPEN:
+                    self.state = self.CLOSED
+                return
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+                logger.error(f"Circuit {self.name} opened after {self.failures} failures: {error}")
+
+    def guard(self, runnable) -> RunnableLambda:
+        """Wrap a runnable, e.g. the LLM, so its calls go through the breaker"""
+        def run(value, config):
+            self.before_call()
+            try:
+                result = runnable.invoke(value, config)
+            except Exception as e:
+                self.record_failure(e)
+                raise
+            self.record_success()
+            return result
+        return RunnableLambda(run, name=f"circuit_{self.name}")
@@ -0,0 +1,265 @@
+import math
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.documents import Document
+from loguru import logger
+
+from .vector_store import VectorStore, build_where, content_hash, document_id, matches_where
+
+
+TOKEN_PATTERN = re.compile(r"[\w$&.-]+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase terms, keeping tickers like $AAPL and AT&T intact"""
+    return [token.strip(".-") for token in TOKEN_PATTERN.findall(text.lower()) if token.strip(".-")]
+
+
+class BM25Index:
+    """
+    In-memory BM25 index over the same chunks as the vector store.
+
+    Catches exact entity matches (people, companies, tickers) that dense
+    retrieval tends to miss.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        Args:
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self.doc_lengths: Dict[str, int] = {}
+        self.documents: Dict[str, Dict] = {}
+        self.article_chunks: Dict[object, set] = defaultdict(set)
+        self.total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def add(self, doc_id: str, content: str, metadata: Dict) -> None:
+        """Index a chunk, replacing any previous version with the same ID"""
+        with self._lock:
+            self._remove_locked(doc_id)
+
+            terms = Counter(tokenize(content))
+            for term, tf in terms.items():
+                self.postings[term][doc_id] = tf
+            length = sum(terms.values())
+            self.doc_lengths[doc_id] = length
+            self.total_length += length
+            self.documents[doc_id] = {"id": doc_id, "content": content, "metadata": metadata}
+            if "article_id" in metadata:
+                self.article_chunks[metadata["article_id"]].add(doc_id)
+
+    def remove(self, doc_id: str) -> None:
+        """Remove a chunk from the index"""
+        with self._lock:
+            self._remove_locked(doc_id)
+
+    def _remove_locked(self, doc_id: str) -> None:
+        document = self.documents.pop(doc_id, None)
+        if document is None:
+            return
+
+        for term in set(tokenize(document["content"])):
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self.postings[term]
+        self.total_length -= self.doc_lengths.pop(doc_id)
+        article_id = document["metadata"].get("article_id")
+        if article_id is not None:
+            self.article_chunks[article_id].discard(doc_id)
+
+    def chunk_ids(self, article_id) -> List[str]:
+        """Return the IDs of all indexed chunks of an article"""
+        return list(self.article_chunks.get(article_id, ()))
+
+    def search(self, query: str, k: int = 5, where: Optional[Dict] = None) -> List[Tuple[str, float]]:
+        """
+        Score chunks against the query terms.
+
+        Args:
+            query: Text to search for
+            k: Number of results to return
+            where: Chroma-style metadata filter
+
+        Returns:
+            List of (doc_id, score) tuples, best first
+        """
+        with self._lock:
+            if not self.doc_lengths:
+                return []
+
+            doc_count = len(self.doc_lengths)
+            avg_length = self.total_length / doc_count
+            scores: Dict[str, float] = defaultdict(float)
+
+            for term in set(tokenize(query)):
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = tf + self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / avg_length)
+                    scores[doc_id] += idf * tf * (self.k1 + 1) / norm
+
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            if where:
+                ranked = [item for item in ranked if matches_where(self.documents[item[0]]["metadata"], where)]
+            return ranked[:k]
+
+    def get(self, doc_id: str) -> Optional[Dict]:
+        return self.documents.get(doc_id)
+
+
+class HybridRetriever:
+    """
+    Combines dense vector search with BM25 using reciprocal-rank fusion.
+
+    Exposes the same ``similarity_search``/``upsert_documents`` interface as
+    VectorStore, so NewsRAG can use either. Indexing goes through both
+    legs to keep them in sync.
+    """
+
+    def __init__(
+        self,
+        vec_db: VectorStore,
+        lexical_index: Optional[BM25Index] = None,
+        vector_weight: float = 1.0,
+        lexical_weight: float = 1.0,
+        rrf_k: int = 60,
+        candidates: int = 20
+    ):
+        """
+        Args:
+            vec_db: The vector store for the dense leg
+            lexical_index: The BM25 index for the lexical leg, empty when omitted
+            vector_weight: Weight of the dense ranking in the fused score
+            lexical_weight: Weight of the lexical ranking in the fused score
+            rrf_k: Reciprocal-rank fusion constant, higher flattens rank differences
+            candidates: Number of candidates fetched from each leg before fusion
+        """
+        self.vec_db = vec_db
+        self.lexical_index = lexical_index if lexical_index is not None else BM25Index()
+        self.vector_weight = vector_weight
+        self.lexical_weight = lexical_weight
+        self.rrf_k = rrf_k
+        self.candidates = candidates
+        self.metrics = {leg: {"calls": 0, "total_ms": 0.0, "last_ms": 0.0} for leg in ("vector", "lexical", "fusion")}
+
+    def build_lexical_index(self) -> int:
+        """Load every chunk of the vector store into the lexical index"""
+        start = time.perf_counter()
+        count = 0
+        for doc in self.vec_db.iter_documents():
+            self.lexical_index.add(doc["id"], doc["content"], doc["metadata"])
+            count += 1
+        logger.info(f"Built lexical index over {count} chunks in {time.perf_counter() - start:.2f}s")
+        return count
+
+    def upsert_documents(self, documents: List[Document]) -> int:
+        """Write chunks to the vector store and the lexical index"""
+        embedded = self.vec_db.upsert_documents(documents)
+
+        new_ids = set()
+        for doc in documents:
+            doc_id = document_id(doc)
+            new_ids.add(doc_id)
+            metadata = dict(doc.metadata, content_hash=content_hash(doc.page_content))
+            self.lexical_index.add(doc_id, doc.page_content, metadata)
+
+        # Mirror the vector store's stale chunk cleanup
+        article_ids = {doc.metadata["article_id"] for doc in documents if "article_id" in doc.metadata}
+        for article_id in article_ids:
+            for doc_id in self.lexical_index.chunk_ids(article_id):
+                if doc_id not in new_ids:
+                    self.lexical_index.remove(doc_id)
+
+        return embedded
+
+    def _record(self, leg: str, started: float) -> None:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        metric = self.metrics[leg]
+        metric["calls"] += 1
+        metric["total_ms"] += elapsed_ms
+        metric["last_ms"] = elapsed_ms
+
+    def latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """Return call counts and average/last latency per retrieval leg"""
+        return {
+            leg: {
+                "calls": metric["calls"],
+                "avg_ms": round(metric["total_ms"] / metric["calls"], 3) if metric["calls"] else 0.0,
+                "last_ms": round(metric["last_ms"], 3),
+            } for leg, metric in self.metrics.items()
+        }
+
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 5,
+        published_after: Optional[datetime] = None,
+        published_before: Optional[datetime] = None,
+        sources: Optional[List[str]] = None,
+        exclude_article_id=None,
+        where: Optional[Dict] = None,
+        decay_half_life_days: Optional[float] = None
+    ) -> List[Dict]:
+        """
+        Search both legs with the same filters and fuse their rankings.
+
+        Returns:
+            Result dicts like VectorStore.similarity_search, with an added
+            rrf_score; lexical-only hits have a distance of None
+        """
+        started = time.perf_counter()
+        dense = self.vec_db.similarity_search(
+            query,
+            k=self.candidates,
+            published_after=published_after,
+            published_before=published_before,
+            sources=sources,
+            exclude_article_id=exclude_article_id,
+            where=where,
+            decay_half_life_days=decay_half_life_days
+        )
+        self._record("vector", started)
+
+        started = time.perf_counter()
+        lexical = self.lexical_index.search(
+            query,
+            k=self.candidates,
+            where=build_where(published_after, published_before, sources, exclude_article_id, where)
+        )
+        self._record("lexical", started)
+
+        started = time.perf_counter()
+        fused: Dict[str, Dict] = {}
+        for rank, doc in enumerate(dense, start=1):
+            fused[doc["id"]] = dict(doc, rrf_score=self.vector_weight / (self.rrf_k + rank))
+        for rank, (doc_id, _) in enumerate(lexical, start=1):
+            score = self.lexical_weight / (self.rrf_k + rank)
+            if doc_id in fused:
+                fused[doc_id]["rrf_score"] += score
+            else:
+                fused[doc_id] = dict(self.lexical_index.get(doc_id), distance=None, rrf_score=score)
+
+        results = sorted(fused.values(), key=lambda doc: doc["rrf_score"], reverse=True)[:k]
+        self._record("fusion", started)
+
+        logger.debug(
+            f"Hybrid search: {len(dense)} dense + {len(lexical)} lexical candidates -> {len(results)} results"
+        )
+        return results
@@ -1,67 +1,239 @@
-from typing import List, Dict, Optional
+from contextlib import nullcontext
+from datetime import date
+from pathlib import Path
+from typing import Callable, List, Dict, Optional
+from langchain_core.globals import set_debug
 from loguru import logger
 
-from backend.vector_store import VectorStore
-
-from backend.chain import NewsRAG
+from config.settings import settings
+from backend.chain import NewsRAG, create_text_splitter
 from backend.data_store import DataStore
 from backend.vector_store import VectorStore
+from backend.retrieval import HybridRetriever
+from backend.reindex import Reindexer
+from backend.dedup import StoryClusterer
+from backend.related import RelatedArticlesJob
+from backend.chat import NewsChat
+from backend.tracing import Tracer
+from backend.usage import UsageLedger
+from backend.batching import BatchAnalyzer
+from backend.profiling import profile_run
+from backend.digest import DigestBuilder
 from backend.news_api import NewsAPI
-from backend.llm import LLM
+from backend.embeddings import EmbeddingCache, CachedEmbeddingFunction, LocalEmbeddingFunction
+from backend.llm import ANALYSIS_LLM, LLM, TRIAGE_LLM
+from backend.triage import HeuristicTriage, LLMTriage, TriageRouter
+from backend.resilience import PARSE, TRANSIENT, CircuitBreaker, RetryPolicy
+# Read-only queries live in backend.queries so the web tier can skip this module
+from backend.queries import get_sources, get_articles, get_article, get_related_articles
 
 
-def start_news_chain():
-    """Analyze fetched news articles"""
+def create_embedding_function(in_memory: bool = False):
+    """Build the embedding function shared by indexing and retrieval, optionally with a throwaway cache"""
+    engine = LocalEmbeddingFunction(
+        model_path=settings.EMBEDDING_MODEL_PATH,
+        batch_size=settings.EMBEDDING_BATCH_SIZE,
+        num_threads=settings.EMBEDDING_THREADS,
+        precision=settings.EMBEDDING_PRECISION
+    )
+    cache = EmbeddingCache(
+        cache_dir=EmbeddingCache.MEMORY if in_memory else settings.EMBEDDING_CACHE_DIR,
+        max_entries=settings.EMBEDDING_CACHE_SIZE,
+        # Quantized vectors are exactly representable in half precision
+        dtype="float32" if settings.EMBEDDING_PRECISION == "float32" else "float16"
+    )
+    return CachedEmbeddingFunction(engine, cache)
 
-    data_store = DataStore()
-    vector_store = VectorStore()
-    news_api = NewsAPI()
-        
-    try:
-        # Initialize NewsRAG
-        news_rag = NewsRAG(
-            llm=LLM,
+
+def create_data_store(in_memory: bool = False) -> DataStore:
+    """Build the data store, optionally as a throwaway in-memory database"""
+    return DataStore(db_path=DataStore.MEMORY) if in_memory else DataStore()
+
+
+def create_vector_store(in_memory: bool = False) -> VectorStore:
+    """Build the vector store with the configured backend, embedding, HNSW and partition settings"""
+    return VectorStore(
+        persist_directory=VectorStore.MEMORY if in_memory else None,
+        backend=settings.VECTOR_BACKEND,
+        vector_dtype=settings.VECTOR_DTYPE,
+        embedding_function=create_embedding_function(in_memory),
+        hnsw_m=settings.HNSW_M,
+        hnsw_ef_construction=settings.HNSW_EF_CONSTRUCTION,
+        hnsw_ef_search=settings.HNSW_EF_SEARCH,
+        query_cache_size=settings.QUERY_CACHE_SIZE,
+        partition_period=settings.VECTOR_PARTITION_PERIOD,
+        retention_days=settings.VECTOR_RETENTION_DAYS,
+        query_workers=settings.VECTOR_QUERY_WORKERS
+    )
+
+
+def create_news_chat() -> NewsChat:
+    """Build the streaming news chat over the configured stores and retriever"""
+    data_store = create_data_store()
+    vector_store = create_vector_store()
+
+    retriever = vector_store
+    if settings.HYBRID_RETRIEVAL:
+        retriever = HybridRetriever(
+            vector_store,
+            vector_weight=settings.HYBRID_VECTOR_WEIGHT,
+            lexical_weight=settings.HYBRID_LEXICAL_WEIGHT
+        )
+        retriever.build_lexical_index()
+
+    return NewsChat(
+        llm=LLM,
+        db=data_store,
+        retriever=retriever,
+        k=settings.CHAT_CONTEXT_K,
+        history_tokens=settings.CHAT_HISTORY_TOKENS,
+        context_tokens=settings.CHAT_CONTEXT_TOKENS
+    )
+
+
+def create_news_rag(data_store: DataStore, vector_store: VectorStore, usage_ledger: UsageLedger) -> NewsRAG:
+    """Build the analysis pipeline with the configured retrieval, dedup, triage, batching and failure handling"""
+    retriever = None
+    if settings.HYBRID_RETRIEVAL:
+        retriever = HybridRetriever(
+            vector_store,
+            vector_weight=settings.HYBRID_VECTOR_WEIGHT,
+            lexical_weight=settings.HYBRID_LEXICAL_WEIGHT
+        )
+        retriever.build_lexical_index()
+
+    triage = None
+    if settings.TRIAGE_MODE != "off":
+        classifier = LLMTriage(TRIAGE_LLM) if settings.TRIAGE_MODE == "llm" else HeuristicTriage()
+        triage = TriageRouter(classifier, threshold=settings.TRIAGE_THRESHOLD, llm=TRIAGE_LLM)
+
+    circuit_breaker = CircuitBreaker(
+        name="llm",
+        failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout=settings.CIRCUIT_RESET_SECONDS
+    )
+
+    return NewsRAG(
+        llm=ANALYSIS_LLM,
+        db=data_store,
+        vec_db=vector_store,
+        news_api=NewsAPI(),
+        retriever=retriever,
+        story_clusterer=StoryClusterer(threshold=settings.DEDUP_THRESHOLD) if settings.DEDUP_ENABLED else None,
+        related_articles=RelatedArticlesJob(
             db=data_store,
             vec_db=vector_store,
-            news_api=news_api
-        )
-        
-        news_rag.start()  
+            k=settings.RELATED_ARTICLES_K,
+            min_score=settings.RELATED_ARTICLES_MIN_SCORE
+        ) if settings.RELATED_ARTICLES_ENABLED else None,
+        tracer=Tracer(sample_rate=settings.TRACE_SAMPLE_RATE, slow_ms=settings.TRACE_SLOW_MS),
+        usage_ledger=usage_ledger,
+        budget_mode=settings.LLM_BUDGET_MODE,
+        batch_analyzer=BatchAnalyzer(
+            circuit_breaker.guard(ANALYSIS_LLM),
+            max_batch_size=settings.ANALYSIS_BATCH_SIZE,
+            token_budget=settings.ANALYSIS_BATCH_TOKENS
+        ) if settings.ANALYSIS_BATCH_SIZE > 1 else None,
+        triage=triage,
+        retry_policy=RetryPolicy(
+            max_attempts={TRANSIENT: settings.RETRY_TRANSIENT_ATTEMPTS, PARSE: settings.RETRY_PARSE_ATTEMPTS},
+            base_delay=settings.RETRY_BASE_DELAY,
+            max_delay=settings.RETRY_MAX_DELAY
+        ),
+        circuit_breaker=circuit_breaker
+    )
+
+
+def start_news_chain(in_memory: Optional[bool] = None, profile: Optional[str] = None):
+    """
+    Analyze fetched news articles.
+
+    Args:
+        in_memory: Run against throwaway in-memory stores, e.g. for dry runs;
+            defaults to the IN_MEMORY_STORAGE setting
+        profile: "cpu" or "mem" to profile the run, with reports written to
+            OUTPUT_DIR; None runs unprofiled
+    """
+    if in_memory is None:
+        in_memory = settings.IN_MEMORY_STORAGE
+    # Global LangChain debug output is opt-in; sampled traces log LLM calls instead
+    set_debug(settings.LANGCHAIN_DEBUG.lower() in ("1", "true"))
+
+    data_store = create_data_store(in_memory)
+    vector_store = create_vector_store(in_memory)
+    vector_store.drop_expired_partitions()
+    usage_ledger = UsageLedger(data_store, token_budget=settings.LLM_TOKEN_BUDGET)
+
+    try:
+        news_rag = create_news_rag(data_store, vector_store, usage_ledger)
+
+        with profile_run(profile, settings.OUTPUT_DIR) if profile else nullcontext():
+            news_rag.start()
         
         logger.info("Successfully analyzed news articles")
+        logger.info(f"Query cache: {vector_store.query_cache.stats()}")
+        logger.info(f"LLM usage: {usage_ledger.stats()}")
+        if settings.HYBRID_RETRIEVAL:
+            logger.info(f"Retrieval latency: {news_rag.retriever.latency_stats()}")
     except Exception as e:
         logger.error(f"Failed to analyze news: {str(e)}")
         raise
+    finally:
+        vector_store.close()
+        data_store.close()
+
+
+def retry_failed_articles(limit: Optional[int] = None) -> Dict[str, int]:
+    """Retry the analysis of dead-lettered articles; returns retried, recovered and failed counts"""
+    data_store = create_data_store()
+    vector_store = create_vector_store()
+    usage_ledger = UsageLedger(data_store, token_budget=settings.LLM_TOKEN_BUDGET)
+    try:
+        news_rag = create_news_rag(data_store, vector_store, usage_ledger)
+        stats = news_rag.retry_failed(limit=limit)
+        logger.info(f"LLM usage: {usage_ledger.stats()}")
+        return stats
+    finally:
+        vector_store.close()
+        data_store.close()
 
-def get_sources() -> List[Dict]:
-    """Get list of available news sources"""
-    # TODO: Implement proper source loading from DataStore
-    return [
-        {"id": "bbc-news", "name": "BBC News"},
-        {"id": "cnn", "name": "CNN"},
-        {"id": "reuters", "name": "Reuters"}
-    ]
-
-def get_articles(
-    sources: list[str] = None,
-    keywords: str = None,
-    from_date: str = None,
-    to_date: str = None,
-    page: int = 1,
-    page_size: int = 10
-) -> list[dict]:
-    """Get filtered articles from DataStore with pagination"""
-    data_store = DataStore()
-    return data_store.get_filtered_news(
-        sources=sources,
-        keywords=keywords,
-        from_date=from_date,
-        to_date=to_date,
-        page=page,
-        page_size=page_size
+
+def build_daily_digest(day: date) -> Dict[str, Path]:
+    """
+    Build the digest of a day's analyses and write it to OUTPUT_DIR.
+
+    Returns:
+        Paths of the written Markdown and JSON files
+    """
+    data_store = create_data_store()
+    usage_ledger = UsageLedger(data_store)
+    builder = DigestBuilder(
+        llm=LLM,
+        db=data_store,
+        chunk_size=settings.DIGEST_CHUNK_SIZE,
+        reduce_fanout=settings.DIGEST_REDUCE_FANOUT,
+        callbacks=[usage_ledger]
     )
+    try:
+        digest = builder.build(day)
+        logger.info(f"LLM usage: {usage_ledger.stats()}")
+        return builder.write(digest, settings.OUTPUT_DIR)
+    finally:
+        data_store.close()
 
-def get_article(article_id: int) -> Optional[dict]:
-    """Get a single article by ID from DataStore"""
-    data_store = DataStore()
-    return data_store.get_news(article_id)
\ No newline at end of file
+
+def reindex_vector_store(
+    workers: int = None,
+    batch_size: int = None,
+    drop_previous: bool = False,
+    on_progress: Optional[Callable[[Dict], None]] = None
+) -> Dict:
+    """Rebuild the vector collection from the analyzed articles in DataStore"""
+    reindexer = Reindexer(
+        db=DataStore(),
+        vec_db=create_vector_store(),
+        text_splitter=create_text_splitter(),
+        batch_size=batch_size or settings.REINDEX_BATCH_SIZE,
+        workers=workers or settings.REINDEX_WORKERS
+    )
+    return reindexer.run(drop_previous=drop_previous, on_progress=on_progress)
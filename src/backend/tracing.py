@@ -0,0 +1,188 @@
+"""
+Per-article tracing for the analysis pipeline.
+
+Each article gets a trace with its own ID, carried in a context variable
+and bound to every log record emitted while it is processed. Pipeline
+stages run inside spans whose durations are collected on the trace and
+logged as one structured line when the article is done, so a slow article
+can be followed end to end without verbose logging.
+
+Sampling is decided once, when the trace starts (head-based): only sampled
+traces emit DEBUG records and LLM callback output, which the log sinks
+drop for unsampled traces (see ``config.logger``). Traces slower than
+``slow_ms`` are always logged at WARNING with their spans.
+"""
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from loguru import logger
+
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+# Observers of span boundaries, e.g. profilers attributing samples to stages
+_span_listeners: List[Any] = []
+
+
+class Trace:
+    """Spans and attributes of one traced unit of work, usually one article"""
+
+    def __init__(self, trace_id: str, sampled: bool, attributes: Optional[Dict[str, Any]] = None):
+        self.trace_id = trace_id
+        self.sampled = sampled
+        self.attributes = dict(attributes or {})
+        self.spans: List[Dict[str, Any]] = []
+        self.open_spans: List[str] = []
+        self.started = time.perf_counter()
+        self.status = "ok"
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "sampled": self.sampled,
+            "status": self.status,
+            "duration_ms": round(self.elapsed_ms, 1),
+            "attributes": self.attributes,
+            "spans": self.spans,
+        }
+
+
+def add_span_listener(listener) -> None:
+    """
+    Notify ``listener.span_started(name, depth)`` and
+    ``listener.span_finished(name, depth)`` around every span.
+    """
+    _span_listeners.append(listener)
+
+
+def remove_span_listener(listener) -> None:
+    _span_listeners.remove(listener)
+
+
+def current_trace() -> Optional[Trace]:
+    """The trace of the current context, if any"""
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[None]:
+    """
+    Time a stage of the current trace; a no-op outside of a trace.
+
+    Nested spans are recorded with their parent's name as a prefix.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+
+    full_name = f"{trace.open_spans[-1]}.{name}" if trace.open_spans else name
+    depth = len(trace.open_spans)
+    trace.open_spans.append(full_name)
+    for listener in _span_listeners:
+        listener.span_started(full_name, depth)
+    started = time.perf_counter()
+    status = "ok"
+    if trace.sampled:
+        logger.debug(f"Span {full_name} started")
+    try:
+        yield
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        duration_ms = round((time.perf_counter() - started) * 1000, 1)
+        trace.open_spans.pop()
+        for listener in _span_listeners:
+            listener.span_finished(full_name, depth)
+        trace.spans.append({"name": full_name, "duration_ms": duration_ms, "status": status, **attributes})
+        if trace.sampled:
+            logger.debug(f"Span {full_name} finished in {duration_ms}ms ({status})")
+
+
+class Tracer:
+    """Starts traces with head-based sampling and logs their summaries"""
+
+    def __init__(self, sample_rate: float = 0.1, slow_ms: Optional[float] = None, seed: Optional[int] = None):
+        """
+        Args:
+            sample_rate: Share of traces that emit DEBUG output, from 0 to 1
+            slow_ms: Traces taking longer are logged at WARNING; None disables it
+            seed: Seed for the sampling decisions, for reproducible runs
+        """
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self._random = random.Random(seed)
+
+    def should_sample(self) -> bool:
+        return self.sample_rate > 0 and self._random.random() < self.sample_rate
+
+    @contextmanager
+    def trace(self, **attributes) -> Iterator[Trace]:
+        """
+        Run the block as a new trace; log records inside carry its trace_id.
+
+        Attributes can be added to the yielded trace while it runs, e.g. the
+        article ID once it is known.
+        """
+        trace = Trace(uuid.uuid4().hex[:16], self.should_sample(), attributes)
+        token = _current_trace.set(trace)
+        try:
+            with logger.contextualize(trace_id=trace.trace_id, sampled=trace.sampled):
+                yield trace
+        except BaseException:
+            trace.status = "error"
+            raise
+        finally:
+            _current_trace.reset(token)
+            self._log_summary(trace)
+
+    def _log_summary(self, trace: Trace) -> None:
+        summary = trace.summary()
+        stages = ", ".join(f"{s['name']}={s['duration_ms']}ms" for s in trace.spans)
+        level = "WARNING" if self.slow_ms is not None and summary["duration_ms"] > self.slow_ms else "INFO"
+        logger.bind(trace_id=trace.trace_id, sampled=trace.sampled, trace=summary).log(
+            level,
+            f"Trace {trace.trace_id} {trace.attributes} {trace.status} in {summary['duration_ms']}ms: {stages}"
+        )
+
+
+class TraceCallbackHandler(BaseCallbackHandler):
+    """
+    Logs LLM calls of sampled traces at DEBUG level.
+
+    Replaces the global ``langchain.debug`` switch, which printed every
+    chain step of every article.
+    """
+
+    def on_llm_start(self, serialized, prompts, **kwargs) -> None:
+        logger.debug(f"LLM call started, prompt chars: {sum(len(prompt) for prompt in prompts)}")
+
+    def on_chat_model_start(self, serialized, messages, **kwargs) -> None:
+        chars = sum(len(str(message.content)) for batch in messages for message in batch)
+        logger.debug(f"Chat model call started, prompt chars: {chars}")
+
+    def on_llm_end(self, response, **kwargs) -> None:
+        logger.debug(f"LLM call finished, usage: {(response.llm_output or {}).get('token_usage')}")
+
+    def on_llm_error(self, error, **kwargs) -> None:
+        logger.debug(f"LLM call failed: {error}")
+
+
+def trace_config() -> Dict[str, Any]:
+    """Runnable config tagging LangChain runs with the current trace; sampled traces get LLM debug callbacks"""
+    trace = _current_trace.get()
+    if trace is None:
+        return {}
+    config = {"metadata": {"trace_id": trace.trace_id}}
+    if trace.sampled:
+        config["callbacks"] = [TraceCallbackHandler()]
+    return config
@@ -0,0 +1,154 @@
+import re
+from typing import Dict, Optional, Tuple
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.output_parsers import JsonOutputParser, StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from loguru import logger
+
+
+FULL = "full"
+LIGHT = "light"
+
+# Terms of stories with wide political, economic or social impact
+HIGH_IMPACT_TERMS = {
+    "war", "invasion", "ceasefire", "troops", "missile", "military", "attack", "killed", "sanctions",
+    "election", "president", "prime minister", "parliament", "government", "minister", "treaty",
+    "summit", "nato", "united nations", "tariff", "tariffs", "trade", "economy", "inflation",
+    "interest rates", "central bank", "recession", "gdp", "unemployment", "oil", "markets",
+    "earthquake", "hurricane", "flood", "wildfire", "pandemic", "outbreak", "climate",
+    "refugees", "protest", "coup", "nuclear", "supreme court", "law", "ban", "crisis",
+}
+
+# Terms of stories that rarely need an impact analysis
+LOW_IMPACT_TERMS = {
+    "football", "premier league", "match", "goal", "cup", "tennis", "golf", "cricket", "nba",
+    "score", "transfer", "celebrity", "actor", "actress", "singer", "album", "film", "movie",
+    "tv", "festival", "fashion", "recipe", "quiz", "horoscope", "lottery", "royal wedding",
+    "review", "podcast", "watch", "pictures", "in pictures", "video",
+}
+
+
+def triage_text(article: Dict) -> str:
+    """Title and description, the fields triage looks at"""
+    return " ".join(filter(None, [article.get("title"), article.get("description")]))
+
+
+def term_hits(text: str, terms) -> int:
+    """Number of distinct terms occurring as whole words"""
+    text = text.lower()
+    return sum(1 for term in terms if re.search(rf"\b{re.escape(term)}\b", text))
+
+
+class HeuristicTriage:
+    """
+    Scores article importance from title and description with keyword lists.
+
+    Runs locally without any model call: each high-impact term raises the
+    score from a neutral 0.5, each low-impact term lowers it.
+    """
+
+    name = "heuristic"
+
+    def __init__(self, high_weight: float = 0.15, low_weight: float = 0.25):
+        """
+        Args:
+            high_weight: Score added per high-impact term
+            low_weight: Score removed per low-impact term
+        """
+        self.high_weight = high_weight
+        self.low_weight = low_weight
+
+    def score(self, article: Dict, config: Optional[Dict] = None) -> Tuple[float, str]:
+        """Importance in [0, 1] and a short reason"""
+        text = triage_text(article)
+        high = term_hits(text, HIGH_IMPACT_TERMS)
+        low = term_hits(text, LOW_IMPACT_TERMS)
+        score = min(1.0, max(0.0, 0.5 + high * self.high_weight - low * self.low_weight))
+        return score, f"{high} high-impact, {low} low-impact terms"
+
+
+class LLMTriage:
+    """
+    Scores article importance from title and description with a small model.
+
+    A failed or unparseable call scores 1.0, so the article falls back to the
+    full analysis rather than being skipped.
+    """
+
+    name = "llm"
+
+    def __init__(self, llm: BaseChatModel):
+        """
+        Args:
+            llm: A small, fast language model
+        """
+        self.llm = llm
+        self.prompt = ChatPromptTemplate.from_template("""
+            你是一个新闻编辑。请根据标题和摘要判断这篇新闻的重要性：
+            对国家、地区、经济、政治或社会有广泛影响的新闻得分高，体育比分、娱乐八卦等得分低。
+
+            请以JSON格式输出，包含以下字段：
+            - score: 0 到 10 的整数
+            - reason: 一句话理由
+
+            News: {text}
+        """)
+        self.chain = self.prompt | self.llm | JsonOutputParser()
+
+    def score(self, article: Dict, config: Optional[Dict] = None) -> Tuple[float, str]:
+        """Importance in [0, 1] and the model's reason"""
+        try:
+            output = self.chain.invoke({"text": triage_text(article)}, config=config)
+            return min(1.0, max(0.0, float(output["score"]) / 10)), str(output.get("reason") or "")
+        except Exception as e:
+            logger.warning(f"Triage of article {article.get('id')} failed, defaulting to full analysis: {e}")
+            return 1.0, f"triage failed: {e}"
+
+
+class TriageRouter:
+    """
+    Routes articles to the full analysis or to a title-only translation.
+
+    Articles scoring at or above the threshold get the full translate and
+    analyze chain; the others only get their title translated, using the
+    given (ideally small) model.
+    """
+
+    def __init__(self, classifier, threshold: float = 0.4, llm: Optional[BaseChatModel] = None):
+        """
+        Args:
+            classifier: HeuristicTriage, LLMTriage or any object with ``name`` and ``score``
+            threshold: Minimum score for the full analysis
+            llm: Model translating the titles of light articles; without one
+                they keep their original title
+        """
+        self.classifier = classifier
+        self.threshold = threshold
+        self.llm = llm
+        self.title_chain = None
+        if llm is not None:
+            self.title_prompt = ChatPromptTemplate.from_template(
+                "请将以下英文新闻标题翻译为中文，只输出译文：\n{title}"
+            )
+            self.title_chain = self.title_prompt | llm | StrOutputParser()
+
+    def route(self, article: Dict, config: Optional[Dict] = None) -> Dict:
+        """Routing decision: score, route ("full" or "light"), reason and classifier"""
+        score, reason = self.classifier.score(article, config=config)
+        return {
+            "score": score,
+            "route": FULL if score >= self.threshold else LIGHT,
+            "reason": reason,
+            "classifier": self.classifier.name,
+        }
+
+    def translate_title(self, article: Dict, config: Optional[Dict] = None) -> Optional[str]:
+        """Chinese title of a light article, or None if it could not be translated"""
+        if self.title_chain is None or not article.get("title"):
+            return None
+        try:
+            return self.title_chain.invoke({"title": article["title"]}, config=config).strip() or None
+        except Exception as e:
+            logger.warning(f"Title translation of article {article.get('id')} failed: {e}")
+            return None
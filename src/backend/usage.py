@@ -0,0 +1,153 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from loguru import logger
+
+from .data_store import DataStore
+
+
+def extract_usage(response: LLMResult) -> Dict[str, Any]:
+    """
+    Token counts of an LLM call from the provider response.
+
+    Prefers the standardized ``usage_metadata`` of chat messages and falls
+    back to the raw ``token_usage`` of ``llm_output``. DeepSeek reports
+    prompt cache hits as ``prompt_cache_hit_tokens``, OpenAI-compatible
+    APIs as ``prompt_tokens_details.cached_tokens``.
+    """
+    llm_output = response.llm_output or {}
+    token_usage = llm_output.get("token_usage") or {}
+    usage = {
+        "model": llm_output.get("model_name"),
+        "prompt_tokens": token_usage.get("prompt_tokens") or 0,
+        "completion_tokens": token_usage.get("completion_tokens") or 0,
+        "cached_tokens": token_usage.get("prompt_cache_hit_tokens")
+        or (token_usage.get("prompt_tokens_details") or {}).get("cached_tokens")
+        or 0,
+    }
+
+    metadata = [
+        generation.message.usage_metadata
+        for generations in response.generations for generation in generations
+        if getattr(getattr(generation, "message", None), "usage_metadata", None)
+    ]
+    if metadata:
+        usage["prompt_tokens"] = sum(item["input_tokens"] for item in metadata)
+        usage["completion_tokens"] = sum(item["output_tokens"] for item in metadata)
+        cache_read = sum((item.get("input_token_details") or {}).get("cache_read") or 0 for item in metadata)
+        usage["cached_tokens"] = usage["cached_tokens"] or cache_read
+
+    return usage
+
+
+def estimate_cost(
+    usage: Dict[str, Any],
+    input_price: Optional[float],
+    output_price: Optional[float],
+    cached_input_price: Optional[float] = None
+) -> Optional[float]:
+    """
+    Cost of a usage row or rollup from per-million-token prices.
+
+    Cached prompt tokens are charged at ``cached_input_price`` when given,
+    otherwise at the regular input price. Returns None without prices.
+    """
+    if input_price is None or output_price is None:
+        return None
+    cached = usage.get("cached_tokens") or 0
+    cached_price = cached_input_price if cached_input_price is not None else input_price
+    return (
+        (usage["prompt_tokens"] - cached) * input_price
+        + cached * cached_price
+        + usage["completion_tokens"] * output_price
+    ) / 1_000_000
+
+
+class UsageLedger(BaseCallbackHandler):
+    """
+    Records the token usage of every LLM call in the DataStore ledger.
+
+    Attach it through the runnable config callbacks; the article ID is read
+    from the config metadata (``{"metadata": {"article_id": ...}}``). A call
+    covering several articles (``{"metadata": {"article_ids": [...]}}``) is
+    recorded as one row per article with the tokens split evenly. The
+    ledger also keeps the totals of the current run, checked against an
+    optional token budget.
+    """
+
+    def __init__(self, db: DataStore, token_budget: Optional[int] = None):
+        """
+        Args:
+            db: The data store holding the ledger
+            token_budget: Maximum prompt plus completion tokens for this run; None for no limit
+        """
+        self.db = db
+        self.token_budget = token_budget
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._started: Dict[UUID, tuple] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def budget_exceeded(self) -> bool:
+        """Whether this run has used up its token budget"""
+        return self.token_budget is not None and self.total_tokens >= self.token_budget
+
+    def _start(self, run_id: UUID, metadata: Optional[Dict]) -> None:
+        metadata = metadata or {}
+        article_ids = metadata.get("article_ids") or [metadata.get("article_id")]
+        self._started[run_id] = (time.perf_counter(), article_ids)
+
+    @staticmethod
+    def _split(usage: Dict[str, Any], article_ids: List) -> List[Dict[str, Any]]:
+        """One row per article, token counts split evenly with the remainder on the first"""
+        rows = [dict(usage, article_id=article_id) for article_id in article_ids]
+        for field in ("prompt_tokens", "completion_tokens", "cached_tokens"):
+            share, remainder = divmod(usage[field], len(rows))
+            for row in rows:
+                row[field] = share
+            rows[0][field] += remainder
+        return rows
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, metadata: Optional[Dict] = None, **kwargs) -> None:
+        self._start(run_id, metadata)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, metadata: Optional[Dict] = None, **kwargs) -> None:
+        self._start(run_id, metadata)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs) -> None:
+        started, article_ids = self._started.pop(run_id, (None, [None]))
+        usage = extract_usage(response)
+        usage["latency_ms"] = round((time.perf_counter() - started) * 1000, 1) if started is not None else None
+
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += usage["prompt_tokens"]
+            self.completion_tokens += usage["completion_tokens"]
+
+        try:
+            for row in self._split(usage, article_ids):
+                self.db.record_llm_usage(row)
+        except Exception as e:
+            # Losing a ledger row must not fail the analysis
+            logger.error(f"Failed to record LLM usage: {e}")
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs) -> None:
+        self._started.pop(run_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Totals of this run"""
+        return {
+            "calls": self.calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "token_budget": self.token_budget,
+        }
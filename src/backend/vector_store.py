@@ -1,74 +1,794 @@
-from typing import List, Dict, Optional
-import chromadb
-from chromadb.config import Settings
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterator, List, Dict, Optional, Tuple
 from langchain_core.documents import Document
 from loguru import logger
 
+from .cache import LRUCache
+
+
+def chunk_id(article_id, chunk_index: int) -> str:
+    """Build the stable ID of a chunk from its article ID and position"""
+    return f"{article_id}-{chunk_index}"
+
+
+def content_hash(text: str) -> str:
+    """Hash chunk text so unchanged chunks can be detected on re-index"""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+PARTITION_FORMATS = {"day": "%Y%m%d", "month": "%Y%m", "year": "%Y"}
+
+
+def partition_key(published_ts: float, period: str) -> str:
+    """Return the key of the time partition a publication timestamp falls into"""
+    return datetime.fromtimestamp(published_ts).strftime(PARTITION_FORMATS[period])
+
+
+def partition_bounds(key: str, period: str) -> Tuple[datetime, datetime]:
+    """Return the [start, end) time range covered by a partition key"""
+    start = datetime.strptime(key, PARTITION_FORMATS[period])
+    if period == "day":
+        end = start + timedelta(days=1)
+    elif period == "month":
+        end = start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+    else:
+        end = start.replace(year=start.year + 1)
+    return start, end
+
+
+def build_where(
+    published_after: Optional[datetime] = None,
+    published_before: Optional[datetime] = None,
+    sources: Optional[List[str]] = None,
+    exclude_article_id=None,
+    where: Optional[Dict] = None
+) -> Optional[Dict]:
+    """
+    Build a Chroma ``where`` filter from the common chunk metadata filters.
+
+    Time bounds apply to the numeric ``published_ts`` metadata, so chunks
+    stored without a publication time never match a time window.
+    """
+    conditions = []
+    if published_after is not None:
+        conditions.append({"published_ts": {"$gte": int(published_after.timestamp())}})
+    if published_before is not None:
+        conditions.append({"published_ts": {"$lte": int(published_before.timestamp())}})
+    if sources:
+        conditions.append({"source": {"$in": list(sources)}})
+    if exclude_article_id is not None:
+        conditions.append({"article_id": {"$ne": exclude_article_id}})
+    if where:
+        conditions.append(where)
+
+    if not conditions:
+        return None
+    if len(conditions) == 1:
+        return conditions[0]
+    return {"$and": conditions}
+
+
+def matches_where(metadata: Dict, where: Optional[Dict]) -> bool:
+    """
+    Evaluate a Chroma-style ``where`` filter against a metadata dict in Python.
+
+    Supports $and/$or and the $eq, $ne, $gt, $gte, $lt, $lte, $in and $nin
+    operators, as well as plain ``{"field": value}`` equality.
+    """
+    if not where:
+        return True
+
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_where(metadata, clause) for clause in condition):
+                return False
+            continue
+        if key == "$or":
+            if not any(matches_where(metadata, clause) for clause in condition):
+                return False
+            continue
+
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        value = metadata.get(key)
+        for operator, operand in condition.items():
+            if operator == "$eq" and value != operand:
+                return False
+            if operator == "$ne" and value == operand:
+                return False
+            if operator == "$in" and value not in operand:
+                return False
+            if operator == "$nin" and value in operand:
+                return False
+            if operator in ("$gt", "$gte", "$lt", "$lte"):
+                if value is None:
+                    return False
+                if operator == "$gt" and not value > operand:
+                    return False
+                if operator == "$gte" and not value >= operand:
+                    return False
+                if operator == "$lt" and not value < operand:
+                    return False
+                if operator == "$lte" and not value <= operand:
+                    return False
+
+    return True
+
+
+def document_id(doc: Document) -> str:
+    """
+    Return the deterministic ID of a document.
+
+    An explicit ``doc_id`` wins, then ``article_id`` + ``chunk_index``,
+    and finally the content hash.
+    """
+    metadata = doc.metadata
+    if "doc_id" in metadata:
+        return str(metadata["doc_id"])
+    if "article_id" in metadata and "chunk_index" in metadata:
+        return chunk_id(metadata["article_id"], metadata["chunk_index"])
+    return content_hash(doc.page_content)
+
+
+def parse_published_at(published_at: str) -> datetime:
+    """
+    Parse an article's publish time as an aware datetime.
+
+    NewsAPI sends UTC times with a "Z" suffix; SQLite hands them back naive,
+    so naive values are UTC as well, never local time.
+    """
+    published = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
+    return published if published.tzinfo is not None else published.replace(tzinfo=timezone.utc)
+
+
+def chunk_metadata(article_id: int, published_at: str, source: Optional[str]) -> Dict:
+    """
+    Compact per-chunk metadata referencing the article it came from.
+
+    Everything else about the article (title, url, keywords, ...) lives in
+    the DataStore and is hydrated by ``article_id`` when needed. The publish
+    time is normalized to UTC, so the pipeline and the reindex, which reads
+    it back from SQLite, write the same values.
+    """
+    published = parse_published_at(published_at)
+    return {
+        "article_id": article_id,
+        "published_at": published.isoformat(),
+        "published_ts": int(published.timestamp()),
+        "source": source,
+    }
+
+
+def build_article_chunks(text_splitter, content: str, metadata: Dict) -> List[Document]:
+    """Split an article into chunks tagged with their ``chunk_index``"""
+    chunks = text_splitter.split_documents([Document(page_content=content, metadata=metadata)])
+    for index, chunk in enumerate(chunks):
+        chunk.metadata["chunk_index"] = index
+    return chunks
+
+
 class VectorStore:
-    def __init__(self, persist_directory: str = "chroma_db"):
-        self.client = chromadb.PersistentClient(
-            path=persist_directory,
+    DEFAULT_COLLECTION = "news_articles"
+    ACTIVE_COLLECTION_FILE = "active_collection"
+    DEFAULT_DIRECTORIES = {"chroma": "chroma_db", "numpy": "vector_db"}
+    MEMORY = ":memory:"
+
+    def __init__(
+        self,
+        persist_directory: Optional[str] = None,
+        embedding_function=None,
+        hnsw_m: Optional[int] = None,
+        hnsw_ef_construction: Optional[int] = None,
+        hnsw_ef_search: Optional[int] = None,
+        query_cache_size: int = 1024,
+        partition_period: Optional[str] = None,
+        retention_days: Optional[int] = None,
+        query_workers: int = 4,
+        backend: str = "chroma",
+        vector_dtype: str = "float16"
+    ):
+        """
+        Args:
+            persist_directory: Directory of the persistent database; defaults to
+                "chroma_db" for Chroma and "vector_db" for the NumPy engine.
+                ":memory:" keeps a throwaway store private to this instance: an
+                ephemeral Chroma database, or a temporary directory for the NumPy engine
+            embedding_function: Chroma embedding function used for both indexing
+                and queries; Chroma's default model when omitted
+            hnsw_m: HNSW graph degree (M) for newly created collections
+            hnsw_ef_construction: HNSW ef_construction for newly created collections
+            hnsw_ef_search: HNSW ef_search, also applied to the existing collection
+            query_cache_size: Number of similarity_search results kept in the
+                in-process query cache, 0 disables it
+            partition_period: "day", "month" or "year" to write dated chunks into
+                one collection per period; None keeps a single collection
+            retention_days: Partitions that ended more than this many days ago
+                are dropped by ``drop_expired_partitions``
+            query_workers: Threads used to query several partitions in parallel
+            backend: "chroma" for Chroma's HNSW index, "numpy" for the built-in
+                memory-mapped brute-force engine (see ``numpy_store``)
+            vector_dtype: Vector storage type of the NumPy engine, float16 or float32
+        """
+        if backend not in self.DEFAULT_DIRECTORIES:
+            raise ValueError(f"Unknown vector store backend: {backend}")
+        if partition_period is not None and partition_period not in PARTITION_FORMATS:
+            raise ValueError(f"Unknown partition period: {partition_period}")
+
+        self.backend = backend
+        self.vector_dtype = vector_dtype
+        self.in_memory = persist_directory == self.MEMORY
+        self.memory_database = None
+        self.temp_directory = None
+        if self.in_memory and backend == "numpy":
+            self.temp_directory = tempfile.TemporaryDirectory(prefix="vector_db-")
+            persist_directory = self.temp_directory.name
+        # None for in-memory Chroma, which has no directory for the active collection pointer
+        self.persist_directory = None if self.in_memory and backend == "chroma" else \
+            Path(persist_directory or self.DEFAULT_DIRECTORIES[backend])
+        self.client = self._create_client()
+        if embedding_function is None:
+            from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+            embedding_function = DefaultEmbeddingFunction()
+        self.embedding_function = embedding_function
+        self.hnsw_ef_search = hnsw_ef_search
+        # Bumped on every write; cached query results of older generations are never served
+        self.generation = 0
+        self.query_cache = LRUCache(max_size=query_cache_size)
+
+        self.collection_metadata = {"hnsw:space": "cosine"}
+        if hnsw_m is not None:
+            self.collection_metadata["hnsw:M"] = hnsw_m
+        if hnsw_ef_construction is not None:
+            self.collection_metadata["hnsw:construction_ef"] = hnsw_ef_construction
+        if hnsw_ef_search is not None:
+            self.collection_metadata["hnsw:search_ef"] = hnsw_ef_search
+
+        self.partition_period = partition_period
+        self.retention_days = retention_days
+        self.query_pool = ThreadPoolExecutor(max_workers=query_workers) if partition_period else None
+
+        # Undated chunks live in the base collection, dated ones in its
+        # partitions named "<base>_<period key>"
+        self.collection = self._open_collection(self._active_collection_name())
+        self.partitions = self._load_partitions(self.collection.name)
+
+    def _create_client(self):
+        # chromadb is slow to import, so only load it when it is used
+        if self.backend == "numpy":
+            from .numpy_store import NumpyClient
+            return NumpyClient(str(self.persist_directory), dtype=self.vector_dtype)
+
+        import chromadb
+        from chromadb.config import Settings
+        if self.persist_directory is None:
+            # Ephemeral clients share one in-process system, so each store
+            # gets its own database to stay isolated
+            self.memory_database = f"vector_store_{uuid.uuid4().hex}"
+            chromadb.AdminClient(Settings(anonymized_telemetry=False, is_persistent=False))\
+                .create_database(self.memory_database)
+            return chromadb.EphemeralClient(
+                settings=Settings(anonymized_telemetry=False),
+                database=self.memory_database
+            )
+        return chromadb.PersistentClient(
+            path=str(self.persist_directory),
             settings=Settings(
                 anonymized_telemetry=False
             )
         )
-        self.collection = self.client.get_or_create_collection(
-            name="news_articles",
-            metadata={"hnsw:space": "cosine"}
+
+    def close(self) -> None:
+        """Stop the query threads and release the embedding cache; in-memory stores discard their data"""
+        if self.query_pool is not None:
+            self.query_pool.shutdown(wait=False)
+        close_embedding = getattr(self.embedding_function, "close", None)
+        if close_embedding is not None:
+            close_embedding()
+        if self.memory_database is not None:
+            import chromadb
+            from chromadb.config import Settings
+            for collection in self.client.list_collections():
+                self.client.delete_collection(collection.name)
+            chromadb.AdminClient(Settings(anonymized_telemetry=False, is_persistent=False))\
+                .delete_database(self.memory_database)
+            self.memory_database = None
+        if self.temp_directory is not None:
+            self.client.close()
+            self.temp_directory.cleanup()
+            self.temp_directory = None
+
+    def _active_collection_name(self) -> str:
+        if self.persist_directory is None:
+            return self.DEFAULT_COLLECTION
+        pointer = self.persist_directory / self.ACTIVE_COLLECTION_FILE
+        if pointer.exists():
+            return pointer.read_text().strip() or self.DEFAULT_COLLECTION
+        return self.DEFAULT_COLLECTION
+
+    def _open_collection(self, name: str):
+        collection = self.client.get_or_create_collection(
+            name=name,
+            metadata=self.collection_metadata,
+            embedding_function=self.embedding_function
         )
+        # ef_search is a query-time setting, so it can change on existing collections
+        if (
+            self.backend == "chroma"
+            and self.hnsw_ef_search is not None
+            and collection.configuration["hnsw"]["ef_search"] != self.hnsw_ef_search
+        ):
+            collection.modify(configuration={"hnsw": {"ef_search": self.hnsw_ef_search}})
+        return collection
+
+    def _load_partitions(self, base: str) -> Dict[str, object]:
+        """Open the existing partitions of a base collection, keyed by period key"""
+        if self.partition_period is None:
+            return {}
+
+        key_length = len(datetime(2000, 1, 1).strftime(PARTITION_FORMATS[self.partition_period]))
+        pattern = re.compile(rf"{re.escape(base)}_(\d{{{key_length}}})")
+        partitions = {}
+        for collection in self.client.list_collections():
+            match = pattern.fullmatch(collection.name)
+            if match:
+                partitions[match.group(1)] = self._open_collection(collection.name)
+        return partitions
+
+    def _partition(self, base, key: str):
+        """Return the partition of a base collection, creating it on first write"""
+        if base.name == self.collection.name:
+            if key not in self.partitions:
+                self.partitions[key] = self._open_collection(f"{base.name}_{key}")
+                logger.info(f"Created partition {base.name}_{key}")
+            return self.partitions[key]
+        return self._open_collection(f"{base.name}_{key}")
+
+    def _route(self, metadatas: List[Dict], base=None) -> List[Tuple[object, List[int]]]:
+        """Group document positions by the collection they are stored in"""
+        base = base if base is not None else self.collection
+        if not metadatas:
+            # Let Chroma reject empty writes as before
+            return [(base, [])]
+
+        groups = {}
+        for i, metadata in enumerate(metadatas):
+            if self.partition_period is None or metadata.get("published_ts") is None:
+                collection = base
+            else:
+                collection = self._partition(base, partition_key(metadata["published_ts"], self.partition_period))
+            groups.setdefault(collection.name, (collection, []))[1].append(i)
+        return list(groups.values())
+
+    def collections(self) -> List:
+        """The base collection followed by its partitions in time order"""
+        return [self.collection] + [self.partitions[key] for key in sorted(self.partitions)]
+
+    def count(self) -> int:
+        """Number of chunks across the base collection and all partitions"""
+        return sum(collection.count() for collection in self.collections())
+
+    def drop_collection(self, collection) -> None:
+        """Delete a base collection together with all of its partitions"""
+        for partition in self._load_partitions(collection.name).values():
+            self.client.delete_collection(partition.name)
+        self.client.delete_collection(collection.name)
+
+    def drop_expired_partitions(self, now: Optional[datetime] = None) -> List[str]:
+        """
+        Enforce retention by deleting whole partitions older than ``retention_days``.
+
+        Undated chunks in the base collection are never dropped.
+
+        Returns:
+            Names of the dropped partitions
+        """
+        if self.partition_period is None or self.retention_days is None:
+            return []
+
+        cutoff = (now or datetime.now()) - timedelta(days=self.retention_days)
+        dropped = []
+        for key in sorted(self.partitions):
+            _, end = partition_bounds(key, self.partition_period)
+            if end <= cutoff:
+                name = self.partitions.pop(key).name
+                self.client.delete_collection(name)
+                dropped.append(name)
+
+        if dropped:
+            self.bump_generation()
+            logger.info(f"Dropped {len(dropped)} expired partitions: {', '.join(dropped)}")
+        return dropped
+
+    def drop_inactive_collections(self) -> List[str]:
+        """
+        Delete the collections left behind by earlier rebuilds, with their partitions.
+
+        Returns:
+            Names of the dropped collections
+        """
+        pattern = re.compile(rf"{re.escape(self.DEFAULT_COLLECTION)}(_\d{{14}})?")
+        inactive = [
+            collection for collection in self.client.list_collections()
+            if pattern.fullmatch(collection.name) and collection.name != self.collection.name
+        ]
+        for collection in inactive:
+            self.drop_collection(collection)
+            logger.info(f"Dropped inactive collection {collection.name}")
+        return [collection.name for collection in inactive]
+
+    def create_staging_collection(self):
+        """Create an empty collection to rebuild the index into"""
+        name = f"{self.DEFAULT_COLLECTION}_{datetime.now():%Y%m%d%H%M%S}"
+        if name in [collection.name for collection in self.client.list_collections()]:
+            self.client.delete_collection(name)
+        return self._open_collection(name)
+
+    def activate_collection(self, collection, drop_previous: bool = False) -> None:
+        """
+        Atomically make a rebuilt collection the active one.
+
+        The active collection name lives in a pointer file that is replaced
+        with ``os.replace``, so other processes see either the old or the
+        new collection, never a half-built one.
+
+        Args:
+            collection: The collection to activate
+            drop_previous: Delete the previously active collection afterwards;
+                by default it is kept as a fallback for readers that still use it
+        """
+        previous = self.collection
+        if self.persist_directory is not None:
+            pointer = self.persist_directory / self.ACTIVE_COLLECTION_FILE
+            staged_pointer = pointer.with_suffix(".tmp")
+            staged_pointer.write_text(collection.name)
+            os.replace(staged_pointer, pointer)
+
+        self.collection = collection
+        self.partitions = self._load_partitions(collection.name)
+        self.bump_generation()
+        logger.info(f"Activated collection {collection.name} with {len(self.partitions)} partitions")
+
+        if drop_previous and previous.name != collection.name:
+            self.drop_collection(previous)
+            logger.info(f"Dropped previous collection {previous.name}")
+
+    def embed_documents(self, documents: List[Document]) -> Tuple[List[str], List[str], List[Dict], List]:
+        """
+        Prepare and embed documents without writing them.
+
+        Returns:
+            IDs, texts, metadata and embeddings, ready for ``collection.upsert``
+        """
+        ids, texts, metadatas = self.prepare_documents(documents)
+        return ids, texts, metadatas, self.embedding_function(texts)
+
+    def write_embedded(self, base, ids: List[str], texts: List[str], metadatas: List[Dict], embeddings: List) -> None:
+        """Upsert pre-embedded documents into a base collection and its partitions"""
+        for collection, positions in self._route(metadatas, base):
+            collection.upsert(
+                ids=[ids[i] for i in positions],
+                documents=[texts[i] for i in positions],
+                metadatas=[metadatas[i] for i in positions],
+                embeddings=[embeddings[i] for i in positions]
+            )
+
+    def bump_generation(self) -> None:
+        """Invalidate cached query results after the collection changed"""
+        self.generation += 1
+        self.query_cache.clear()
+
+    def prepare_documents(self, documents: List[Document]) -> Tuple[List[str], List[str], List[Dict]]:
+        """
+        Build IDs, texts and metadata for a batch of documents without embedding them.
+        Every metadata dict gets a ``content_hash`` of its text.
+        """
+        ids = []
+        texts = []
+        metadatas = []
+
+        for doc in documents:
+            # Chroma rejects None metadata values
+            metadata = {key: value for key, value in doc.metadata.items() if value is not None}
+            metadata["content_hash"] = content_hash(doc.page_content)
+
+            ids.append(document_id(doc))
+            texts.append(doc.page_content)
+            metadatas.append(metadata)
+
+        return ids, texts, metadatas
 
     def add_documents(self, documents: List[Document]) -> None:
         """Add documents to the vector store"""
         try:
-            ids = []
-            texts = []
-            metadatas = []
-            
-            for doc in documents:
-                ids.append(doc.metadata.get("doc_id", str(len(ids))))
-                texts.append(doc.page_content)
-                metadatas.append(doc.metadata)
-            
-            self.collection.add(
-                documents=texts,
-                ids=ids,
-                metadatas=metadatas
-            )
+            ids, texts, metadatas = self.prepare_documents(documents)
+
+            for collection, positions in self._route(metadatas):
+                collection.add(
+                    documents=[texts[i] for i in positions],
+                    ids=[ids[i] for i in positions],
+                    metadatas=[metadatas[i] for i in positions]
+                )
+            self.bump_generation()
         except Exception as e:
             logger.error(f"Failed to add documents to vector store: {str(e)}")
             raise
 
-    def similarity_search(self, query: str, k: int = 5) -> List[Dict]:
-        """Search for similar documents"""
+    def upsert_documents(self, documents: List[Document]) -> int:
+        """
+        Idempotently write documents, embedding only chunks whose text changed.
+
+        Chunks whose content hash matches the stored one are skipped, or only
+        get their metadata refreshed. Chunks left over from a previous, longer
+        version of the same article are deleted.
+
+        Args:
+            documents: Documents to write, usually the chunks of one article
+
+        Returns:
+            Number of chunks that were (re-)embedded
+        """
+        if not documents:
+            return 0
+
         try:
-            results = self.collection.query(
-                query_texts=[query],
-                n_results=k
+            ids, texts, metadatas = self.prepare_documents(documents)
+
+            counts = [0, 0, 0]
+            for collection, positions in self._route(metadatas):
+                result = self._upsert_into(
+                    collection,
+                    [ids[i] for i in positions],
+                    [texts[i] for i in positions],
+                    [metadatas[i] for i in positions]
+                )
+                counts = [total + n for total, n in zip(counts, result)]
+
+            changed, metadata_only, stale = counts
+            if changed or metadata_only or stale:
+                self.bump_generation()
+
+            logger.debug(
+                f"Upserted {len(ids)} chunks: {changed} embedded, {metadata_only} metadata-only, "
+                f"{len(ids) - changed - metadata_only} unchanged, {stale} stale deleted"
             )
-            
-            return [{
-                "id": results["ids"][0][i],
-                "content": results["documents"][0][i],
-                "metadata": results["metadatas"][0][i],
-                "distance": results["distances"][0][i]
-            } for i in range(len(results["ids"][0]))]
+            return changed
+        except Exception as e:
+            logger.error(f"Failed to upsert documents to vector store: {str(e)}")
+            raise
+
+    @staticmethod
+    def _upsert_into(collection, ids: List[str], texts: List[str], metadatas: List[Dict]) -> Tuple[int, int, int]:
+        """
+        Write prepared documents into one collection.
+
+        Returns:
+            Numbers of embedded, metadata-only and deleted stale chunks
+        """
+        existing = collection.get(ids=ids, include=["metadatas"])
+        stored = dict(zip(existing["ids"], existing["metadatas"]))
+
+        changed = []
+        metadata_only = []
+        for i, doc_id in enumerate(ids):
+            old = stored.get(doc_id)
+            if old is None or old.get("content_hash") != metadatas[i]["content_hash"]:
+                changed.append(i)
+            elif old != metadatas[i]:
+                metadata_only.append(i)
+
+        if changed:
+            collection.upsert(
+                ids=[ids[i] for i in changed],
+                documents=[texts[i] for i in changed],
+                metadatas=[metadatas[i] for i in changed]
+            )
+        if metadata_only:
+            collection.update(
+                ids=[ids[i] for i in metadata_only],
+                metadatas=[metadatas[i] for i in metadata_only]
+            )
+
+        # Drop chunks of re-indexed articles that no longer exist
+        new_ids = set(ids)
+        stale_count = 0
+        article_ids = {m["article_id"] for m in metadatas if "article_id" in m}
+        for article_id in article_ids:
+            old_ids = collection.get(where={"article_id": article_id}, include=[])["ids"]
+            stale = [doc_id for doc_id in old_ids if doc_id not in new_ids]
+            if stale:
+                collection.delete(ids=stale)
+                stale_count += len(stale)
+                logger.debug(f"Deleted {len(stale)} stale chunks of article {article_id}")
+
+        return len(changed), len(metadata_only), stale_count
+
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 5,
+        published_after: Optional[datetime] = None,
+        published_before: Optional[datetime] = None,
+        sources: Optional[List[str]] = None,
+        exclude_article_id=None,
+        where: Optional[Dict] = None,
+        decay_half_life_days: Optional[float] = None
+    ) -> List[Dict]:
+        """
+        Search for similar documents, optionally filtered by metadata.
+
+        Args:
+            query: Text to search for
+            k: Number of results to return
+            published_after: Only return chunks published at or after this time
+            published_before: Only return chunks published at or before this time
+            sources: Only return chunks from these sources
+            exclude_article_id: Skip chunks of this article
+            where: Additional raw Chroma metadata filter
+            decay_half_life_days: When set, over-fetch and re-rank by similarity
+                halved for every half-life of article age
+
+        Returns:
+            List of result dicts with id, content, metadata and distance
+            (plus score when time decay is applied)
+        """
+        # Whitespace-normalized query plus every filter; the generation makes
+        # results cached before the last write unreachable
+        cache_key = (
+            self.generation,
+            " ".join(query.split()),
+            k,
+            int(published_after.timestamp()) if published_after else None,
+            int(published_before.timestamp()) if published_before else None,
+            tuple(sorted(sources)) if sources else None,
+            exclude_article_id,
+            json.dumps(where, sort_keys=True) if where else None,
+            decay_half_life_days,
+        )
+        cached = self.query_cache.get(cache_key)
+        if cached is not None:
+            return [dict(doc) for doc in cached]
+
+        try:
+            n_results = k * 3 if decay_half_life_days else k
+            documents = self._query_collections(
+                self._query_targets(published_after, published_before),
+                query,
+                n_results,
+                build_where(published_after, published_before, sources, exclude_article_id, where)
+            )
+
+            if decay_half_life_days:
+                documents = self._apply_time_decay(documents, decay_half_life_days)[:k]
+
+            self.query_cache.put(cache_key, [dict(doc) for doc in documents])
+            return documents
         except Exception as e:
             logger.error(f"Failed to perform similarity search: {str(e)}")
             raise
 
+    def _query_targets(self, published_after: Optional[datetime], published_before: Optional[datetime]) -> List:
+        """The base collection plus the partitions overlapping the time window"""
+        targets = [self.collection]
+        for key in sorted(self.partitions):
+            start, end = partition_bounds(key, self.partition_period)
+            if published_after is not None and end <= published_after:
+                continue
+            if published_before is not None and start > published_before:
+                continue
+            targets.append(self.partitions[key])
+        return targets
+
+    def _query_collections(self, collections: List, query: str, n_results: int, where: Optional[Dict]) -> List[Dict]:
+        """Query collections in parallel and merge their hits by distance"""
+        if len(collections) == 1:
+            results = [collections[0].query(query_texts=[query], n_results=n_results, where=where)]
+            return self._merge_results(results, 0, n_results)
+
+        # Embed once instead of once per partition
+        query_embeddings = self.embedding_function.embed_query(input=[query])
+        return self._query_embeddings(collections, query_embeddings, n_results, where)[0]
+
+    def _query_embeddings(self, collections: List, query_embeddings, n_results: int, where: Optional[Dict]) -> List[List[Dict]]:
+        """Query collections in parallel with precomputed embeddings; one merged hit list per embedding"""
+        if len(collections) == 1:
+            results = [collections[0].query(query_embeddings=query_embeddings, n_results=n_results, where=where)]
+        else:
+            results = list(self.query_pool.map(
+                lambda collection: collection.query(query_embeddings=query_embeddings, n_results=n_results, where=where),
+                collections
+            ))
+        return [self._merge_results(results, q, n_results) for q in range(len(query_embeddings))]
+
+    @staticmethod
+    def _merge_results(results: List[Dict], q: int, n_results: int) -> List[Dict]:
+        """Merge the hits of query ``q`` from several collections by distance"""
+        documents = [{
+            "id": result["ids"][q][i],
+            "content": result["documents"][q][i],
+            "metadata": result["metadatas"][q][i],
+            "distance": result["distances"][q][i]
+        } for result in results for i in range(len(result["ids"][q]))]
+
+        documents.sort(key=lambda doc: doc["distance"])
+        return documents[:n_results]
+
+    def article_embeddings(self, article_id) -> List:
+        """Stored chunk embeddings of one article, across all collections"""
+        embeddings = []
+        for collection in self.collections():
+            results = collection.get(where={"article_id": article_id}, include=["embeddings"])
+            if results["embeddings"] is not None:
+                embeddings.extend(list(results["embeddings"]))
+        return embeddings
+
+    def search_by_embeddings(self, embeddings: List, k: int = 20, where: Optional[Dict] = None) -> List[List[Dict]]:
+        """
+        Search every collection with precomputed embeddings, bypassing the query cache.
+
+        Args:
+            embeddings: Query vectors, e.g. the stored chunks of an article
+            k: Number of results per embedding
+            where: Raw metadata filter
+
+        Returns:
+            One list of result dicts (id, content, metadata, distance) per embedding
+        """
+        if not len(embeddings):
+            return []
+        return self._query_embeddings(self.collections(), [list(map(float, vector)) for vector in embeddings], k, where)
+
+    @staticmethod
+    def _apply_time_decay(documents: List[Dict], half_life_days: float) -> List[Dict]:
+        """Re-rank results by cosine similarity decayed with article age"""
+        now = time.time()
+        for doc in documents:
+            published_ts = doc["metadata"].get("published_ts")
+            age_days = max(0.0, (now - published_ts) / 86400) if published_ts is not None else 0.0
+            doc["score"] = (1 - doc["distance"]) * 0.5 ** (age_days / half_life_days)
+
+        return sorted(documents, key=lambda doc: doc["score"], reverse=True)
+
+    def iter_documents(self, batch_size: int = 1000, where: Optional[Dict] = None) -> Iterator[Dict]:
+        """Yield every stored chunk as a dict with id, content and metadata"""
+        for collection in self.collections():
+            offset = 0
+            while True:
+                results = collection.get(
+                    where=where,
+                    limit=batch_size,
+                    offset=offset,
+                    include=["documents", "metadatas"]
+                )
+                for doc_id, content, metadata in zip(results["ids"], results["documents"], results["metadatas"]):
+                    yield {"id": doc_id, "content": content, "metadata": metadata}
+
+                if len(results["ids"]) < batch_size:
+                    break
+                offset += batch_size
+
     def get_document(self, doc_id: str) -> Optional[Dict]:
         """Retrieve a specific document by ID"""
         try:
-            results = self.collection.get(
-                ids=[doc_id]
-            )
-            if results["ids"]:
-                return {
-                    "id": results["ids"][0],
-                    "content": results["documents"][0],
-                    "metadata": results["metadatas"][0]
-                }
+            for collection in self.collections():
+                results = collection.get(
+                    ids=[doc_id]
+                )
+                if results["ids"]:
+                    return {
+                        "id": results["ids"][0],
+                        "content": results["documents"][0],
+                        "metadata": results["metadatas"][0]
+                    }
             return None
         except Exception as e:
             logger.error(f"Failed to get document: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
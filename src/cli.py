@@ -1,7 +1,18 @@
+import json
+from datetime import datetime
+
 import click
 from loguru import logger
 
-from backend.service import start_news_chain
+
+# Commands import their dependencies lazily: the LLM, vector and benchmark
+# stacks are slow to load, and settings require the API keys, which
+# serve-api does not need.
+
+
+def iso_day(value):
+    """ISO date of a click.DateTime value; date-only upper bounds cover the whole day"""
+    return value.date().isoformat() if value is not None else None
 
 
 @click.group()
@@ -11,10 +22,257 @@ def cli():
 
 
 @cli.command()
-def analyze():
+@click.option("--in-memory", is_flag=True, default=None,
+              help="Use throwaway in-memory stores instead of news.db and the vector directory")
+@click.option("--profile", type=click.Choice(["cpu", "mem"]), default=None,
+              help="Profile the run; collapsed stacks and JSON reports are written to OUTPUT_DIR")
+def analyze(in_memory, profile):
     """Analyze fetched news articles"""
+    from config.settings import settings
+    from config.logger import setup_logging
+    from backend.service import start_news_chain
+
+    setup_logging(settings.ENVIRONMENT)
+    start_news_chain(in_memory=in_memory, profile=profile)
+
+
+
+@cli.command()
+@click.option("--workers", type=int, default=None, help="Parallel embedding workers")
+@click.option("--batch-size", type=int, default=None, help="Articles per embedding batch")
+@click.option("--drop-old", is_flag=True, help="Drop the previous collection right after the swap instead of on the next run")
+def reindex(workers, batch_size, drop_old):
+    """
+    Rebuild the vector store from the analyzed articles in SQLite.
+
+    Articles analyzed during the rebuild are indexed after the swap; an
+    analyze run still going after it writes to the old collection, so
+    reindex while analyze is idle.
+    """
+    from backend.service import reindex_vector_store
+
+    def report(stats):
+        click.echo(
+            f"\r{stats['articles']} articles, {stats['chunks']} chunks, "
+            f"{stats['chunks_per_second']} chunks/s",
+            nl=False
+        )
+
+    stats = reindex_vector_store(
+        workers=workers,
+        batch_size=batch_size,
+        drop_previous=drop_old,
+        on_progress=report
+    )
+    click.echo()
+    click.echo(
+        f"Reindexed into {stats['collection']} in {stats['seconds']}s "
+        f"({stats['caught_up']} articles analyzed meanwhile added)"
+    )
+
+
+@cli.command("bench-embeddings")
+@click.option("--texts", "text_count", default=2000, show_default=True, help="Number of synthetic texts")
+@click.option("--batch-sizes", default="16,32,64,128", show_default=True, help="Comma-separated batch sizes")
+@click.option("--threads", default="1,2,4", show_default=True, help="Comma-separated intra-op thread counts")
+def bench_embeddings(text_count, batch_sizes, threads):
+    """Measure local embedding throughput per batch size and thread count"""
+    from config.settings import settings
+    from backend.embeddings import LocalEmbeddingFunction
+    from backend.benchmark import synthetic_texts, benchmark_embeddings
+
+    def make_embedding_function(batch_size, num_threads):
+        return LocalEmbeddingFunction(
+            model_path=settings.EMBEDDING_MODEL_PATH,
+            batch_size=batch_size,
+            num_threads=num_threads,
+            precision=settings.EMBEDDING_PRECISION
+        )
+
+    results = benchmark_embeddings(
+        make_embedding_function,
+        synthetic_texts(text_count),
+        batch_sizes=[int(b) for b in batch_sizes.split(",")],
+        thread_counts=[int(t) for t in threads.split(",")]
+    )
+    click.echo(json.dumps(results, indent=2))
+
+
+
+@cli.command("bench-retrieval")
+@click.option("--sizes", default="10000,100000", show_default=True, help="Comma-separated corpus sizes in chunks")
+@click.option("--queries", default=200, show_default=True, help="Queries per size")
+@click.option("--k", default=10, show_default=True, help="Results per query")
+@click.option("--embedding", type=click.Choice(["hashing", "local"]), default="hashing", show_default=True,
+              help="Cheap hashing vectors or the configured embedding model")
+@click.option("--backend", type=click.Choice(["chroma", "numpy"]), default="chroma", show_default=True,
+              help="Vector store backend")
+@click.option("--hnsw-m", type=int, default=None, help="HNSW M")
+@click.option("--ef-construction", type=int, default=None, help="HNSW ef_construction")
+@click.option("--ef-search", type=int, default=None, help="HNSW ef_search")
+def bench_retrieval(sizes, queries, k, embedding, backend, hnsw_m, ef_construction, ef_search):
+    """Measure vector store latency, throughput, disk footprint and recall@k at scale"""
+    from config.settings import settings
+    from backend.service import create_embedding_function
+    from backend.vector_store import VectorStore
+    from backend.benchmark import benchmark_vector_store, HashingEmbeddingFunction
+
+    def make_store(directory):
+        return VectorStore(
+            persist_directory=directory,
+            backend=backend,
+            embedding_function=HashingEmbeddingFunction() if embedding == "hashing" else create_embedding_function(),
+            hnsw_m=hnsw_m,
+            hnsw_ef_construction=ef_construction,
+            hnsw_ef_search=ef_search
+        )
+
+    report = benchmark_vector_store(make_store, [int(size) for size in sizes.split(",")], queries=queries, k=k)
+    report["config"].update({
+        "embedding": embedding,
+        "backend": backend,
+        "hnsw_m": hnsw_m,
+        "hnsw_ef_construction": ef_construction,
+        "hnsw_ef_search": ef_search,
+    })
+
+    settings.OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    output = settings.OUTPUT_DIR / f"bench-retrieval-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.write_text(json.dumps(report, indent=2))
+    click.echo(json.dumps(report, indent=2))
+    click.echo(f"Report written to {output}")
+
+
+@cli.command()
+@click.option("--by", "group_by", type=click.Choice(["day", "source"]), default="day", show_default=True,
+              help="Roll up by calendar day or by article source")
+@click.option("--from", "from_date", type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+              help="Only calls on or after this day, YYYY-MM-DD")
+@click.option("--to", "to_date", type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+              help="Only calls on or before this day, YYYY-MM-DD")
+@click.option("--json", "as_json", is_flag=True, help="Print the rollup as JSON")
+def usage(group_by, from_date, to_date, as_json):
+    """Report LLM token usage and estimated cost from the ledger"""
+    from config.settings import settings
+    from backend.data_store import DataStore
+    from backend.usage import estimate_cost
+
+    rows = DataStore().get_usage_rollup(
+        group_by=group_by,
+        from_date=iso_day(from_date),
+        to_date=iso_day(to_date)
+    )
+    for row in rows:
+        cost = estimate_cost(
+            row,
+            settings.LLM_PRICE_INPUT_PER_M,
+            settings.LLM_PRICE_OUTPUT_PER_M,
+            settings.LLM_PRICE_CACHED_INPUT_PER_M
+        )
+        row["cost"] = round(cost, 4) if cost is not None else None
+
+    if as_json:
+        click.echo(json.dumps(rows, indent=2, ensure_ascii=False))
+        return
+
+    header = f"{group_by:<20} {'calls':>7} {'prompt':>12} {'completion':>12} {'cached':>12} {'hit %':>6} {'avg ms':>9} {'cost':>10}"
+    click.echo(header)
+    click.echo("-" * len(header))
+    for row in rows:
+        hit_rate = 100 * row["cache_hits"] / row["calls"] if row["calls"] else 0
+        click.echo(
+            f"{str(row['key']):<20} {row['calls']:>7} {row['prompt_tokens']:>12} {row['completion_tokens']:>12} "
+            f"{row['cached_tokens']:>12} {hit_rate:>6.1f} {row['avg_latency_ms'] or 0:>9.1f} "
+            f"{row['cost'] if row['cost'] is not None else '-':>10}"
+        )
+
+
+@cli.command()
+@click.option("--date", "day", type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+              help="Day to summarize, YYYY-MM-DD; defaults to today")
+def digest(day):
+    """Write the daily briefing of the analyzed news to OUTPUT_DIR"""
+    from backend.service import build_daily_digest
+
+    day = day.date() if day is not None else datetime.now().date()
+    paths = build_daily_digest(day)
+    click.echo(f"Digest written to {paths['markdown']} and {paths['json']}")
+
+
+@cli.command("retry-failed")
+@click.option("--limit", type=int, default=None, help="Retry at most this many articles, oldest first")
+@click.option("--list", "list_only", is_flag=True, help="Only list the dead-lettered articles")
+def retry_failed(limit, list_only):
+    """Retry the analysis of articles that failed in earlier runs"""
+    if list_only:
+        from backend.data_store import DataStore
+
+        failures = DataStore().get_failed_articles(limit=limit)
+        for failure in failures:
+            click.echo(
+                f"#{failure['id']} article {failure['article_id'] or '-'} {failure['stage'] or '-'} "
+                f"{failure['error_type']} x{failure['attempts']} {failure['updated_at']}: {failure['error']}"
+            )
+        click.echo(f"{len(failures)} failed articles")
+        return
+
+    from config.settings import settings
+    from config.logger import setup_logging
+    from backend.service import retry_failed_articles
+
+    setup_logging(settings.ENVIRONMENT)
+    stats = retry_failed_articles(limit=limit)
+    click.echo(f"Retried {stats['retried']}: {stats['recovered']} recovered, {stats['failed']} still failing")
+
+
+@cli.command()
+@click.option("--format", "export_format", type=click.Choice(["jsonl", "parquet"]), default="jsonl",
+              show_default=True, help="Output format; parquet requires pyarrow")
+@click.option("--from", "from_date", type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+              help="Only articles published on or after this day, YYYY-MM-DD")
+@click.option("--to", "to_date", type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+              help="Only articles published on or before this day, YYYY-MM-DD")
+@click.option("--output", type=click.Path(dir_okay=False), default=None,
+              help="Output file; defaults to a timestamped file in OUTPUT_DIR")
+@click.option("--chunk-size", default=1000, show_default=True, help="Rows read and written at a time")
+@click.option("--db-path", default="news.db", show_default=True, help="SQLite database to export")
+def export(export_format, from_date, to_date, output, chunk_size, db_path):
+    """Export articles with their analysis and keywords for analytics"""
+    from backend.data_store import DataStore
+    from backend.export import export_news
+
+    if output is None:
+        from config.settings import settings
+        output = settings.OUTPUT_DIR / f"news-{datetime.now():%Y%m%d-%H%M%S}.{export_format}"
+
+    rows = export_news(
+        output,
+        format=export_format,
+        from_date=iso_day(from_date),
+        to_date=iso_day(to_date),
+        chunk_size=chunk_size,
+        data_store=DataStore(db_path=db_path)
+    )
+    click.echo(f"Exported {rows} articles to {output}")
+
+
+@cli.command("serve-api")
+@click.option("--host", default="127.0.0.1", show_default=True, help="Interface to bind")
+@click.option("--port", default=8000, show_default=True, help="Port to listen on")
+@click.option("--db-path", default="news.db", show_default=True, help="SQLite database to serve")
+def serve_api(host, port, db_path):
+    """Serve read-only article queries as JSON over HTTP"""
+    from backend.data_store import DataStore
+    from backend.http_api import create_server
 
-    start_news_chain()
+    server = create_server(host, port, DataStore(db_path=db_path))
+    click.echo(f"Serving the query API on http://{host}:{server.server_port}/api/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
 
 
 if __name__ == '__main__':
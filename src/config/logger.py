@@ -1,59 +1,72 @@
+import logging
 import sys
 from pathlib import Path
-from loguru import logger
 from uuid import uuid4
-from .settings import settings
+from loguru import logger
 
-# 创建日志目录
+# 日志目录
 LOG_DIR = Path("logs")
-LOG_DIR.mkdir(exist_ok=True, parents=True)
-
-class CorrelationFilter:
-    def __init__(self):
-        self.correlation_id = str(uuid4())
-
-    def __call__(self, record):
-        record["correlation_id"] = self.correlation_id
-        return True
-
-# 移除默认的 logger 配置
-logger.remove()
-
-# 配置新的 logger
-logger.configure(
-    handlers=[
-        {
-            "sink": sys.stderr,
-            "format": "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | {correlation_id} | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | <level>{message}</level>",
-            "level": "DEBUG" if settings.ENVIRONMENT == "dev" else "INFO",
-            "filter": CorrelationFilter(),
-            "diagnose": True,  # 启用异常诊断
-            "backtrace": True,  # 显示完整的异常回溯
-            "enqueue": True    # 启用异步日志
-        },
-        {
-            "sink": LOG_DIR / "app_{time:YYYY-MM-DD}.log",
-            "rotation": "00:00",
-            "retention": "30 days",
-            "format": "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {correlation_id} | {name}:{function}:{line} | {message}",
-            "level": "DEBUG",
-            "compression": "zip",
-            "serialize": True,
-            "diagnose": True,
-            "backtrace": True,
-            "enqueue": True
-        }
-    ]
-)
-
-# 添加一个异常处理器
-@logger.catch(onerror=lambda _: sys.exit(1))
+# 每个进程一个运行 ID，每篇文章另有 trace_id（见 backend.tracing）
+RUN_ID = uuid4().hex[:8]
+
+INFO_LEVEL = logging.INFO
+
+
+def sampled_filter(record) -> bool:
+    """Drop DEBUG records of unsampled traces; records outside a trace pass by level only"""
+    return record["level"].no >= INFO_LEVEL or record["extra"].get("sampled", True)
+
+
+def setup_logging(environment: str = "dev", log_dir: Path = LOG_DIR) -> None:
+    """
+    配置日志输出。
+
+    dev 环境输出 DEBUG 并启用异常诊断；prod 只输出 INFO 以上，关闭
+    diagnose/backtrace，避免每条异常日志都序列化局部变量。采样的
+    trace 才会输出 DEBUG 日志。
+    """
+    log_dir.mkdir(exist_ok=True, parents=True)
+    verbose = environment != "prod"
+
+    # 移除默认的 logger 配置
+    logger.remove()
+
+    logger.configure(
+        extra={"run_id": RUN_ID, "trace_id": "-", "sampled": True},
+        handlers=[
+            {
+                "sink": sys.stderr,
+                "format": "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | {extra[run_id]}:{extra[trace_id]} | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | <level>{message}</level>",
+                "level": "DEBUG" if environment == "dev" else "INFO",
+                "filter": sampled_filter,
+                "diagnose": verbose,  # 异常诊断（仅非生产环境）
+                "backtrace": verbose,
+                "enqueue": True    # 启用异步日志
+            },
+            {
+                "sink": log_dir / "app_{time:YYYY-MM-DD}.log",
+                "rotation": "00:00",
+                "retention": "30 days",
+                "level": "DEBUG" if verbose else "INFO",
+                "filter": sampled_filter,
+                "compression": "zip",
+                # JSON 行，trace 摘要的 spans 在 record.extra.trace 中
+                "serialize": True,
+                "diagnose": False,
+                "backtrace": verbose,
+                "enqueue": True
+            }
+        ]
+    )
+
+    # 设置未捕获异常的处理器
+    sys.excepthook = handle_exception
+
+
 def handle_exception(exc_type, exc_value, exc_traceback):
     """处理未捕获的异常"""
     if issubclass(exc_type, KeyboardInterrupt):
         sys.exit(0)
-    
-    logger.opt(exception=(exc_type, exc_value, exc_traceback)).error("Uncaught exception:")
 
-# 设置未捕获异常的处理器
-sys.excepthook = handle_exception
\ No newline at end of file
+    logger.opt(exception=(exc_type, exc_value, exc_traceback)).error("Uncaught exception:")
+    sys.exit(1)
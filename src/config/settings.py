@@ -1,19 +1,70 @@
-from pydantic_settings import BaseSettings
 from pydantic import Field
 from pathlib import Path
-from typing import Literal
+from typing import Literal, Optional
 
+from .web_settings import WebSettings
 
-class Settings(BaseSettings):
+
+class Settings(WebSettings):
     ENVIRONMENT: Literal["dev", "test", "prod"] = "dev"
     DEEPSEEK_API_KEY: str = Field(..., env="DEEPSEEK_API_KEY")
     NEWSAPI_KEY: str = Field(..., env="NEWSAPI_KEY")
     OUTPUT_DIR: Path = Path("reports")
     LANGCHAIN_DEBUG: str = Field(..., env="LANGCHAIN_DEBUG")
+    TRACE_SAMPLE_RATE: float = 0.1
+    TRACE_SLOW_MS: Optional[float] = 60_000
+    IN_MEMORY_STORAGE: bool = False
+    EMBEDDING_CACHE_DIR: Path = Path("embedding_cache")
+    EMBEDDING_CACHE_SIZE: int = 200_000
+    EMBEDDING_MODEL_PATH: Optional[Path] = None
+    EMBEDDING_BATCH_SIZE: int = 64
+    EMBEDDING_THREADS: int = 0
+    EMBEDDING_PRECISION: Literal["float32", "float16", "int8"] = "float32"
+    VECTOR_BACKEND: Literal["chroma", "numpy"] = "chroma"
+    VECTOR_DTYPE: Literal["float16", "float32"] = "float16"
+    HNSW_M: Optional[int] = None
+    HNSW_EF_CONSTRUCTION: Optional[int] = None
+    HNSW_EF_SEARCH: Optional[int] = None
+    QUERY_CACHE_SIZE: int = 1024
+    VECTOR_PARTITION_PERIOD: Optional[Literal["day", "month", "year"]] = "month"
+    VECTOR_RETENTION_DAYS: Optional[int] = None
+    VECTOR_QUERY_WORKERS: int = 4
+    REINDEX_WORKERS: int = 4
+    REINDEX_BATCH_SIZE: int = 32
+    LLM_TOKEN_BUDGET: Optional[int] = None
+    LLM_BUDGET_MODE: Literal["stop", "degrade"] = "stop"
+    LLM_PRICE_INPUT_PER_M: Optional[float] = None
+    LLM_PRICE_CACHED_INPUT_PER_M: Optional[float] = None
+    LLM_PRICE_OUTPUT_PER_M: Optional[float] = None
+    ANALYSIS_BATCH_SIZE: int = 1
+    ANALYSIS_BATCH_TOKENS: int = 6000
+    TRIAGE_MODE: Literal["off", "heuristic", "llm"] = "off"
+    TRIAGE_THRESHOLD: float = 0.4
+    TRIAGE_MODEL: str = "deepseek-chat"
+    DIGEST_CHUNK_SIZE: int = 8
+    DIGEST_REDUCE_FANOUT: int = 8
+    RETRY_TRANSIENT_ATTEMPTS: int = 4
+    RETRY_PARSE_ATTEMPTS: int = 2
+    RETRY_BASE_DELAY: float = 1.0
+    RETRY_MAX_DELAY: float = 30.0
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RESET_SECONDS: float = 60.0
+    DEDUP_ENABLED: bool = False
+    DEDUP_THRESHOLD: float = 0.6
+    RELATED_ARTICLES_ENABLED: bool = True
+    RELATED_ARTICLES_K: int = 5
+    RELATED_ARTICLES_MIN_SCORE: float = 0.3
+    HYBRID_RETRIEVAL: bool = False
+    HYBRID_VECTOR_WEIGHT: float = 1.0
+    HYBRID_LEXICAL_WEIGHT: float = 1.0
+    CHAT_CONTEXT_K: int = 5
+    CHAT_HISTORY_TOKENS: int = 2000
+    CHAT_CONTEXT_TOKENS: int = 3000
     
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
         case_sensitive = False
+        extra = "forbid"
 
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,20 @@
+from pydantic_settings import BaseSettings
+
+
+class WebSettings(BaseSettings):
+    """
+    Settings of the Streamlit app, read from the same .env file.
+
+    Kept apart from ``Settings`` so the web process does not need the
+    pipeline's API keys; ``Settings`` extends it, so one .env serves both.
+    """
+    WEB_CACHE_TTL_SECONDS: int = 300
+
+    class Config:
+        env_file = ".env"
+        env_file_encoding = "utf-8"
+        case_sensitive = False
+        # The pipeline's settings share the file
+        extra = "ignore"
+
+web_settings = WebSettings()
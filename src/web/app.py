@@ -6,7 +6,7 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from backend.service import get_articles, get_sources, get_article
+from web.data import load_articles, load_sources, load_article, load_related_articles
 
 # Constants
 ITEMS_PER_PAGE = 10
@@ -21,7 +21,7 @@ def get_filtered_articles(
 ) -> List[Dict]:
     """Get filtered articles from DataStore with pagination"""
     
-    return get_articles(
+    return load_articles(
         sources=sources,
         keywords=keywords,
         from_date=from_date.isoformat() if from_date else None,
@@ -32,13 +32,17 @@ def get_filtered_articles(
 
 def show_article_detail(article_id: int):
     """Show detailed view of a single article"""
-    article = get_article(article_id)
+    article = load_article(article_id)
     if not article:
         st.error("Article not found")
         return
     
     st.title(article['title'])
+    if article.get('translated_title'):
+        st.subheader(article['translated_title'])
     st.caption(f"Published on {article['published_at']} | Source: {article['source']}")
+    if article.get('triage_route') == 'light':
+        st.info("Triaged as low priority: only the title was translated, no full analysis")
     
     st.markdown("---")
     st.subheader("Content")
@@ -59,10 +63,46 @@ def show_article_detail(article_id: int):
         st.subheader("Keywords")
         st.write(", ".join(article['keywords']))
     
+    related = load_related_articles(article_id)
+    if related:
+        st.markdown("---")
+        st.subheader("Related Coverage")
+        for item in related:
+            if st.button(f"{item['title']} ({item['source']}, {item['published_at'][:10]})", key=f"related_{item['id']}"):
+                st.session_state['article_id'] = item['id']
+                st.rerun()
+    
     st.markdown("---")
     if st.button("Back to News List"):
         st.session_state['view'] = 'list'
 
+def show_chat():
+    """Chat about the stored news, streaming answers as they are generated"""
+    # Loads the LLM and vector stacks, so it is only imported for this view
+    from web.chat import get_news_chat, get_chat_session, reset_chat_session
+
+    st.title("News Chat")
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        if st.button("Back to News List"):
+            st.session_state['view'] = 'list'
+            st.rerun()
+    with col2:
+        if st.button("New Conversation"):
+            reset_chat_session()
+
+    session = get_chat_session()
+    for role, content in session.transcript:
+        with st.chat_message(role):
+            st.markdown(content)
+
+    question = st.chat_input("Ask about the news")
+    if question:
+        with st.chat_message("user"):
+            st.markdown(question)
+        with st.chat_message("assistant"):
+            st.write_stream(get_news_chat().stream(session, question))
+
 def main():
     st.set_page_config(page_title="News Explorer", layout="wide")
     
@@ -72,7 +112,13 @@ def main():
     if 'article_id' not in st.session_state:
         st.session_state['article_id'] = None
     
+    if st.sidebar.button("News Chat"):
+        st.session_state['view'] = 'chat'
+
     # Show appropriate view based on state
+    if st.session_state['view'] == 'chat':
+        show_chat()
+        return
     if st.session_state['view'] == 'detail' and st.session_state['article_id']:
         show_article_detail(st.session_state['article_id'])
         return
@@ -91,7 +137,7 @@ def main():
         source_col, keyword_col, date_col = st.columns(3) # Three columns for the three filters
 
         with source_col:
-            all_sources = get_sources()
+            all_sources = load_sources()
             selected_sources = st.multiselect(
                 "Select Sources",
                 options=[s['id'] for s in all_sources],
@@ -138,7 +184,10 @@ def main():
                 col1, col2 = st.columns([4, 1])
                 with col1:
                     st.subheader(article['title'])
-                    st.caption(f"Source: {article['source']['name']} | Published: {article['published_at']}")
+                    if article.get('translated_title'):
+                        st.markdown(article['translated_title'])
+                    route = " | Title only" if article.get('triage_route') == 'light' else ""
+                    st.caption(f"Source: {article['source']['name']} | Published: {article['published_at']}{route}")
                 with col2:
                     if st.button("View Details", key=f"view_{article['id']}"):
                         st.session_state['view'] = 'detail'
@@ -0,0 +1,28 @@
+"""
+Streamlit glue for the news chat.
+
+Unlike ``web.data``, this loads the LLM and vector stacks, so the app only
+imports it once the chat view is opened.
+"""
+import streamlit as st
+
+from backend.chat import ChatSession, NewsChat
+from backend.service import create_news_chat
+
+
+@st.cache_resource
+def get_news_chat() -> NewsChat:
+    """One chat engine, and its stores and lexical index, shared by all sessions"""
+    return create_news_chat()
+
+
+def get_chat_session() -> ChatSession:
+    """The conversation of the current browser session"""
+    if 'chat_session' not in st.session_state:
+        st.session_state['chat_session'] = ChatSession()
+    return st.session_state['chat_session']
+
+
+def reset_chat_session() -> None:
+    """Start a new conversation, dropping its history and cached context"""
+    st.session_state['chat_session'] = ChatSession()
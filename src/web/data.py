@@ -0,0 +1,96 @@
+"""
+Cached data access for the Streamlit app.
+
+Streamlit reruns the whole script on every widget interaction. The
+DataStore is shared across sessions as a resource, and query results are
+cached with a TTL. Every cache is keyed by the DataStore generation marker,
+which the ingest pipeline bumps on each write, so reruns are served from
+memory until new data lands.
+
+Only ``backend.queries`` and the light ``WebSettings`` are imported, so the
+web process never loads the LLM or vector stacks or needs their API keys.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import streamlit as st
+
+from backend.data_store import DataStore
+from backend.queries import get_articles, get_sources, get_article, get_related_articles
+from config.web_settings import web_settings
+
+
+CACHE_TTL_SECONDS = web_settings.WEB_CACHE_TTL_SECONDS
+
+
+@st.cache_resource
+def get_data_store() -> DataStore:
+    """One DataStore, and its connection pool, shared by all sessions"""
+    return DataStore()
+
+
+def current_generation() -> int:
+    """Generation of the stored data, read from the marker file rather than SQLite"""
+    return get_data_store().generation()
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=16, show_spinner=False)
+def _cached_sources(generation: int) -> List[Dict]:
+    return get_sources()
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=512, show_spinner=False)
+def _cached_articles(
+    generation: int,
+    sources: Tuple[str, ...],
+    keywords: str,
+    from_date: Optional[str],
+    to_date: Optional[str],
+    page: int,
+    page_size: int
+) -> List[Dict]:
+    return get_articles(
+        sources=list(sources),
+        keywords=keywords,
+        from_date=from_date,
+        to_date=to_date,
+        page=page,
+        page_size=page_size,
+        data_store=get_data_store()
+    )
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=1024, show_spinner=False)
+def _cached_article(generation: int, article_id: int) -> Optional[Dict]:
+    return get_article(article_id, data_store=get_data_store())
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=1024, show_spinner=False)
+def _cached_related_articles(generation: int, article_id: int, limit: int) -> List[Dict]:
+    return get_related_articles(article_id, limit=limit, data_store=get_data_store())
+
+
+def load_sources() -> List[Dict]:
+    """Source facet for the filter widgets"""
+    return _cached_sources(current_generation())
+
+
+def load_articles(
+    sources: List[str],
+    keywords: str,
+    from_date: Optional[str],
+    to_date: Optional[str],
+    page: int,
+    page_size: int
+) -> List[Dict]:
+    """One page of the filtered article list"""
+    return _cached_articles(current_generation(), tuple(sorted(sources)), keywords, from_date, to_date, page, page_size)
+
+
+def load_article(article_id: int) -> Optional[Dict]:
+    """A single article for the detail view"""
+    return _cached_article(current_generation(), article_id)
+
+
+def load_related_articles(article_id: int, limit: int = 5) -> List[Dict]:
+    """Precomputed related coverage for the detail view"""
+    return _cached_related_articles(current_generation(), article_id, limit)
@@ -1,6 +1,11 @@
+import hashlib
 import sys
 import os
+
+import numpy as np
 import pytest
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
 
 # Add the project root directory to the Python path before any tests are imported.
 # This ensures that imports like 'from src.backend...' work correctly.
@@ -9,4 +14,59 @@ sys.path.insert(0, project_root)
 
 # You can also define shared fixtures here later if needed.
 # For example, the db_fixture could potentially be moved here
-# if multiple test files need the same database setup.
\ No newline at end of file
+# if multiple test files need the same database setup.
+
+
+def fake_llm(*answers):
+    """Helper function building a fake chat model giving the answers in turn."""
+    return GenericFakeChatModel(messages=iter([AIMessage(content=answer) for answer in answers]))
+
+
+class FakeEmbeddingFunction:
+    """Deterministic bag-of-words embedding function that needs no model download."""
+
+    def __init__(self, dim: int = 64):
+        self.dim = dim
+        self.calls = 0
+        self.embedded = 0
+
+    def __call__(self, input):
+        self.calls += 1
+        self.embedded += len(input)
+        vectors = []
+        for text in input:
+            vector = np.zeros(self.dim, dtype=np.float32)
+            for word in text.lower().split():
+                vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % self.dim] += 1.0
+            vector[0] += 0.01  # never all zeros, cosine needs a norm
+            vectors.append(vector)
+        return vectors
+
+    def embed_query(self, input):
+        return self(input)
+
+    @staticmethod
+    def name():
+        return "fake"
+
+    def get_config(self):
+        return {"dim": self.dim}
+
+    @staticmethod
+    def build_from_config(config):
+        return FakeEmbeddingFunction(**config)
+
+    def is_legacy(self):
+        return False
+
+    def default_space(self):
+        return "cosine"
+
+    def supported_spaces(self):
+        return ["cosine", "l2", "ip"]
+
+
+@pytest.fixture
+def fake_embedding_function():
+    """Offline embedding function shared by the vector store tests."""
+    return FakeEmbeddingFunction()
@@ -0,0 +1,109 @@
+import json
+from collections import deque
+from datetime import datetime
+
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from src.backend.batching import ARTICLE_OVERHEAD_TOKENS, BatchAnalyzer
+from src.backend.data_store import DataStore
+from src.backend.usage import UsageLedger
+
+
+def item(article_id, **overrides):
+    """Helper function building a valid response item."""
+    return {"id": article_id, "title": "标题", "content": "内容", "analysis": "分析", "keywords": ["k"], **overrides}
+
+def analyzer(*responses, **kwargs):
+    """Helper function building a batch analyzer over a fake model answering with the given JSON values."""
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content=json.dumps(r)) for r in responses]))
+    return BatchAnalyzer(llm, **kwargs)
+
+def articles(count, words=10):
+    return [{"id": i, "source": "cnn", "content": "word " * words, "context": "[]"} for i in range(1, count + 1)]
+
+def test_batches_are_packed_by_size_and_tokens():
+    """Test batches respect the size limit and the token budget, but always take one article."""
+    queue = deque(articles(5))
+    per_article = BatchAnalyzer.article_tokens(queue[0])
+    assert per_article > ARTICLE_OVERHEAD_TOKENS
+
+    batcher = analyzer(max_batch_size=3, token_budget=10_000)
+    assert [len(batcher.next_batch(queue)) for _ in range(2)] == [3, 2]
+
+    batcher = analyzer(max_batch_size=8, token_budget=2 * per_article)
+    queue = deque(articles(5))
+    assert [a["id"] for a in batcher.next_batch(queue)] == [1, 2]
+
+    batcher = analyzer(max_batch_size=8, token_budget=1)
+    assert len(batcher.next_batch(deque(articles(2)))) == 1
+
+def test_validate_matches_items_by_id():
+    """Test wrapped arrays, string IDs and dropping malformed, unknown and duplicate items."""
+    batch = articles(5)
+    output = {"articles": [
+        item("1"),
+        item(2, analysis=""),
+        item(3, keywords="k1, k2"),
+        item(9),
+        item(4),
+        item(4, title="dup"),
+        "junk",
+    ]}
+
+    results = BatchAnalyzer.validate(output, batch)
+    assert set(results) == {1, 4}
+    assert results[4]["title"] == "标题"
+    assert set(BatchAnalyzer.validate(item(5), batch)) == {5}
+    assert BatchAnalyzer.validate(None, batch) == {}
+
+def test_analyze_adapts_batch_size():
+    """Test the batch size shrinks after incomplete responses and grows back after complete ones."""
+    batch = articles(4)
+    batcher = analyzer(
+        [item(1), item(2), item(3), item(4)],
+        [item(1), item(2), item(3)],
+        [item(1)],
+        [item(1), item(2)],
+        max_batch_size=4,
+    )
+
+    assert set(batcher.analyze(batch)) == {1, 2, 3, 4}
+    assert batcher.batch_size == 4
+    assert set(batcher.analyze(batch)) == {1, 2, 3}
+    assert batcher.batch_size == 3
+    assert set(batcher.analyze(batch)) == {1}
+    assert batcher.batch_size == 2
+    assert set(batcher.analyze(batch[:2])) == {1, 2}
+    assert batcher.batch_size == 3
+
+def test_unparseable_response_is_empty():
+    """Test a response that is not JSON yields no results instead of failing the run."""
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content="not json at all")]))
+    batcher = BatchAnalyzer(llm, max_batch_size=4)
+
+    assert batcher.analyze(articles(4)) == {}
+    assert batcher.batch_size == 2
+
+def test_ledger_splits_batched_calls():
+    """Test a call covering several articles is recorded per article with the tokens split."""
+    store = DataStore(db_path=DataStore.MEMORY)
+    for source in ("bbc-news", "cnn", "cnn"):
+        store.save_news({
+            'title': 'title',
+            'source': source,
+            'published_at': datetime(2025, 1, 1).isoformat(),
+            'content': 'content',
+        })
+    ledger = UsageLedger(store)
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content="answer", usage_metadata={
+        "input_tokens": 100, "output_tokens": 31, "total_tokens": 131,
+    })]))
+
+    llm.invoke("batch", config={"callbacks": [ledger], "metadata": {"article_ids": [1, 2, 3]}})
+
+    assert ledger.stats()["prompt_tokens"] == 100
+    by_source = {row['key']: row for row in store.get_usage_rollup(group_by="source")}
+    assert (by_source["bbc-news"]["prompt_tokens"], by_source["bbc-news"]["completion_tokens"]) == (34, 11)
+    assert (by_source["cnn"]["prompt_tokens"], by_source["cnn"]["completion_tokens"]) == (66, 20)
+    store.close()
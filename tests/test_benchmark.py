@@ -0,0 +1,34 @@
+import numpy as np
+
+from src.backend.benchmark import (
+    HashingEmbeddingFunction, benchmark_vector_store, exact_top_k, synthetic_corpus
+)
+from src.backend.vector_store import VectorStore
+
+
+def test_synthetic_corpus_is_reproducible():
+    """Test the corpus is deterministic and carries chunk metadata."""
+    first = synthetic_corpus(8, chunks_per_article=4)
+    second = synthetic_corpus(8, chunks_per_article=4)
+
+    assert [doc.page_content for doc in first] == [doc.page_content for doc in second]
+    assert [doc.metadata["article_id"] for doc in first] == [0, 0, 0, 0, 1, 1, 1, 1]
+
+def test_exact_top_k():
+    """Test brute-force search returns the best matches in order."""
+    vectors = np.array([[1.0, 0.0], [0.0, 1.0], [0.8, 0.6]], dtype=np.float32)
+    assert exact_top_k(vectors, np.array([1.0, 0.0], dtype=np.float32), 2) == [0, 2]
+
+def test_benchmark_vector_store_report(tmp_path):
+    """Test a small benchmark run produces one comparable result per size."""
+    def make_store(directory):
+        return VectorStore(persist_directory=directory, embedding_function=HashingEmbeddingFunction(dim=32))
+
+    report = benchmark_vector_store(make_store, [200, 100], queries=5, k=5, batch_size=50)
+
+    assert report["config"]["sizes"] == [100, 200]
+    assert [result["size"] for result in report["results"]] == [100, 200]
+    for result in report["results"]:
+        assert 0.0 <= result["recall_at_5"] <= 1.0
+        assert result["ann_query"]["p99_ms"] >= result["ann_query"]["p50_ms"]
+        assert result["disk_bytes"] > 0
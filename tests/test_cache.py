@@ -0,0 +1,21 @@
+from src.backend.cache import LRUCache
+
+
+def test_lru_cache_hits_and_eviction():
+    """Test least recently used entries are evicted and hits are counted."""
+    cache = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats() == {"size": 2, "hits": 2, "misses": 1, "hit_ratio": 0.6667}
+
+def test_lru_cache_disabled():
+    """Test a zero-sized cache never stores anything."""
+    cache = LRUCache(max_size=0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
@@ -0,0 +1,99 @@
+from datetime import datetime
+
+import pytest
+
+from conftest import fake_llm
+from src.backend.chat import ChatSession, NewsChat, content_terms, estimate_tokens
+from src.backend.data_store import DataStore
+
+
+class RecordingRetriever:
+    """Retriever stand-in returning one chunk per stored article and recording queries."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.queries = []
+
+    def similarity_search(self, query, k=5, **kwargs):
+        self.queries.append(query)
+        return self.chunks[:k]
+
+
+@pytest.fixture(scope="function")
+def chat_parts():
+    """In-memory data store with two articles and a retriever over their chunks."""
+    db = DataStore(db_path=DataStore.MEMORY)
+    chunks = []
+    for i, text in enumerate([
+        "Central bank raises interest rates to fight inflation",
+        "Tesla earnings beat expectations on record deliveries",
+    ]):
+        article_id = db.save_news({
+            'title': f'Title {i}',
+            'source': 'bbc-news',
+            'published_at': datetime(2025, 1, i + 1).isoformat(),
+            'content': text,
+        })
+        chunks.append({"id": f"{article_id}:0", "content": text, "metadata": {"article_id": article_id}, "distance": 0.1})
+    yield db, RecordingRetriever(chunks)
+    db.close()
+
+def test_stream_yields_tokens_and_records_history(chat_parts):
+    """Test answers arrive in several chunks and the exchange is kept."""
+    db, retriever = chat_parts
+    chat = NewsChat(fake_llm("Rates went up to curb inflation."), db, retriever)
+    session = ChatSession()
+
+    chunks = list(chat.stream(session, "Why did the central bank raise interest rates?"))
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == "Rates went up to curb inflation."
+    assert [message.content for message in session.history] == [
+        "Why did the central bank raise interest rates?",
+        "Rates went up to curb inflation.",
+    ]
+    assert session.transcript[-1] == ("assistant", "Rates went up to curb inflation.")
+    assert [chunk["title"] for chunk in session.context.values()] == ["Title 0", "Title 1"]
+
+def test_follow_up_reuses_cached_context(chat_parts):
+    """Test follow-ups covered by the cached context skip the retriever."""
+    db, retriever = chat_parts
+    chat = NewsChat(fake_llm("a", "b", "c"), db, retriever, k=1)
+    session = ChatSession()
+
+    chat.ask(session, "What happened with interest rates?")
+    chat.ask(session, "Why does that matter for inflation?")
+    assert len(retriever.queries) == 1
+
+    # A new subject is retrieved and added to the cache
+    chat.ask(session, "And Tesla deliveries?")
+    assert len(retriever.queries) == 2
+    assert session.retrievals == 2
+
+def test_history_stays_within_budget(chat_parts):
+    """Test the oldest exchanges are dropped once the history exceeds its budget."""
+    db, retriever = chat_parts
+    answer = "word " * 40
+    chat = NewsChat(fake_llm(answer, answer, answer), db, retriever, history_tokens=80)
+    session = ChatSession()
+
+    for question in ["first interest question", "second interest question", "third interest question"]:
+        chat.ask(session, question)
+
+    assert sum(estimate_tokens(message.content) for message in session.history) <= 80
+    assert session.history[0].content == "third interest question"
+    assert len(session.transcript) == 6
+
+def test_context_stays_within_budget(chat_parts):
+    """Test the cached context is trimmed oldest first."""
+    db, retriever = chat_parts
+    chat = NewsChat(fake_llm("a"), db, retriever, context_tokens=45)
+    session = ChatSession()
+
+    chat.ask(session, "interest rates")
+    assert list(session.context) == [retriever.chunks[1]["id"]]
+
+def test_content_terms():
+    """Test filler words are ignored and CJK text is split into bigrams."""
+    assert content_terms("What about Tesla?") == {"tesla"}
+    assert content_terms("美联储加息") == {"美联", "联储", "储加", "加息"}
@@ -1,5 +1,4 @@
 import pytest
-import os
 from datetime import datetime, timedelta
 from typing import Dict, List
 
@@ -7,30 +6,12 @@ from typing import Dict, List
 from src.backend.data_store import DataStore, Base, NewsArticle
 from src.backend.exceptions import AppException
 
-TEST_DB_PATH = "test_news.db"
-
 @pytest.fixture(scope="function")
 def db_fixture():
-    """Fixture to set up and tear down a test database for each test function."""
-    # Ensure a clean state before the test
-    if os.path.exists(TEST_DB_PATH):
-        os.remove(TEST_DB_PATH)
-        
-    # Use an in-memory database for faster tests, or a file for inspection
-    # db_path = ":memory:" 
-    db_path = TEST_DB_PATH
-    data_store = DataStore(db_path=db_path)
-    
-    # Yield the DataStore instance to the test function
+    """Fixture providing a fresh in-memory database for each test function."""
+    data_store = DataStore(db_path=DataStore.MEMORY)
     yield data_store
-    
-    # Teardown: Close connection (implicitly handled by SQLAlchemy session scope) 
-    # and remove the test database file if it exists
-    if os.path.exists(TEST_DB_PATH):
-        # Ensure the session is closed before removing the file if needed,
-        # though sessionmaker usually handles this.
-        # For extra safety: data_store.Session.close_all() 
-        os.remove(TEST_DB_PATH)
+    data_store.close()
 
 def create_sample_news(offset_days: int = 0) -> Dict:
     """Helper function to create sample news data."""
@@ -47,7 +28,7 @@ def create_sample_news(offset_days: int = 0) -> Dict:
 
 def test_init_db(db_fixture: DataStore):
     """Test if the database and table are created."""
-    assert os.path.exists(TEST_DB_PATH) or db_fixture.db_path == "sqlite:///:memory:"
+    assert db_fixture.db_path == "sqlite:///:memory:"
     # Check if the table exists using SQLAlchemy's inspect
     from sqlalchemy import inspect
     inspector = inspect(db_fixture.engine)
@@ -165,4 +146,64 @@ def test_get_recent_news_empty(db_fixture: DataStore):
     """Test retrieving recent news when the database is empty."""
     recent_news = db_fixture.get_recent_news()
     assert isinstance(recent_news, list)
-    assert len(recent_news) == 0
\ No newline at end of file
+    assert len(recent_news) == 0
+
+def test_in_memory_databases_are_isolated(db_fixture: DataStore):
+    """Test each in-memory DataStore has its own database."""
+    article_id = db_fixture.save_news(create_sample_news())
+    other = DataStore(db_path=DataStore.MEMORY)
+
+    assert other.get_news(article_id) is None
+    assert db_fixture.get_news(article_id) is not None
+    other.close()
+
+def test_generation_changes_on_writes(tmp_path):
+    """Test every write bumps the generation marker seen by other instances."""
+    writer = DataStore(db_path=str(tmp_path / "news.db"))
+    reader = DataStore(db_path=str(tmp_path / "news.db"))
+    assert reader.generation() == 0
+
+    article_id = writer.save_news(create_sample_news())
+    after_save = reader.generation()
+    assert after_save != 0
+
+    writer.save_analysis(article_id, "analysis", ["key"])
+    assert reader.generation() != after_save
+
+def test_get_news_batch(db_fixture: DataStore):
+    """Test several articles are fetched by ID in one call."""
+    news_ids = [db_fixture.save_news(create_sample_news(i)) for i in range(3)]
+
+    articles = db_fixture.get_news_batch([news_ids[0], news_ids[2], news_ids[2], 999])
+
+    assert set(articles) == {news_ids[0], news_ids[2]}
+    assert articles[news_ids[2]]['title'] == 'Test Title 2'
+    assert db_fixture.get_news_batch([]) == {}
+
+def test_link_story(db_fixture: DataStore):
+    """Test duplicates are linked to their story representative."""
+    representative_id = db_fixture.save_news(create_sample_news())
+    duplicate_ids = [db_fixture.save_news(create_sample_news(i)) for i in (1, 2)]
+
+    for duplicate_id in duplicate_ids:
+        db_fixture.link_story(duplicate_id, representative_id, 0.9)
+    # Re-linking is idempotent
+    db_fixture.link_story(duplicate_ids[0], representative_id, 0.95)
+
+    assert db_fixture.get_story_duplicates(representative_id) == duplicate_ids
+    assert db_fixture.get_story_duplicates(duplicate_ids[0]) == []
+
+def test_related_articles(db_fixture: DataStore):
+    """Test related lists are replaced, merged up to the limit and joined with titles."""
+    ids = [db_fixture.save_news(create_sample_news(i)) for i in range(4)]
+
+    db_fixture.save_related_articles(ids[0], [(ids[1], 0.8), (ids[2], 0.5)])
+    assert [(item['id'], item['score']) for item in db_fixture.get_related_articles(ids[0])] == [(ids[1], 0.8), (ids[2], 0.5)]
+
+    assert db_fixture.add_related_article(ids[0], ids[3], 0.6, limit=2)
+    assert [item['id'] for item in db_fixture.get_related_articles(ids[0])] == [ids[1], ids[3]]
+    # A weaker candidate leaves the full list unchanged
+    assert not db_fixture.add_related_article(ids[0], ids[2], 0.1, limit=2)
+
+    db_fixture.save_related_articles(ids[0], [])
+    assert db_fixture.get_related_articles(ids[0]) == []
@@ -0,0 +1,46 @@
+from src.backend.dedup import StoryClusterer, normalize_text, shingles
+
+
+STORY = (
+    "Flooding forces thousands from their homes. Heavy rain has caused severe flooding across "
+    "the north of the country, forcing thousands of residents to leave their homes as rivers "
+    "burst their banks and emergency services warned of further downpours overnight"
+)
+SYNDICATED = (
+    "Flooding forces thousands from homes. Heavy rain has caused severe flooding across "
+    "the north of the country, forcing thousands of residents to leave their homes as rivers "
+    "burst their banks and emergency services warned of more downpours overnight [+2315 chars]"
+)
+OTHER = (
+    "Central bank holds interest rates. The central bank kept its main interest rate unchanged "
+    "on Thursday, saying inflation was falling but remained above its target for now"
+)
+
+def test_normalize_text_drops_markers_and_punctuation():
+    """Test normalization removes NewsAPI truncation markers and punctuation."""
+    assert normalize_text("Hello, World! [+120 chars]") == "hello world"
+
+def test_shingles_short_text():
+    """Test texts shorter than a shingle fall back to their words."""
+    assert shingles("two words") == {"two", "words"}
+
+def test_syndicated_copy_matches_representative():
+    """Test a lightly edited copy is matched to the original story."""
+    clusterer = StoryClusterer(threshold=0.6)
+    clusterer.add(1, STORY)
+    clusterer.add(2, OTHER)
+
+    representative_id, similarity = clusterer.match(SYNDICATED)
+    assert representative_id == 1
+    assert similarity >= 0.6
+
+def test_unrelated_story_does_not_match():
+    """Test a different story starts its own cluster."""
+    clusterer = StoryClusterer(threshold=0.6)
+    clusterer.add(1, STORY)
+
+    assert clusterer.match(OTHER) == (None, 0.0)
+
+def test_band_layout_tracks_threshold():
+    """Test stricter thresholds use more rows per band."""
+    assert StoryClusterer(threshold=0.9).rows > StoryClusterer(threshold=0.5).rows
@@ -0,0 +1,89 @@
+import json
+from datetime import date, datetime
+
+import pytest
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from src.backend.data_store import DataStore
+from src.backend.digest import DigestBuilder
+
+
+def fake_llm():
+    """Helper function building a fake chat model with an endless supply of numbered summaries."""
+    return GenericFakeChatModel(messages=iter([AIMessage(content=f"summary {i}") for i in range(100)]))
+
+@pytest.fixture(scope="function")
+def db():
+    store = DataStore(db_path=DataStore.MEMORY)
+    yield store
+    store.close()
+
+def add_article(db, source, day=1, analyzed=True):
+    article_id = db.save_news({
+        'title': f'{source} title',
+        'source': source,
+        'published_at': datetime(2025, 1, day, 12).isoformat(),
+        'content': 'content',
+    })
+    if analyzed:
+        db.save_analysis(article_id, f'analysis {article_id}', ['k'])
+    return article_id
+
+def test_digest_map_reduce(db):
+    """Test the day's analyses are summarized per source chunk and reduced into a briefing."""
+    for _ in range(3):
+        add_article(db, "bbc-news")
+    add_article(db, "cnn")
+    add_article(db, "cnn", analyzed=False)
+    add_article(db, "cnn", day=2)
+
+    builder = DigestBuilder(fake_llm(), db, chunk_size=2)
+    digest = builder.build(date(2025, 1, 1))
+
+    assert digest["articles"] == 4
+    assert [entry["source"] for entry in digest["sources"]] == ["bbc-news", "cnn"]
+    assert [len(entry["summaries"]) for entry in digest["sources"]] == [2, 1]
+    assert digest["stats"] == {"map": 3, "reduce": 1, "cached": 0}
+    assert digest["briefing"] == "summary 3"
+
+def test_rerun_only_summarizes_new_articles(db):
+    """Test a re-run reuses cached summaries, and new articles only redo their chunk and the reduce."""
+    for _ in range(3):
+        add_article(db, "bbc-news")
+    add_article(db, "cnn")
+    builder = DigestBuilder(fake_llm(), db, chunk_size=2)
+    first = builder.build(date(2025, 1, 1))
+
+    assert builder.build(date(2025, 1, 1))["stats"] == {"map": 0, "reduce": 0, "cached": 4}
+
+    add_article(db, "bbc-news")
+    digest = builder.build(date(2025, 1, 1))
+    assert digest["stats"] == {"map": 1, "reduce": 1, "cached": 2}
+    assert digest["sources"][0]["summaries"][0] == first["sources"][0]["summaries"][0]
+    assert digest["sources"][0]["summaries"][1] != first["sources"][0]["summaries"][1]
+
+def test_hierarchical_reduce(db):
+    """Test more partial summaries than the fanout are reduced in rounds."""
+    for source in ("a", "b", "c", "d", "e"):
+        add_article(db, source)
+
+    digest = DigestBuilder(fake_llm(), db, reduce_fanout=2).build(date(2025, 1, 1))
+
+    # 5 partials -> 3 (the odd one passes through) -> 2 -> briefing
+    assert digest["stats"] == {"map": 5, "reduce": 2 + 1 + 1, "cached": 0}
+
+def test_digest_is_written(db, tmp_path):
+    """Test Markdown and JSON reports are written, also for a day without articles."""
+    add_article(db, "bbc-news")
+    builder = DigestBuilder(fake_llm(), db)
+
+    paths = builder.write(builder.build(date(2025, 1, 1)), tmp_path)
+    assert json.loads(paths["json"].read_text(encoding="utf-8"))["briefing"] == "summary 1"
+    markdown = paths["markdown"].read_text(encoding="utf-8")
+    assert markdown.startswith("# Daily Digest 2025-01-01")
+    assert "### bbc-news" in markdown and "(#1)" in markdown
+
+    empty = builder.build(date(2025, 2, 1))
+    assert empty["briefing"] is None and empty["stats"]["map"] == 0
+    assert "No analyzed articles." in builder.to_markdown(empty)
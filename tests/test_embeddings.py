@@ -0,0 +1,153 @@
+import numpy as np
+import pytest
+
+from types import SimpleNamespace
+
+from src.backend.embeddings import EmbeddingCache, CachedEmbeddingFunction, LocalEmbeddingFunction, cache_key
+
+
+@pytest.fixture(scope="function")
+def cache_fixture(tmp_path):
+    """Fixture providing a small embedding cache in a temporary directory."""
+    return EmbeddingCache(cache_dir=tmp_path / "cache", max_entries=4)
+
+def test_cache_put_and_get(cache_fixture: EmbeddingCache):
+    """Test stored vectors are returned for their keys."""
+    cache_fixture.put_many({"a": np.ones(3), "b": np.zeros(3)})
+
+    found = cache_fixture.get_many(["a", "b", "c"])
+    assert set(found) == {"a", "b"}
+    np.testing.assert_array_equal(found["a"], np.ones(3))
+    assert cache_fixture.hits == 2
+    assert cache_fixture.misses == 1
+
+def test_cache_persists(tmp_path):
+    """Test cached vectors survive reopening the cache."""
+    EmbeddingCache(cache_dir=tmp_path, max_entries=4).put_many({"a": np.arange(3)})
+
+    reopened = EmbeddingCache(cache_dir=tmp_path, max_entries=4)
+    np.testing.assert_array_equal(reopened.get_many(["a"])["a"], np.arange(3))
+
+def test_in_memory_cache_is_removed_on_close():
+    """Test an in-memory cache works from a temporary directory deleted on close."""
+    cache = EmbeddingCache(cache_dir=EmbeddingCache.MEMORY, max_entries=4)
+    cache.put_many({"a": np.arange(3)})
+    np.testing.assert_array_equal(cache.get_many(["a"])["a"], np.arange(3))
+
+    cache.close()
+    assert not cache.cache_dir.exists()
+
+def test_cache_evicts_least_recently_used(cache_fixture: EmbeddingCache):
+    """Test the cache stays bounded and evicts the least recently used keys."""
+    cache_fixture.put_many({key: np.ones(2) for key in "abcd"})
+    cache_fixture.get_many(["a"])
+    cache_fixture.put_many({"e": np.ones(2), "f": np.ones(2)})
+
+    assert len(cache_fixture) == 4
+    assert set(cache_fixture.get_many(list("abcdef"))) == {"a", "d", "e", "f"}
+
+def test_cached_embedding_function_reuses_vectors(cache_fixture, fake_embedding_function):
+    """Test repeated texts are embedded only once."""
+    embed = CachedEmbeddingFunction(fake_embedding_function, cache_fixture)
+
+    first = embed(["hello world", "news today"])
+    second = embed(["news today", "hello world", "hello world"])
+
+    assert fake_embedding_function.embedded == 2
+    np.testing.assert_allclose(second[1], first[0])
+    assert embed.name() == fake_embedding_function.name()
+
+def test_cache_key_is_scoped_to_model():
+    """Test the same text gets different keys for different models."""
+    assert cache_key("model-a", "text") != cache_key("model-b", "text")
+
+def test_cache_is_scoped_to_precision(cache_fixture):
+    """Test vectors cached at one precision are not served at another."""
+    class Engine:
+        def __init__(self, precision):
+            self.local = LocalEmbeddingFunction(precision=precision)
+            self.embedded = 0
+
+        def __call__(self, input):
+            self.embedded += len(input)
+            return [np.full(4, 0.5, dtype=np.float32) for _ in input]
+
+        def name(self):
+            return self.local.name()
+
+        def cache_scope(self):
+            return self.local.cache_scope()
+
+    float32, int8 = Engine("float32"), Engine("int8")
+    assert float32.name() == int8.name()
+
+    CachedEmbeddingFunction(float32, cache_fixture)(["text"])
+    CachedEmbeddingFunction(int8, cache_fixture)(["text"])
+    CachedEmbeddingFunction(float32, cache_fixture)(["text"])
+
+    assert (float32.embedded, int8.embedded) == (1, 1)
+
+
+class StubTokenizer:
+    """Tokenizer stand-in padding each batch to its longest text."""
+
+    def encode_batch(self, texts):
+        longest = max(len(text.split()) for text in texts)
+        encoded = []
+        for text in texts:
+            ids = [len(word) for word in text.split()]
+            padding = longest - len(ids)
+            encoded.append(SimpleNamespace(ids=ids + [0] * padding, attention_mask=[1] * len(ids) + [0] * padding))
+        return encoded
+
+
+class StubSession:
+    """ONNX session stand-in whose hidden states are the token ids."""
+
+    def __init__(self):
+        self.batch_shapes = []
+
+    def run(self, _, inputs):
+        ids = inputs["input_ids"].astype(np.float32)
+        self.batch_shapes.append(ids.shape)
+        return [np.stack([ids, np.ones_like(ids)], axis=-1)]
+
+
+@pytest.fixture
+def local_embedding_function():
+    """LocalEmbeddingFunction wired to stub model components."""
+    embed = LocalEmbeddingFunction(batch_size=2)
+    embed._tokenizer = StubTokenizer()
+    embed._session = StubSession()
+    return embed
+
+def test_local_embedding_batches_by_length(local_embedding_function):
+    """Test texts are batched by length and returned in input order."""
+    texts = ["a b c d", "a", "a b c", "ab"]
+    vectors = local_embedding_function(texts)
+
+    assert local_embedding_function._session.batch_shapes == [(2, 1), (2, 4)]
+    assert len(vectors) == 4
+    for vector in vectors:
+        assert np.linalg.norm(vector) == pytest.approx(1.0)
+    # "ab" has a longer token than "a", so its first component is larger
+    assert vectors[3][0] > vectors[1][0]
+
+def test_local_embedding_quantization(local_embedding_function):
+    """Test int8 output preserves direction and float16 output halves storage."""
+    local_embedding_function.precision = "int8"
+    quantized = local_embedding_function(["abc de"])[0]
+    assert quantized.dtype == np.int8
+
+    local_embedding_function.precision = "float32"
+    exact = local_embedding_function(["abc de"])[0]
+    cosine = np.dot(exact, quantized) / np.linalg.norm(quantized)
+    assert cosine == pytest.approx(1.0, abs=1e-3)
+
+    local_embedding_function.precision = "float16"
+    assert local_embedding_function(["abc de"])[0].dtype == np.float16
+
+def test_local_embedding_rejects_unknown_precision():
+    """Test an unsupported precision is rejected up front."""
+    with pytest.raises(ValueError):
+        LocalEmbeddingFunction(precision="int4")
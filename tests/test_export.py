@@ -0,0 +1,85 @@
+import json
+import sys
+from datetime import datetime
+
+import pytest
+
+from src.backend.data_store import DataStore
+from src.backend.exceptions import AppException
+from src.backend.export import export_news
+
+
+@pytest.fixture(scope="function")
+def db():
+    """In-memory data store with 25 articles, one per day of January, every other one analyzed."""
+    store = DataStore(db_path=DataStore.MEMORY)
+    for day in range(1, 26):
+        article_id = store.save_news({
+            'title': f'title {day}',
+            'source': 'bbc-news',
+            'published_at': datetime(2025, 1, day).isoformat(),
+            'content': f'content {day}',
+        })
+        if day % 2:
+            store.save_analysis(article_id, f'分析 {day}', ['k1', 'k2'])
+    yield store
+    store.close()
+
+def test_news_is_streamed_in_chunks(db):
+    """Test rows come in fixed-size chunks, in ID order, within the date range."""
+    chunks = list(db.iter_news_chunks(chunk_size=10))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert [row['id'] for chunk in chunks for row in chunk] == list(range(1, 26))
+
+    (chunk,) = db.iter_news_chunks(from_date="2025-01-05", to_date="2025-01-07")
+    assert [row['title'] for row in chunk] == ['title 5', 'title 6', 'title 7']
+    assert chunk[0]['analysis_result'] == '分析 5'
+    assert chunk[0]['keywords'] == ['k1', 'k2']
+
+    (chunk,) = db.iter_news_chunks(from_date="2025-01-05", to_date="2025-01-06T12:00:00")
+    assert [row['title'] for row in chunk] == ['title 5', 'title 6']
+
+def test_export_jsonl(db, tmp_path):
+    """Test the JSON Lines export holds every row with analysis and keywords."""
+    path = tmp_path / "out" / "news.jsonl"
+
+    assert export_news(path, from_date="2025-01-10", chunk_size=4, data_store=db) == 16
+
+    rows = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [row['id'] for row in rows] == list(range(10, 26))
+    assert rows[1] == {
+        'id': 11,
+        'title': 'title 11',
+        'source': 'bbc-news',
+        'published_at': '2025-01-11T00:00:00',
+        'url': None,
+        'content': 'content 11',
+        'summary': None,
+        'analysis_result': '分析 11',
+        'keywords': ['k1', 'k2'],
+    }
+    assert rows[0]['analysis_result'] is None
+    assert list(tmp_path.glob("out/*.tmp")) == []
+
+def test_export_parquet(db, tmp_path):
+    """Test the Parquet export writes one row group per chunk."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "news.parquet"
+
+    assert export_news(path, format="parquet", chunk_size=10, data_store=db) == 25
+
+    parquet = pq.ParquetFile(path)
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert table.column('id').to_pylist() == list(range(1, 26))
+    assert table.column('keywords').to_pylist()[0] == ['k1', 'k2']
+
+def test_export_errors(db, tmp_path, monkeypatch):
+    """Test unknown formats and a missing pyarrow fail with an AppException."""
+    with pytest.raises(AppException):
+        export_news(tmp_path / "news.csv", format="csv", data_store=db)
+
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    with pytest.raises(AppException, match="pyarrow"):
+        export_news(tmp_path / "news.parquet", format="parquet", data_store=db)
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,112 @@
+import gzip
+import json
+import os
+import subprocess
+import sys
+import threading
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.backend.data_store import DataStore
+from src.backend.http_api import create_server
+
+
+@pytest.fixture(scope="function")
+def api():
+    """Query API served from an in-memory database on a free port."""
+    data_store = DataStore(db_path=DataStore.MEMORY)
+    for i in range(30):
+        data_store.save_news({
+            'title': f'Title {i}',
+            'source': 'bbc-news' if i % 2 else 'cnn',
+            'published_at': (datetime.now() - timedelta(hours=i)).isoformat(),
+            'content': f'Content of article {i} ' * 20,
+        })
+
+    server = create_server(port=0, data_store=data_store)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", data_store
+    server.shutdown()
+    server.server_close()
+    data_store.close()
+
+def fetch(url: str, headers: dict = None):
+    """Helper function returning status, headers and raw body of a GET request."""
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers or {})) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+def test_articles_etag_revalidation(api):
+    """Test a matching If-None-Match gets 304 until the data changes."""
+    base, data_store = api
+    status, headers, body = fetch(f"{base}/api/articles?sources=cnn&page_size=5")
+    assert status == 200
+    articles = json.loads(body)
+    assert len(articles) == 5
+    assert all(article['source']['name'] == 'cnn' for article in articles)
+
+    etag = headers["ETag"]
+    status, _, _ = fetch(f"{base}/api/articles?sources=cnn&page_size=5", {"If-None-Match": etag})
+    assert status == 304
+
+    data_store.save_news({
+        'title': 'Breaking',
+        'source': 'cnn',
+        'published_at': datetime.now().isoformat(),
+        'content': 'New content',
+    })
+    status, headers, _ = fetch(f"{base}/api/articles?sources=cnn&page_size=5", {"If-None-Match": etag})
+    assert status == 200
+    assert headers["ETag"] != etag
+
+def test_gzip_when_accepted(api):
+    """Test large bodies are gzip-compressed only for clients that accept it."""
+    base, _ = api
+    status, headers, body = fetch(f"{base}/api/articles?page_size=20", {"Accept-Encoding": "gzip"})
+    assert status == 200
+    assert headers["Content-Encoding"] == "gzip"
+    assert len(json.loads(gzip.decompress(body))) == 20
+
+    gzip_etag = headers["ETag"]
+
+    _, headers, body = fetch(f"{base}/api/articles?page_size=20")
+    assert headers["Content-Encoding"] is None
+    assert len(json.loads(body)) == 20
+    assert headers["ETag"] != gzip_etag
+
+    # A cached gzip body only revalidates for clients that still accept gzip
+    status, headers, _ = fetch(f"{base}/api/articles?page_size=20", {"If-None-Match": gzip_etag})
+    assert status == 200 and headers["Content-Encoding"] is None
+    status, headers, _ = fetch(
+        f"{base}/api/articles?page_size=20", {"If-None-Match": gzip_etag, "Accept-Encoding": "gzip"}
+    )
+    assert (status, headers["ETag"]) == (304, gzip_etag)
+
+def test_article_detail_and_errors(api):
+    """Test the detail endpoint and error responses."""
+    base, _ = api
+    status, _, body = fetch(f"{base}/api/articles/1")
+    assert status == 200
+    assert json.loads(body)['title'] == 'Title 0'
+
+    assert fetch(f"{base}/api/articles/999")[0] == 404
+    assert fetch(f"{base}/api/unknown")[0] == 404
+    assert fetch(f"{base}/api/articles?page_size=1000")[0] == 400
+    assert fetch(f"{base}/api/articles?page=abc")[0] == 400
+
+def test_query_modules_skip_heavy_stacks():
+    """Test the read-only modules load without the LLM/vector stacks or API keys."""
+    env = {key: value for key, value in os.environ.items() if key not in ("DEEPSEEK_API_KEY", "NEWSAPI_KEY")}
+    code = (
+        "import sys; import backend.queries, backend.http_api; "
+        "print(sorted(m for m in ('langchain_core', 'chromadb', 'newsapi', 'config.settings') if m in sys.modules))"
+    )
+    src = os.path.join(os.path.dirname(__file__), "..", "src")
+    output = subprocess.run([sys.executable, "-c", code], cwd=src, env=env, capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "[]"
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from src.backend import numpy_store
+from src.backend.numpy_store import NumpyClient, where_to_sql
+from src.backend.vector_store import matches_where
+
+
+@pytest.fixture(scope="function")
+def client(tmp_path):
+    """A NumPy engine client in a temporary directory."""
+    return NumpyClient(str(tmp_path / "vectors"))
+
+def random_vectors(count: int, dim: int = 16, seed: int = 0) -> np.ndarray:
+    """Helper function to create normalized random vectors."""
+    vectors = np.random.RandomState(seed).normal(size=(count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+def test_where_to_sql_matches_python_filter(client):
+    """Test SQL filters select the same rows as matches_where."""
+    metadatas = [
+        {"article_id": 1, "source": "bbc-news", "published_ts": 100},
+        {"article_id": 2, "source": "cnn", "published_ts": 200},
+        {"article_id": 3, "source": "bbc-news"},
+        {"article_id": 4, "source": "reuters", "published_ts": 300},
+    ]
+    collection = client.get_or_create_collection("filters")
+    collection.add(ids=[str(m["article_id"]) for m in metadatas], metadatas=metadatas, embeddings=random_vectors(4))
+
+    filters = [
+        {"source": "bbc-news"},
+        {"article_id": {"$ne": 2}},
+        {"published_ts": {"$gte": 200}},
+        {"source": {"$in": ["cnn", "reuters"]}},
+        {"source": {"$nin": ["cnn"]}},
+        {"source": {"$in": []}},
+        {"$and": [{"published_ts": {"$lte": 250}}, {"article_id": {"$ne": 1}}]},
+        {"$or": [{"source": "cnn"}, {"published_ts": {"$gt": 250}}]},
+    ]
+    for where in filters:
+        expected = [str(m["article_id"]) for m in metadatas if matches_where(m, where)]
+        assert collection.get(where=where)["ids"] == expected, where
+
+    with pytest.raises(ValueError):
+        where_to_sql({"source": {"$like": "bbc"}})
+
+def test_query_is_exact_across_blocks(client, monkeypatch):
+    """Test blocked top-k returns the brute-force nearest neighbours for several queries."""
+    monkeypatch.setattr(numpy_store, "BLOCK_ROWS", 64)
+    vectors = random_vectors(500)
+    queries = random_vectors(3, seed=1)
+    collection = client.get_or_create_collection("exact")
+    collection.add(ids=[str(i) for i in range(500)], embeddings=vectors, metadatas=[{"n": i} for i in range(500)])
+
+    results = collection.query(query_embeddings=queries, n_results=10)
+
+    for q, ids in enumerate(results["ids"]):
+        expected = np.argsort(-(vectors @ queries[q]))[:10]
+        assert [int(i) for i in ids] == list(expected)
+        assert results["distances"][q] == sorted(results["distances"][q])
+
+    filtered = collection.query(query_embeddings=queries[:1], n_results=5, where={"n": {"$lt": 100}})
+    assert all(m["n"] < 100 for m in filtered["metadatas"][0])
+    assert len(filtered["ids"][0]) == 5
+
+def test_writes_grow_and_persist(client, tmp_path):
+    """Test capacity grows past the initial size and data survives reopening."""
+    collection = client.get_or_create_collection("grow")
+    vectors = random_vectors(numpy_store.MIN_CAPACITY + 10)
+    collection.upsert(
+        ids=[str(i) for i in range(len(vectors))],
+        documents=[f"doc {i}" for i in range(len(vectors))],
+        embeddings=vectors
+    )
+    collection.upsert(ids=["0"], documents=["doc 0 edited"], embeddings=vectors[1:2])
+    collection.update(ids=["1", "missing"], metadatas=[{"tag": "x"}])
+    collection.delete(ids=["2"])
+
+    reopened = NumpyClient(str(tmp_path / "vectors")).get_or_create_collection("grow")
+    assert reopened.count() == len(vectors) - 1
+    assert reopened.get(ids=["0"])["documents"] == ["doc 0 edited"]
+    assert reopened.get(ids=["1"])["metadatas"] == [{"tag": "x"}]
+    assert reopened.get(ids=["2"])["ids"] == []
+    top = reopened.query(query_embeddings=vectors[1:2], n_results=2)["ids"][0]
+    assert sorted(top) == ["0", "1"]
+
+def test_client_lists_and_deletes_collections(client):
+    """Test collections are discovered on disk and removed with their files."""
+    client.get_or_create_collection("news_articles").add(ids=["a"], embeddings=random_vectors(1))
+    client.get_or_create_collection("news_articles_202501")
+
+    assert [c.name for c in client.list_collections()] == ["news_articles", "news_articles_202501"]
+
+    client.delete_collection("news_articles_202501")
+    assert [c.name for c in client.list_collections()] == ["news_articles"]
+    with pytest.raises(ValueError):
+        client.delete_collection("news_articles_202501")
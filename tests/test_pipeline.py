@@ -0,0 +1,151 @@
+import json
+import os
+import sys
+from datetime import datetime
+
+import pytest
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from conftest import fake_llm
+
+# The pipeline imports its modules as top-level `backend.*` and reads the
+# settings on import, so run it from src with placeholder keys
+os.environ.setdefault("DEEPSEEK_API_KEY", "test")
+os.environ.setdefault("NEWSAPI_KEY", "test")
+os.environ.setdefault("LANGCHAIN_DEBUG", "false")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from backend.batching import BatchAnalyzer  # noqa: E402
+from backend.chain import NewsRAG  # noqa: E402
+from backend.data_store import DataStore  # noqa: E402
+from backend.dedup import StoryClusterer  # noqa: E402
+from backend.resilience import PARSE, PERMANENT, RetryPolicy  # noqa: E402
+from backend.vector_store import VectorStore  # noqa: E402
+
+
+STORY = "The central bank raised interest rates by half a point on Tuesday to fight persistent inflation"
+
+
+class FakeNewsAPI:
+    """NewsAPI stand-in returning fixed headlines."""
+
+    def __init__(self, articles):
+        self.articles = articles
+
+    def get_top_headlines(self):
+        return [dict(article) for article in self.articles]
+
+
+def headline(title, content, url):
+    """Helper function building a fetched article."""
+    return {
+        'title': title,
+        'source': 'bbc-news',
+        'published_at': datetime.now().isoformat(),
+        'content': content,
+        'url': url,
+    }
+
+def analysis(article_id, text):
+    """Helper function building the JSON answer of the per-article analysis."""
+    return json.dumps(
+        {"id": article_id, "title": "标题", "content": "内容", "analysis": text, "keywords": ["关键词"]},
+        ensure_ascii=False
+    )
+
+def news_rag(stores, llm, articles, **kwargs):
+    """Helper function building the pipeline over the test stores with deduplication and no retry delays."""
+    db, vec_db = stores
+    return NewsRAG(
+        llm=llm,
+        db=db,
+        vec_db=vec_db,
+        news_api=FakeNewsAPI(articles),
+        story_clusterer=StoryClusterer(),
+        retry_policy=RetryPolicy(sleep=lambda delay: None),
+        **kwargs
+    )
+
+@pytest.fixture(scope="function")
+def stores(fake_embedding_function):
+    db = DataStore(db_path=DataStore.MEMORY)
+    vec_db = VectorStore(persist_directory=VectorStore.MEMORY, embedding_function=fake_embedding_function, backend="numpy")
+    yield db, vec_db
+    vec_db.close()
+    db.close()
+
+def test_batched_representative_shares_analysis_with_duplicates(stores):
+    """Test duplicates of a story whose analysis waits for its batch get it once the batch is saved."""
+    db, vec_db = stores
+    news_api = FakeNewsAPI([
+        headline("Rates rise", STORY, "https://example.com/a"),
+        headline("Rates rise (syndicated)", STORY, "https://example.com/b"),
+        headline("Storm hits coast", "A powerful storm forced thousands to leave the northern coast overnight", "https://example.com/c"),
+    ])
+    response = json.dumps([
+        {"id": 1, "title": "加息", "content": "内容", "analysis": "加息分析", "keywords": ["利率"]},
+        {"id": 3, "title": "风暴", "content": "内容", "analysis": "风暴分析", "keywords": ["天气"]},
+    ], ensure_ascii=False)
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content=response)]))
+
+    NewsRAG(
+        llm=llm,
+        db=db,
+        vec_db=vec_db,
+        news_api=news_api,
+        story_clusterer=StoryClusterer(),
+        batch_analyzer=BatchAnalyzer(llm, max_batch_size=4),
+    ).start()
+
+    assert db.get_story_duplicates(1) == [2]
+    assert [db.get_news(i)["analysis_result"] for i in (1, 2, 3)] == ["加息分析", "加息分析", "风暴分析"]
+    assert db.get_news(2)["keywords"] == ["利率"]
+    assert db.get_failed_articles() == []
+
+def test_only_the_llm_call_is_retried(stores, monkeypatch):
+    """Test malformed answers are retried, while a failed save dead-letters the article without calling the LLM again."""
+    db, _ = stores
+    llm = fake_llm('{"id": 1}', analysis(1, "分析"), analysis(2, "分析"))
+    pipeline = news_rag(stores, llm, [headline("Rates rise", STORY, "https://example.com/a")])
+
+    pipeline.start()
+    assert db.get_news(1)["analysis_result"] == "分析"
+
+    def fail(*args):
+        raise KeyError("keywords")
+    monkeypatch.setattr(db, "save_analysis", fail)
+    pipeline.news_api = FakeNewsAPI([headline("Storm", "A storm hit the coast", "https://example.com/c")])
+    pipeline.start()
+
+    (failure,) = db.get_failed_articles()
+    assert (failure["article_id"], failure["stage"], failure["error_type"], failure["attempts"]) == (2, "save_analysis", PERMANENT, 1)
+
+def test_failed_article_is_not_a_story_representative(stores):
+    """Test a copy of an article whose analysis failed is analyzed instead of linked to it."""
+    db, _ = stores
+    llm = fake_llm("not json", "still not json", analysis(2, "分析"))
+    news_rag(stores, llm, [
+        headline("Rates rise", STORY, "https://example.com/a"),
+        headline("Rates rise (syndicated)", STORY, "https://example.com/b"),
+    ]).start()
+
+    assert [(f["article_id"], f["stage"], f["error_type"]) for f in db.get_failed_articles()] == [(1, "llm", PARSE)]
+    assert db.get_story_duplicates(1) == []
+    assert db.get_news(2)["analysis_result"] == "分析"
+
+def test_recovered_representative_shares_analysis_with_duplicates(stores):
+    """Test duplicates of a queued representative whose analysis failed get it once the retry succeeds."""
+    db, _ = stores
+    llm = fake_llm("not json", "still not json", analysis(1, "分析"))
+    pipeline = news_rag(stores, llm, [
+        headline("Rates rise", STORY, "https://example.com/a"),
+        headline("Rates rise (syndicated)", STORY, "https://example.com/b"),
+    ], batch_analyzer=BatchAnalyzer(llm, max_batch_size=4))
+
+    pipeline.start()
+    assert db.get_story_duplicates(1) == [2]
+    assert db.get_news(2)["analysis_result"] is None
+
+    assert pipeline.retry_failed() == {"retried": 1, "recovered": 1, "failed": 0}
+    assert [db.get_news(i)["analysis_result"] for i in (1, 2)] == ["分析", "分析"]
@@ -0,0 +1,71 @@
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.backend import tracing
+from src.backend.profiling import frame_label, profile_run
+from src.backend.tracing import Tracer, span
+
+
+def busy_work(seconds: float) -> int:
+    """Helper function burning CPU for a while."""
+    total = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        total += sum(range(200))
+    return total
+
+def allocate_rows(count: int) -> list:
+    """Helper function allocating dicts like the ORM row conversion does."""
+    return [{"id": i, "title": f"title {i}" * 4} for i in range(count)]
+
+def test_cpu_profile_attributes_samples_to_stages(tmp_path):
+    """Test stack samples are written as collapsed stacks prefixed with the open stage."""
+    with profile_run("cpu", tmp_path, interval=0.001) as paths:
+        with Tracer(sample_rate=0).trace():
+            with span("split"):
+                busy_work(0.15)
+
+    collapsed = paths["collapsed"].read_text().splitlines()
+    assert collapsed
+    assert any(line.startswith("stage:split;") and "busy_work (test_profiling.py" in line for line in collapsed)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in collapsed)
+
+    summary = json.loads(paths["json"].read_text())
+    assert summary["samples"] > 0
+    assert summary["stages"]["split"] > 0
+    assert any("busy_work" in row["frame"] for row in summary["top_total"])
+    assert not tracing._span_listeners
+
+def test_mem_profile_reports_top_allocations_per_stage(tmp_path):
+    """Test allocation growth is attributed to the stage and source line that caused it."""
+    kept = []
+    with profile_run("mem", tmp_path) as paths:
+        with Tracer(sample_rate=0).trace():
+            with span("hydrate"):
+                kept.append(allocate_rows(20000))
+            with span("idle"):
+                pass
+
+    assert "collapsed" not in paths
+    summary = json.loads(paths["json"].read_text())
+    hydrate = summary["stages"]["hydrate"]
+    assert hydrate["calls"] == 1
+    assert hydrate["net_bytes"] > 1_000_000
+    assert hydrate["peak_bytes"] >= hydrate["net_bytes"]
+    assert "test_profiling.py" in hydrate["top_allocations"][0]["site"]
+    assert summary["stages"]["idle"]["net_bytes"] < hydrate["net_bytes"]
+
+def test_unknown_mode(tmp_path):
+    """Test unknown modes are rejected before anything is hooked."""
+    with pytest.raises(ValueError):
+        with profile_run("io", tmp_path):
+            pass
+    assert not tracing._span_listeners
+
+def test_frame_label_without_qualname():
+    """Test frames are labelled by their plain name before Python 3.11."""
+    code = SimpleNamespace(co_name="run", co_filename="/src/backend/chain.py", co_firstlineno=12)
+    assert frame_label(code) == "run (chain.py:12)"
@@ -0,0 +1,164 @@
+import time
+from datetime import datetime
+
+import pytest
+from langchain_core.documents import Document
+
+from src.backend.data_store import DataStore
+from src.backend.reindex import Reindexer
+from src.backend.vector_store import VectorStore, build_article_chunks, chunk_metadata
+
+
+class WordSplitter:
+    """Splitter stand-in producing one chunk per `size` words."""
+
+    def __init__(self, size: int = 5):
+        self.size = size
+
+    def split_documents(self, documents):
+        chunks = []
+        for doc in documents:
+            words = doc.page_content.split()
+            for start in range(0, len(words), self.size):
+                chunks.append(Document(page_content=" ".join(words[start:start + self.size]), metadata=dict(doc.metadata)))
+        return chunks
+
+
+@pytest.fixture(scope="function", params=["chroma", "numpy"])
+def stores(request, tmp_path, fake_embedding_function):
+    """A data store with analyzed and unanalyzed articles plus an offline vector store."""
+    db = DataStore(db_path=DataStore.MEMORY)
+    for i in range(5):
+        article_id = db.save_news({
+            'title': f'Title {i}',
+            'source': 'bbc-news',
+            'published_at': datetime(2025, 1, i + 1).isoformat(),
+            'content': f'article {i} content about markets and policy decisions today',
+        })
+        if i != 4:
+            db.save_analysis(article_id, f"analysis {i}", ["markets"])
+
+    vec_db = VectorStore(
+        persist_directory=str(tmp_path / "vectors"),
+        embedding_function=fake_embedding_function,
+        backend=request.param
+    )
+    return db, vec_db
+
+def test_iter_analyzed_news_skips_unanalyzed(stores):
+    """Test only analyzed articles are streamed, in ID order."""
+    db, _ = stores
+    articles = list(db.iter_analyzed_news(batch_size=2))
+    assert [article['title'] for article in articles] == ['Title 0', 'Title 1', 'Title 2', 'Title 3']
+
+def test_reindex_builds_and_swaps_collection(stores, tmp_path, fake_embedding_function):
+    """Test reindexing fills a fresh collection and makes it active, keeping only the one it replaced."""
+    db, vec_db = stores
+    vec_db.upsert_documents([Document(page_content="junk", metadata={"article_id": 99, "chunk_index": 0})])
+    old_name = vec_db.collection.name
+    stale_name = vec_db._open_collection("news_articles_20240101000000").name
+
+    progress = []
+    stats = Reindexer(db, vec_db, WordSplitter(), batch_size=2, workers=2).run(on_progress=progress.append)
+
+    assert stats["articles"] == 4
+    assert stats["chunks"] == vec_db.collection.count() == 8
+    assert vec_db.collection.name == stats["collection"] != old_name
+    names = [c.name for c in vec_db.client.list_collections()]
+    assert old_name in names and stale_name not in names
+    assert progress
+
+    reopened = VectorStore(
+        persist_directory=str(tmp_path / "vectors"),
+        embedding_function=fake_embedding_function,
+        backend=vec_db.backend
+    )
+    assert reopened.collection.name == stats["collection"]
+    assert reopened.get_document("0-0") is None
+    metadata = reopened.get_document("1-0")["metadata"]
+    assert metadata["source"] == "bbc-news"
+    assert set(metadata) == {"article_id", "chunk_index", "published_at", "published_ts", "source", "content_hash"}
+
+def test_reindex_can_drop_previous_collection(stores):
+    """Test the previous collection is dropped right after the swap when asked to."""
+    db, vec_db = stores
+    old_name = vec_db.collection.name
+
+    stats = Reindexer(db, vec_db, WordSplitter(), batch_size=2, workers=2).run(drop_previous=True)
+
+    assert [c.name for c in vec_db.client.list_collections()] == [stats["collection"]]
+    assert old_name != stats["collection"]
+
+def test_articles_analyzed_during_reindex_are_caught_up(stores, monkeypatch):
+    """Test an article the pipeline indexes into the old collection mid-rebuild reaches the new one."""
+    db, vec_db = stores
+    activate = vec_db.activate_collection
+    late = {}
+
+    def analyze_then_activate(collection, **kwargs):
+        # The pipeline saves and indexes an article after the rebuild read the table
+        published_at = datetime(2025, 1, 9).isoformat()
+        late["id"] = db.save_news({
+            'title': 'Late', 'source': 'bbc-news', 'published_at': published_at, 'content': 'late breaking news',
+        })
+        db.save_analysis(late["id"], "analysis", ["news"])
+        vec_db.upsert_documents(build_article_chunks(
+            WordSplitter(), 'late breaking news', chunk_metadata(late["id"], published_at, 'bbc-news')
+        ))
+        activate(collection, **kwargs)
+    monkeypatch.setattr(vec_db, "activate_collection", analyze_then_activate)
+
+    stats = Reindexer(db, vec_db, WordSplitter(), batch_size=2, workers=2).run()
+
+    assert (stats["articles"], stats["caught_up"]) == (4, 1)
+    assert vec_db.collection.name == stats["collection"]
+    assert vec_db.get_document(f"{late['id']}-0") is not None
+
+def test_reindex_failure_keeps_active_collection(stores, monkeypatch):
+    """Test a failed rebuild leaves the active collection in place."""
+    db, vec_db = stores
+    old_name = vec_db.collection.name
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("embedding failed")
+    monkeypatch.setattr(vec_db, "embed_documents", fail)
+
+    with pytest.raises(RuntimeError):
+        Reindexer(db, vec_db, WordSplitter(), batch_size=2, workers=2).run()
+    assert vec_db.collection.name == old_name
+    assert [c.name for c in vec_db.client.list_collections()] == [old_name]
+
+@pytest.fixture
+def shanghai_time(monkeypatch):
+    """Run in a time zone ahead of UTC."""
+    monkeypatch.setenv("TZ", "Asia/Shanghai")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+def test_reindex_writes_pipeline_metadata(shanghai_time, tmp_path, fake_embedding_function):
+    """Test reindexed chunks get the publish time the pipeline wrote, though SQLite drops its time zone."""
+    db = DataStore(db_path=DataStore.MEMORY)
+    published_at = "2024-05-31T20:00:00Z"
+    article_id = db.save_news({
+        'title': 'Title',
+        'source': 'bbc-news',
+        'published_at': published_at,
+        'content': 'article content about markets',
+    })
+    db.save_analysis(article_id, "analysis", ["markets"])
+    vec_db = VectorStore(
+        persist_directory=str(tmp_path / "vectors"),
+        embedding_function=fake_embedding_function,
+        backend="numpy",
+        partition_period="month"
+    )
+
+    stats = Reindexer(db, vec_db, WordSplitter(), batch_size=2, workers=2).run()
+
+    written = chunk_metadata(article_id, published_at, 'bbc-news')
+    metadata = vec_db.get_document(f"{article_id}-0")["metadata"]
+    assert {key: metadata[key] for key in written} == written
+    assert written["published_ts"] == 1717185600
+    assert [partition.name for partition in vec_db.collections()[1:]] == [f"{stats['collection']}_202406"]
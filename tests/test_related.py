@@ -0,0 +1,95 @@
+from datetime import datetime
+
+import pytest
+from langchain_core.documents import Document
+
+from src.backend.data_store import DataStore
+from src.backend.related import RelatedArticlesJob
+from src.backend.vector_store import VectorStore, chunk_metadata
+
+
+TOPICS = {
+    "markets": "stock markets rally as central bank holds interest rates steady",
+    "election": "voters head to the polls in a closely watched national election",
+}
+
+
+@pytest.fixture(scope="function", params=["chroma", "numpy"])
+def stores(request, fake_embedding_function):
+    """In-memory data store and a partitioned offline vector store."""
+    db = DataStore(db_path=DataStore.MEMORY)
+    vec_db = VectorStore(
+        persist_directory=VectorStore.MEMORY,
+        embedding_function=fake_embedding_function,
+        backend=request.param,
+        partition_period="month"
+    )
+    yield db, vec_db
+    vec_db.close()
+    db.close()
+
+def index_article(db: DataStore, vec_db: VectorStore, topic: str, month: int) -> int:
+    """Helper function saving an article and indexing it as two chunks."""
+    published_at = datetime(2025, month, 1).isoformat()
+    article_id = db.save_news({
+        'title': f'{topic} {month}',
+        'source': 'bbc-news',
+        'published_at': published_at,
+        'content': TOPICS[topic],
+    })
+    metadata = chunk_metadata(article_id, published_at, 'bbc-news')
+    words = TOPICS[topic].split()
+    vec_db.add_documents([
+        Document(page_content=" ".join(words[:6]), metadata={**metadata, "chunk_index": 0}),
+        Document(page_content=" ".join(words[6:]) + f" month {month}", metadata={**metadata, "chunk_index": 1}),
+    ])
+    return article_id
+
+def test_related_articles_are_precomputed(stores):
+    """Test neighbors come from other articles across partitions, best first."""
+    db, vec_db = stores
+    markets_jan = index_article(db, vec_db, "markets", 1)
+    election_jan = index_article(db, vec_db, "election", 1)
+    markets_feb = index_article(db, vec_db, "markets", 2)
+
+    job = RelatedArticlesJob(db, vec_db, k=2)
+    neighbors = job.neighbors(markets_feb)
+    assert [related_id for related_id, _ in neighbors] == [markets_jan, election_jan]
+    assert neighbors[0][1] > neighbors[1][1]
+
+    stats = job.run([markets_feb])
+    assert stats["articles"] == 1
+    related = db.get_related_articles(markets_feb)
+    assert [item['id'] for item in related] == [markets_jan, election_jan]
+    assert related[0]['title'] == 'markets 1'
+
+    # Older articles pick up the new one without being recomputed
+    assert [item['id'] for item in db.get_related_articles(markets_jan)] == [markets_feb]
+
+def test_min_score_filters_unrelated(stores):
+    """Test weak neighbors are not stored."""
+    db, vec_db = stores
+    markets = index_article(db, vec_db, "markets", 1)
+    index_article(db, vec_db, "election", 1)
+
+    assert RelatedArticlesJob(db, vec_db, min_score=0.9).neighbors(markets) == []
+
+def test_article_without_chunks_has_no_neighbors(stores):
+    """Test articles that were never indexed get an empty list."""
+    db, vec_db = stores
+    index_article(db, vec_db, "markets", 1)
+
+    assert RelatedArticlesJob(db, vec_db).neighbors(999) == []
+
+def test_chunks_without_article_id_are_skipped(stores):
+    """Test chunks indexed before article_id was stored do not break the job."""
+    db, vec_db = stores
+    markets_jan = index_article(db, vec_db, "markets", 1)
+    markets_feb = index_article(db, vec_db, "markets", 2)
+    published_at = datetime(2025, 1, 15).isoformat()
+    legacy = chunk_metadata(99, published_at, 'bbc-news')
+    legacy["id"] = legacy.pop("article_id")
+    vec_db.add_documents([Document(page_content=TOPICS["markets"], metadata=legacy)])
+
+    job = RelatedArticlesJob(db, vec_db, k=2)
+    assert [related_id for related_id, _ in job.neighbors(markets_feb)] == [markets_jan]
@@ -0,0 +1,150 @@
+import json
+from datetime import datetime
+
+import pytest
+from langchain_core.exceptions import OutputParserException
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from src.backend.data_store import DataStore
+from src.backend.exceptions import AppException, CircuitOpenError, RetriesExhausted
+from src.backend.resilience import (
+    CIRCUIT_OPEN, PARSE, PERMANENT, TRANSIENT, CircuitBreaker, RetryPolicy, classify_error
+)
+
+
+class RateLimitError(Exception):
+    """Stand-in named like the OpenAI client's rate limit error."""
+
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def failing(*errors, result="ok"):
+    """Helper function returning a callable raising the given errors in turn, then returning result."""
+    calls = []
+
+    def fn():
+        calls.append(len(calls))
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+    fn.calls = calls
+    return fn
+
+def test_errors_are_classified():
+    """Test transient, parse, permanent and circuit errors are told apart."""
+    assert classify_error(TimeoutError()) == TRANSIENT
+    assert classify_error(RateLimitError()) == TRANSIENT
+    assert classify_error(StatusError(503)) == TRANSIENT
+    assert classify_error(StatusError(400)) == PERMANENT
+    assert classify_error(OutputParserException("bad json")) == PARSE
+    assert classify_error(json.JSONDecodeError("bad", "{", 0)) == PARSE
+    assert classify_error(KeyError("analysis")) == PERMANENT
+    assert classify_error(AppException("db")) == PERMANENT
+    assert classify_error(CircuitOpenError("open")) == CIRCUIT_OPEN
+
+def test_retry_backoff_by_error_type():
+    """Test transient errors back off exponentially and parse errors retry at once."""
+    delays = []
+    policy = RetryPolicy(base_delay=1.0, max_delay=3.0, jitter=0, sleep=delays.append)
+
+    fn = failing(TimeoutError(), TimeoutError(), TimeoutError())
+    assert policy.call(fn) == "ok"
+    assert delays == [1.0, 2.0, 3.0]
+
+    delays.clear()
+    fn = failing(OutputParserException("bad json"))
+    assert policy.call(fn) == "ok"
+    assert len(fn.calls) == 2 and delays == []
+
+def test_retries_exhausted():
+    """Test the last error is raised as the cause once an error type runs out of attempts."""
+    policy = RetryPolicy(max_attempts={TRANSIENT: 2}, sleep=lambda delay: None)
+
+    with pytest.raises(RetriesExhausted) as raised:
+        policy.call(failing(TimeoutError(), TimeoutError("again")))
+    assert (raised.value.error_type, raised.value.attempts) == (TRANSIENT, 2)
+    assert str(raised.value.__cause__) == "again"
+
+    fn = failing(AppException("permanent"))
+    with pytest.raises(RetriesExhausted) as raised:
+        policy.call(fn)
+    assert raised.value.error_type == PERMANENT
+    assert len(fn.calls) == 1
+    assert classify_error(raised.value) == PERMANENT
+
+def test_circuit_breaker_opens_and_recovers():
+    """Test the circuit opens after transient failures, refuses calls, and closes after a good trial."""
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+
+    breaker.record_failure(AppException("not the dependency's fault"))
+    breaker.record_failure(TimeoutError())
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure(TimeoutError())
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    now[0] = 11
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_failure(TimeoutError())
+    assert breaker.state == CircuitBreaker.OPEN
+
+    now[0] = 22
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.failures == 0
+
+def test_guarded_llm():
+    """Test a guarded model passes answers through and is refused while the circuit is open."""
+    breaker = CircuitBreaker(failure_threshold=1)
+    llm = breaker.guard(GenericFakeChatModel(messages=iter([AIMessage(content="answer")])))
+
+    assert llm.invoke("question").content == "answer"
+    breaker.record_failure(TimeoutError())
+    with pytest.raises(CircuitOpenError):
+        llm.invoke("question")
+
+@pytest.fixture(scope="function")
+def db():
+    store = DataStore(db_path=DataStore.MEMORY)
+    yield store
+    store.close()
+
+def test_dead_letter_table(db):
+    """Test failures are recorded once per article with their attempts summed, and can be removed."""
+    article_id = db.save_news({
+        'title': 'title',
+        'source': 'bbc-news',
+        'published_at': datetime(2025, 1, 1).isoformat(),
+        'content': 'content',
+    })
+    first = db.record_failure({
+        "article_id": article_id, "stage": "llm", "error_type": PARSE, "error": "bad json", "attempts": 2,
+    })
+    again = db.record_failure({
+        "article_id": article_id, "stage": "retrieve_context", "error_type": TRANSIENT, "attempts": 4,
+    })
+    unsaved = db.record_failure({
+        "error_type": PERMANENT, "stage": "save_news", "payload": {"title": None, "url": "https://example.com"},
+    })
+
+    assert first == again != unsaved
+    failures = db.get_failed_articles()
+    assert [(f["article_id"], f["stage"], f["error_type"], f["attempts"]) for f in failures] == [
+        (article_id, "retrieve_context", TRANSIENT, 6),
+        (None, "save_news", PERMANENT, 1),
+    ]
+    assert failures[1]["payload"]["url"] == "https://example.com"
+    assert len(db.get_failed_articles(limit=1)) == 1
+
+    db.delete_failure(first)
+    assert [f["id"] for f in db.get_failed_articles()] == [unsaved]
@@ -0,0 +1,86 @@
+import pytest
+from langchain_core.documents import Document
+
+from src.backend.retrieval import BM25Index, HybridRetriever, tokenize
+from src.backend.vector_store import VectorStore, matches_where
+
+
+@pytest.fixture(scope="function")
+def retriever_fixture(fake_embedding_function):
+    """Hybrid retriever over an offline in-memory vector store."""
+    vec_db = VectorStore(persist_directory=VectorStore.MEMORY, embedding_function=fake_embedding_function)
+    yield HybridRetriever(vec_db, candidates=10)
+    vec_db.close()
+
+
+def create_chunk(article_id: int, text: str, source: str = "bbc-news") -> Document:
+    """Helper function to create a single-chunk article."""
+    return Document(page_content=text, metadata={"article_id": article_id, "chunk_index": 0, "source": source})
+
+def test_tokenize_keeps_entities():
+    """Test tickers and ampersand names survive tokenization."""
+    assert tokenize("Shares of $AAPL and AT&T fell.") == ["shares", "of", "$aapl", "and", "at&t", "fell"]
+
+def test_bm25_ranks_exact_entity_first():
+    """Test BM25 prefers chunks containing the rare query term."""
+    index = BM25Index()
+    index.add("a", "markets fell as investors worried", {"article_id": 1})
+    index.add("b", "Nvidia shares fell as markets worried", {"article_id": 2})
+    index.add("c", "markets rose on good news", {"article_id": 3})
+
+    results = index.search("nvidia markets", k=3)
+    assert results[0][0] == "b"
+    assert {doc_id for doc_id, _ in results} == {"a", "b", "c"}
+
+def test_bm25_filters_and_removal():
+    """Test metadata filters apply and removed chunks are no longer found."""
+    index = BM25Index()
+    index.add("a", "ceasefire talks", {"article_id": 1, "source": "bbc-news"})
+    index.add("b", "ceasefire talks resume", {"article_id": 2, "source": "cnn"})
+
+    assert [doc_id for doc_id, _ in index.search("ceasefire", where={"source": {"$in": ["cnn"]}})] == ["b"]
+    index.remove("b")
+    assert [doc_id for doc_id, _ in index.search("ceasefire")] == ["a"]
+    assert len(index) == 1
+
+def test_matches_where_operators():
+    """Test the Python where evaluator mirrors Chroma's operators."""
+    metadata = {"article_id": 3, "source": "bbc-news", "published_ts": 100}
+    assert matches_where(metadata, None)
+    assert matches_where(metadata, {"source": "bbc-news"})
+    assert matches_where(metadata, {"$and": [{"published_ts": {"$gte": 50}}, {"article_id": {"$ne": 4}}]})
+    assert not matches_where(metadata, {"$or": [{"source": {"$in": ["cnn"]}}, {"published_ts": {"$lt": 100}}]})
+    assert not matches_where({}, {"published_ts": {"$gte": 0}})
+
+def test_hybrid_search_fuses_both_legs(retriever_fixture: HybridRetriever):
+    """Test results come from both legs and carry fused scores and metrics."""
+    retriever_fixture.upsert_documents([
+        create_chunk(1, "Tesla recalls cars after safety probe"),
+        create_chunk(2, "car makers face safety probe"),
+        create_chunk(3, "football league results"),
+    ])
+
+    results = retriever_fixture.similarity_search("Tesla safety probe", k=2)
+    assert results[0]["metadata"]["article_id"] == 1
+    assert all("rrf_score" in result for result in results)
+
+    stats = retriever_fixture.latency_stats()
+    assert stats["vector"]["calls"] == 1
+    assert stats["lexical"]["calls"] == 1
+
+def test_hybrid_search_respects_filters(retriever_fixture: HybridRetriever):
+    """Test neither leg returns the excluded article."""
+    retriever_fixture.upsert_documents([
+        create_chunk(1, "Tesla recalls cars"),
+        create_chunk(2, "Tesla opens factory"),
+    ])
+
+    results = retriever_fixture.similarity_search("Tesla", k=5, exclude_article_id=1)
+    assert [result["metadata"]["article_id"] for result in results] == [2]
+
+def test_build_lexical_index_from_vector_store(retriever_fixture: HybridRetriever):
+    """Test the lexical index can be rebuilt from stored chunks."""
+    retriever_fixture.vec_db.upsert_documents([create_chunk(1, "a"), create_chunk(2, "b")])
+
+    assert retriever_fixture.build_lexical_index() == 2
+    assert len(retriever_fixture.lexical_index) == 2
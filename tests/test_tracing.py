@@ -0,0 +1,101 @@
+import threading
+
+import pytest
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from loguru import logger
+
+from src.backend.tracing import Tracer, current_trace, span, trace_config
+from src.config.logger import sampled_filter
+
+
+@pytest.fixture
+def records():
+    """Capture log records passing the sampling filter, like the configured sinks do."""
+    captured = []
+    handler_id = logger.add(lambda message: captured.append(message.record), level="DEBUG", filter=sampled_filter)
+    yield captured
+    logger.remove(handler_id)
+
+def test_spans_are_recorded_and_summarized(records):
+    """Test nested spans get durations and the summary carries them."""
+    tracer = Tracer(sample_rate=0)
+    with tracer.trace(url="https://example.com/a") as trace:
+        trace.attributes["article_id"] = 7
+        with span("llm"):
+            with span("parse"):
+                pass
+        with span("save"):
+            logger.info("saved")
+
+    assert [s["name"] for s in trace.spans] == ["llm.parse", "llm", "save"]
+    assert all(s["duration_ms"] >= 0 and s["status"] == "ok" for s in trace.spans)
+
+    saved, summary = [r for r in records if r["extra"].get("trace_id") == trace.trace_id]
+    assert saved["message"] == "saved"
+    assert summary["level"].name == "INFO"
+    assert summary["extra"]["trace"]["attributes"] == {"url": "https://example.com/a", "article_id": 7}
+    assert [s["name"] for s in summary["extra"]["trace"]["spans"]] == ["llm.parse", "llm", "save"]
+
+def test_debug_output_only_for_sampled_traces(records):
+    """Test head-based sampling drops DEBUG records of unsampled traces."""
+    with Tracer(sample_rate=0).trace() as unsampled:
+        with span("stage"):
+            logger.debug("hidden")
+    with Tracer(sample_rate=1).trace() as sampled:
+        with span("stage"):
+            logger.debug("shown")
+
+    messages = [r["message"] for r in records]
+    assert "hidden" not in messages
+    assert "shown" in messages
+    assert not [r for r in records if r["extra"].get("trace_id") == unsampled.trace_id and r["level"].name == "DEBUG"]
+    assert [r for r in records if r["extra"].get("trace_id") == sampled.trace_id and "Span stage" in r["message"]]
+
+def test_failures_and_slow_traces_are_flagged(records):
+    """Test errors mark span and trace, and slow traces are logged as warnings."""
+    with pytest.raises(ValueError):
+        with Tracer(sample_rate=0, slow_ms=-1).trace() as trace:
+            with span("llm"):
+                raise ValueError("boom")
+
+    assert trace.status == "error"
+    assert trace.spans[0]["status"] == "error"
+    assert records[-1]["level"].name == "WARNING"
+    assert current_trace() is None
+
+def test_traces_are_isolated_between_threads():
+    """Test concurrent articles keep their own trace and spans."""
+    tracer = Tracer(sample_rate=0)
+    traces = {}
+
+    def work(name):
+        with tracer.trace() as trace:
+            with span(name):
+                traces[name] = (trace, current_trace())
+
+    threads = [threading.Thread(target=work, args=(f"stage{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for name, (trace, seen) in traces.items():
+        assert seen is trace
+        assert [s["name"] for s in trace.spans] == [name]
+    assert len({trace.trace_id for trace, _ in traces.values()}) == 4
+
+def test_trace_config_attaches_llm_callbacks_when_sampled(records):
+    """Test LangChain runs are tagged with the trace and only sampled ones log LLM calls."""
+    assert trace_config() == {}
+
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content="one"), AIMessage(content="two")]))
+    with Tracer(sample_rate=0).trace() as unsampled:
+        assert "callbacks" not in trace_config()
+        llm.invoke("hello", config=trace_config())
+    with Tracer(sample_rate=1).trace() as sampled:
+        assert trace_config()["metadata"] == {"trace_id": sampled.trace_id}
+        llm.invoke("hello", config=trace_config())
+
+    llm_records = [r for r in records if "call started" in r["message"]]
+    assert [r["extra"]["trace_id"] for r in llm_records] == [sampled.trace_id]
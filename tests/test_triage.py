@@ -0,0 +1,90 @@
+from datetime import datetime
+
+import pytest
+
+from conftest import fake_llm
+from src.backend.data_store import DataStore
+from src.backend.triage import FULL, LIGHT, HeuristicTriage, LLMTriage, TriageRouter
+
+
+def test_heuristic_scores_impact_terms():
+    """Test political and economic stories outscore sports and entertainment."""
+    triage = HeuristicTriage()
+    major, _ = triage.score({
+        "title": "Central bank raises interest rates as inflation hits record",
+        "description": "The government warned of a recession.",
+    })
+    minor, reason = triage.score({"title": "Premier League: late goal settles the match", "description": None})
+
+    assert major > 0.5 > minor
+    assert 0.0 <= minor and major <= 1.0
+    assert "low-impact" in reason
+    assert triage.score({"title": "Something happened"})[0] == 0.5
+
+def test_llm_triage_falls_back_to_full_analysis():
+    """Test model scores are normalized and failed calls route to the full analysis."""
+    triage = LLMTriage(fake_llm('{"score": 8, "reason": "major"}', "no json here"))
+
+    assert triage.score({"title": "Election results"}) == (0.8, "major")
+    score, reason = triage.score({"title": "Anything"})
+    assert score == 1.0
+    assert reason.startswith("triage failed")
+
+def test_router_translates_light_titles():
+    """Test articles are routed by threshold and only light ones get a title translation."""
+    router = TriageRouter(HeuristicTriage(), threshold=0.4, llm=fake_llm(" 晚间足球比分 \n"))
+
+    decision = router.route({"title": "Election called after government collapses"})
+    assert decision["route"] == FULL
+    assert decision["classifier"] == "heuristic"
+
+    article = {"title": "Football: tonight's match scores"}
+    decision = router.route(article)
+    assert decision["route"] == LIGHT
+    assert router.translate_title(article) == "晚间足球比分"
+    assert TriageRouter(HeuristicTriage()).translate_title(article) is None
+
+@pytest.fixture(scope="function")
+def db():
+    store = DataStore(db_path=DataStore.MEMORY)
+    yield store
+    store.close()
+
+def test_triage_decision_is_persisted(db):
+    """Test the routing decision is stored and can be overwritten."""
+    article_id = db.save_news({
+        'title': 'Football scores',
+        'source': 'bbc-news',
+        'published_at': datetime(2025, 1, 1).isoformat(),
+        'content': 'content',
+    })
+    assert db.get_triage(article_id) is None
+
+    db.save_triage(article_id, {"score": 0.25, "route": LIGHT, "classifier": "heuristic", "reason": "sports"})
+    db.save_triage(article_id, {
+        "score": 0.25, "route": LIGHT, "classifier": "heuristic", "reason": "sports", "translated_title": "足球比分",
+    })
+
+    assert db.get_triage(article_id) == {
+        "score": 0.25,
+        "route": LIGHT,
+        "classifier": "heuristic",
+        "reason": "sports",
+        "translated_title": "足球比分",
+    }
+
+def test_translated_title_is_listed(db):
+    """Test article queries carry the triage route and translated title."""
+    ids = [db.save_news({
+        'title': f'title {i}',
+        'source': 'bbc-news',
+        'published_at': datetime(2025, 1, 1).isoformat(),
+        'content': 'content',
+    }) for i in range(2)]
+    db.save_triage(ids[0], {"score": 0.1, "route": LIGHT, "classifier": "heuristic", "translated_title": "标题"})
+
+    assert (db.get_news(ids[0])['triage_route'], db.get_news(ids[0])['translated_title']) == (LIGHT, "标题")
+    assert (db.get_news(ids[1])['triage_route'], db.get_news(ids[1])['translated_title']) == (None, None)
+    listed = {article['id']: article for article in db.get_filtered_news()}
+    assert listed[ids[0]]['translated_title'] == "标题"
+    assert listed[ids[1]]['triage_route'] is None
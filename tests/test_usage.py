@@ -0,0 +1,89 @@
+from datetime import datetime
+
+import pytest
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from src.backend.data_store import DataStore
+from src.backend.exceptions import AppException
+from src.backend.usage import UsageLedger, estimate_cost
+
+
+@pytest.fixture(scope="function")
+def db():
+    """In-memory data store with one article per source."""
+    store = DataStore(db_path=DataStore.MEMORY)
+    for source in ("bbc-news", "cnn"):
+        store.save_news({
+            'title': f'{source} title',
+            'source': source,
+            'published_at': datetime(2025, 1, 1).isoformat(),
+            'content': 'content',
+        })
+    yield store
+    store.close()
+
+def fake_llm(*usages):
+    """Helper function building a fake chat model whose answers report the given token usage."""
+    return GenericFakeChatModel(messages=iter([
+        AIMessage(content="answer", usage_metadata={
+            "input_tokens": prompt,
+            "output_tokens": completion,
+            "total_tokens": prompt + completion,
+            "input_token_details": {"cache_read": cached},
+        }) for prompt, completion, cached in usages
+    ]))
+
+def test_ledger_records_each_call(db):
+    """Test every LLM call is stored with its article, tokens, latency and cache hit."""
+    ledger = UsageLedger(db)
+    llm = fake_llm((100, 20, 64), (50, 10, 0), (30, 5, 0))
+
+    llm.invoke("a", config={"callbacks": [ledger], "metadata": {"article_id": 1}})
+    llm.invoke("b", config={"callbacks": [ledger], "metadata": {"article_id": 2}})
+    llm.invoke("c", config={"callbacks": [ledger]})
+
+    assert ledger.stats() == {"calls": 3, "prompt_tokens": 180, "completion_tokens": 35, "token_budget": None}
+
+    by_source = {row['key']: row for row in db.get_usage_rollup(group_by="source")}
+    assert set(by_source) == {"bbc-news", "cnn", "-"}
+    assert by_source["bbc-news"]["prompt_tokens"] == 100
+    assert by_source["bbc-news"]["cached_tokens"] == 64
+    assert by_source["bbc-news"]["cache_hits"] == 1
+    assert by_source["cnn"]["cache_hits"] == 0
+    assert by_source["bbc-news"]["avg_latency_ms"] is not None
+
+    (today,) = db.get_usage_rollup(group_by="day")
+    assert today['key'] == datetime.now().date().isoformat()
+    assert (today['calls'], today['prompt_tokens'], today['completion_tokens']) == (3, 180, 35)
+
+def test_usage_rollup_filters(db):
+    """Test date filters and unknown groupings."""
+    db.record_llm_usage({"article_id": 1, "prompt_tokens": 10, "completion_tokens": 1})
+
+    assert db.get_usage_rollup(from_date="2999-01-01") == []
+    today = datetime.now().date().isoformat()
+    # A date-only upper bound covers the whole day
+    assert [row['key'] for row in db.get_usage_rollup(from_date=today, to_date=today)] == [today]
+    assert db.get_usage_rollup(to_date=f"{today}T00:00:00") == []
+    with pytest.raises(AppException):
+        db.get_usage_rollup(group_by="model")
+
+def test_token_budget(db):
+    """Test the budget trips once prompt plus completion tokens reach it."""
+    ledger = UsageLedger(db, token_budget=150)
+    llm = fake_llm((100, 20, 0), (50, 10, 0))
+
+    llm.invoke("a", config={"callbacks": [ledger]})
+    assert not ledger.budget_exceeded()
+    llm.invoke("b", config={"callbacks": [ledger]})
+    assert ledger.budget_exceeded()
+    assert not UsageLedger(db).budget_exceeded()
+
+def test_estimate_cost():
+    """Test cached prompt tokens are priced separately and prices are optional."""
+    usage = {"prompt_tokens": 1_000_000, "cached_tokens": 400_000, "completion_tokens": 500_000}
+
+    assert estimate_cost(usage, 1.0, 2.0, 0.1) == pytest.approx(0.6 + 0.04 + 1.0)
+    assert estimate_cost(usage, 1.0, 2.0) == pytest.approx(2.0)
+    assert estimate_cost(usage, None, 2.0) is None
@@ -1,54 +1,15 @@
 import pytest
-import os
-import shutil
-import time
+from datetime import datetime, timedelta
 from typing import List
 from langchain_core.documents import Document
-from src.backend.vector_store import VectorStore
-from loguru import logger
-
-TEST_DB_PATH = "test_chroma_db"
-
-def remove_test_db(path, retries=5, delay=0.5):
-    """Helper function to robustly remove the test database directory."""
-    for i in range(retries):
-        if not os.path.exists(path):
-            return
-        try:
-            shutil.rmtree(path)
-            time.sleep(0.1) # Small delay after successful removal
-            return
-        except OSError as e:
-            logger.warning(f"Attempt {i+1} to remove {path} failed: {e}")
-            time.sleep(delay)
-    logger.error(f"Failed to remove {path} after {retries} retries.")
-    # If removal still fails, try a less aggressive cleanup or just log and continue
-    if os.path.exists(path):
-         logger.error(f"Directory {path} still exists after cleanup attempts.")
-
+from src.backend.vector_store import VectorStore, build_where, chunk_metadata, partition_bounds, partition_key
 
 @pytest.fixture(scope="function")
 def vector_store_fixture():
-    """Fixture to set up and tear down a test vector store for each test function."""
-    # Clean up test DB if it exists
-    remove_test_db(TEST_DB_PATH)
-    
-    # Ensure directory exists with proper permissions
-    os.makedirs(TEST_DB_PATH, mode=0o777, exist_ok=True)
-    
-    # Create VectorStore instance
-    vector_store = VectorStore(persist_directory=TEST_DB_PATH)
-    
+    """Fixture providing a fresh in-memory vector store for each test function."""
+    vector_store = VectorStore(persist_directory=VectorStore.MEMORY)
     yield vector_store
-    
-    # Teardown - remove test DB
-    # Explicitly delete client to help with garbage collection
-    try:
-        del vector_store.client
-    except Exception as e:
-        logger.warning(f"Failed to delete client during teardown: {str(e)}")
-
-    remove_test_db(TEST_DB_PATH)
+    vector_store.close()
 
 
 def create_sample_documents(count: int = 1) -> List[Document]:
@@ -66,7 +27,7 @@ def create_sample_documents(count: int = 1) -> List[Document]:
 
 def test_init_vector_store(vector_store_fixture: VectorStore):
     """Test if the vector store is initialized correctly."""
-    assert os.path.exists(TEST_DB_PATH)
+    assert vector_store_fixture.in_memory
     assert vector_store_fixture.client is not None
     assert vector_store_fixture.collection is not None
     assert vector_store_fixture.collection.name == "news_articles"
@@ -126,4 +87,236 @@ def test_get_document_found(vector_store_fixture: VectorStore):
 def test_get_document_not_found(vector_store_fixture: VectorStore):
     """Test retrieving a non-existent document."""
     doc = vector_store_fixture.get_document("nonexistent")
-    assert doc is None
\ No newline at end of file
+    assert doc is None
+
+@pytest.fixture(scope="function", params=["chroma", "numpy"])
+def offline_store(request, fake_embedding_function):
+    """In-memory vector store on each backend using the offline fake embedding function."""
+    store = VectorStore(
+        persist_directory=VectorStore.MEMORY,
+        embedding_function=fake_embedding_function,
+        backend=request.param
+    )
+    yield store
+    store.close()
+
+
+def create_article_chunks(article_id: int, texts: List[str]) -> List[Document]:
+    """Helper function to create the chunks of one article."""
+    return [
+        Document(
+            page_content=text,
+            metadata={"article_id": article_id, "chunk_index": i, "source": "test"}
+        ) for i, text in enumerate(texts)
+    ]
+
+def test_add_documents_article_chunk_ids(offline_store: VectorStore):
+    """Test chunks of different articles get distinct deterministic IDs."""
+    offline_store.add_documents(create_article_chunks(1, ["first a", "first b"]))
+    offline_store.add_documents(create_article_chunks(2, ["second a", "second b"]))
+
+    results = offline_store.collection.get()
+    assert sorted(results["ids"]) == ["1-0", "1-1", "2-0", "2-1"]
+
+def test_upsert_documents_skips_unchanged(offline_store: VectorStore):
+    """Test re-upserting an article only embeds changed chunks."""
+    assert offline_store.upsert_documents(create_article_chunks(1, ["chunk a", "chunk b"])) == 2
+    assert offline_store.upsert_documents(create_article_chunks(1, ["chunk a", "chunk b"])) == 0
+    assert offline_store.upsert_documents(create_article_chunks(1, ["chunk a", "chunk c"])) == 1
+
+    doc = offline_store.get_document("1-1")
+    assert doc["content"] == "chunk c"
+
+def test_upsert_documents_removes_stale_chunks(offline_store: VectorStore):
+    """Test re-indexing a shorter article deletes its leftover chunks."""
+    offline_store.upsert_documents(create_article_chunks(1, ["chunk a", "chunk b", "chunk c"]))
+    offline_store.upsert_documents(create_article_chunks(1, ["chunk a"]))
+
+    results = offline_store.collection.get()
+    assert results["ids"] == ["1-0"]
+
+def test_upsert_documents_empty(offline_store: VectorStore):
+    """Test upserting an empty list is a no-op."""
+    assert offline_store.upsert_documents([]) == 0
+
+
+def create_dated_chunk(article_id: int, text: str, days_ago: int, source: str = "bbc-news") -> Document:
+    """Helper function to create a single-chunk article published days_ago."""
+    published = datetime.now() - timedelta(days=days_ago)
+    return Document(
+        page_content=text,
+        metadata=dict(chunk_metadata(article_id, published.isoformat(), source), chunk_index=0)
+    )
+
+def test_build_where_combines_conditions():
+    """Test filters are combined with $and only when needed."""
+    assert build_where() is None
+    assert build_where(sources=["bbc-news"]) == {"source": {"$in": ["bbc-news"]}}
+    where = build_where(sources=["bbc-news"], exclude_article_id=3)
+    assert where == {"$and": [{"source": {"$in": ["bbc-news"]}}, {"article_id": {"$ne": 3}}]}
+
+def test_similarity_search_time_window(offline_store: VectorStore):
+    """Test chunks outside the requested time window are not returned."""
+    offline_store.add_documents([
+        create_dated_chunk(1, "election results announced", days_ago=1),
+        create_dated_chunk(2, "election results announced again", days_ago=400),
+    ])
+
+    results = offline_store.similarity_search(
+        "election results", k=5, published_after=datetime.now() - timedelta(days=30)
+    )
+    assert [r["metadata"]["article_id"] for r in results] == [1]
+
+def test_similarity_search_excludes_article_and_filters_source(offline_store: VectorStore):
+    """Test the analyzed article is excluded and sources are filtered."""
+    offline_store.add_documents([
+        create_dated_chunk(1, "storm flooding coast", days_ago=1),
+        create_dated_chunk(2, "storm flooding coast towns", days_ago=1),
+        create_dated_chunk(3, "storm flooding coast roads", days_ago=1, source="cnn"),
+    ])
+
+    results = offline_store.similarity_search(
+        "storm flooding coast", k=5, sources=["bbc-news"], exclude_article_id=1
+    )
+    assert [r["metadata"]["article_id"] for r in results] == [2]
+
+def test_similarity_search_time_decay(offline_store: VectorStore):
+    """Test time decay ranks a recent match above an equally similar old one."""
+    offline_store.add_documents([
+        create_dated_chunk(1, "central bank raises rates", days_ago=60),
+        create_dated_chunk(2, "central bank raises rates", days_ago=1),
+    ])
+
+    results = offline_store.similarity_search("central bank raises rates", k=2, decay_half_life_days=7)
+    assert results[0]["metadata"]["article_id"] == 2
+    assert results[0]["score"] > results[1]["score"]
+
+def test_hnsw_parameters(tmp_path, fake_embedding_function):
+    """Test HNSW construction and search parameters reach the collection."""
+    store = VectorStore(
+        persist_directory=str(tmp_path / "chroma"),
+        embedding_function=fake_embedding_function,
+        hnsw_m=32,
+        hnsw_ef_construction=200,
+        hnsw_ef_search=80
+    )
+    hnsw = store.collection.configuration["hnsw"]
+    assert (hnsw["max_neighbors"], hnsw["ef_construction"], hnsw["ef_search"]) == (32, 200, 80)
+
+    reopened = VectorStore(
+        persist_directory=str(tmp_path / "chroma"),
+        embedding_function=fake_embedding_function,
+        hnsw_ef_search=120
+    )
+    assert reopened.collection.configuration["hnsw"]["ef_search"] == 120
+
+def test_similarity_search_cache(offline_store: VectorStore, fake_embedding_function):
+    """Test repeated queries are served from cache until the next write."""
+    offline_store.add_documents(create_article_chunks(1, ["oil prices climb"]))
+
+    first = offline_store.similarity_search("oil   prices", k=1)
+    calls = fake_embedding_function.calls
+    second = offline_store.similarity_search("oil prices", k=1)
+    assert second == first
+    assert fake_embedding_function.calls == calls
+    assert offline_store.query_cache.stats()["hits"] == 1
+
+    offline_store.upsert_documents(create_article_chunks(2, ["oil prices fall"]))
+    third = offline_store.similarity_search("oil prices", k=2)
+    assert fake_embedding_function.calls > calls
+    assert len(third) == 2
+
+def test_similarity_search_cache_keyed_by_filters(offline_store: VectorStore):
+    """Test different filters do not share cached results."""
+    offline_store.add_documents(create_article_chunks(1, ["oil prices climb"]))
+
+    assert len(offline_store.similarity_search("oil", k=1)) == 1
+    assert offline_store.similarity_search("oil", k=1, exclude_article_id=1) == []
+
+@pytest.fixture(scope="function", params=["chroma", "numpy"])
+def partitioned_store(request, tmp_path, fake_embedding_function):
+    """Offline vector store writing dated chunks into monthly partitions."""
+    return VectorStore(
+        persist_directory=str(tmp_path / "vectors"),
+        embedding_function=fake_embedding_function,
+        partition_period="month",
+        retention_days=180,
+        backend=request.param
+    )
+
+def test_partition_bounds():
+    """Test partition keys map to the period they cover."""
+    assert partition_key(datetime(2024, 12, 31, 23).timestamp(), "month") == "202412"
+    assert partition_bounds("202412", "month") == (datetime(2024, 12, 1), datetime(2025, 1, 1))
+    assert partition_bounds("20240229", "day") == (datetime(2024, 2, 29), datetime(2024, 3, 1))
+
+def test_partitioned_writes(partitioned_store: VectorStore):
+    """Test dated chunks go to their month's partition and undated ones to the base collection."""
+    partitioned_store.upsert_documents([
+        create_dated_chunk(1, "trade talks resume", days_ago=1),
+        create_dated_chunk(2, "trade talks stall", days_ago=400),
+    ])
+    partitioned_store.upsert_documents(create_article_chunks(3, ["trade talks explained"]))
+
+    assert partitioned_store.collection.count() == 1
+    assert len(partitioned_store.partitions) == 2
+    assert partitioned_store.count() == 3
+    assert partitioned_store.get_document("2-0")["metadata"]["article_id"] == 2
+    assert len(list(partitioned_store.iter_documents(batch_size=1))) == 3
+
+    reopened = VectorStore(
+        persist_directory=partitioned_store.persist_directory,
+        embedding_function=partitioned_store.embedding_function,
+        partition_period="month",
+        backend=partitioned_store.backend
+    )
+    assert set(reopened.partitions) == set(partitioned_store.partitions)
+
+def test_partitioned_search_fans_out_over_window(partitioned_store: VectorStore):
+    """Test only partitions overlapping the window are queried and hits are merged by distance."""
+    partitioned_store.upsert_documents([
+        create_dated_chunk(1, "wildfire spreads north", days_ago=1),
+        create_dated_chunk(2, "wildfire spreads north again today", days_ago=40),
+        create_dated_chunk(3, "wildfire spreads north", days_ago=400),
+    ])
+    published_after = datetime.now() - timedelta(days=60)
+
+    targets = partitioned_store._query_targets(published_after, None)
+    assert len(targets) == 1 + sum(
+        1 for key in partitioned_store.partitions
+        if partition_bounds(key, "month")[1] > published_after
+    )
+
+    results = partitioned_store.similarity_search("wildfire spreads north", k=5, published_after=published_after)
+    assert [r["metadata"]["article_id"] for r in results] == [1, 2]
+    assert results[0]["distance"] <= results[1]["distance"]
+
+def test_drop_expired_partitions(partitioned_store: VectorStore):
+    """Test retention drops whole partitions past the retention window only."""
+    partitioned_store.upsert_documents([
+        create_dated_chunk(1, "budget vote", days_ago=1),
+        create_dated_chunk(2, "budget vote", days_ago=400),
+    ])
+    partitioned_store.upsert_documents(create_article_chunks(3, ["budget vote"]))
+
+    dropped = partitioned_store.drop_expired_partitions()
+
+    assert len(dropped) == 1
+    assert len(partitioned_store.partitions) == 1
+    assert dropped[0] not in [c.name for c in partitioned_store.client.list_collections()]
+    results = partitioned_store.similarity_search("budget vote", k=5)
+    assert sorted(r["metadata"]["article_id"] for r in results) == [1, 3]
+
+def test_in_memory_stores_are_isolated(fake_embedding_function):
+    """Test in-memory stores do not share collections and drop their data on close."""
+    first = VectorStore(persist_directory=VectorStore.MEMORY, embedding_function=fake_embedding_function)
+    second = VectorStore(persist_directory=VectorStore.MEMORY, embedding_function=fake_embedding_function)
+
+    first.upsert_documents(create_article_chunks(1, ["ceasefire agreed"]))
+
+    assert first.count() == 1
+    assert second.count() == 0
+    assert first.persist_directory is None
+
+    first.close()
+    second.close()